@@ -1,19 +1,46 @@
+import argparse
+import os
 from src.data.data_manager import DataManager
+from src.data.downloader import INDEX_LIST_URLS
+from src.data.updater import HTTPCSVSource
 
 def main():
-    dm = DataManager()
+    parser = argparse.ArgumentParser(description="Download or update the daily data of an NSE index's constituents.")
+    parser.add_argument('--index', default='nifty50', choices=sorted(INDEX_LIST_URLS))
+    parser.add_argument('--tickers', nargs='*', help="Download these symbols instead of the index list")
+    parser.add_argument('--workers', type=int, default=8, help="Concurrent downloads")
+    parser.add_argument('--rate', type=float, default=2.0, help="Max requests per second (0 = unlimited)")
+    parser.add_argument('--retries', type=int, default=3)
+    parser.add_argument('--timeout', type=float, default=30, help="Per-request timeout in seconds")
+    parser.add_argument('--source-url', help="Fetch <url>/<ticker>.csv instead of Yahoo Finance (e.g. a local data server)")
+    parser.add_argument('--report', help="Write the per-ticker report to this CSV file")
+    args = parser.parse_args()
+
+    dm = DataManager(lazy=True)
     
-    # 1. Fetch Nifty 50 list first to show ticker names
-    print("Fetching Nifty 50 Ticker List...")
-    nifty50_tickers = dm.get_nifty_50_tickers()
+    # 1. Fetch the index list first to show ticker names
+    tickers = args.tickers
+    if not tickers:
+        print(f"Fetching {args.index} Ticker List...")
+        tickers = dm.get_index_tickers(args.index)
     
-    if nifty50_tickers:
-        print(f"Total tickers found: {len(nifty50_tickers)}")
-        print(f"Tickers: {', '.join(nifty50_tickers)}")
+    if tickers:
+        print(f"Total tickers found: {len(tickers)}")
+        print(f"Tickers: {', '.join(tickers)}")
         
-        # 2. Download all data for these tickers (max history)
-        print("\nStarting download for all Nifty 50 stocks (max history)...")
-        dm.download_all_nifty_data(index_type='nifty50')
+        # 2. Download missing history for these tickers (max history for new ones)
+        print(f"\nStarting download for {len(tickers)} stocks...")
+        source = HTTPCSVSource(args.source_url, timeout=args.timeout) if args.source_url else None
+        report = dm.download_all_nifty_data(args.index, tickers=tickers, source=source, workers=args.workers,
+                                            rate_limit=args.rate or None, retries=args.retries, timeout=args.timeout)
+        failed = report[report['status'] == 'failed']
+        if not failed.empty:
+            print("\nFailed tickers:")
+            print(failed[['ticker', 'error']].to_string(index=False))
+        if args.report:
+            os.makedirs(os.path.dirname(args.report) or '.', exist_ok=True)
+            report.to_csv(args.report, index=False)
+            print(f"\nSaved report to {args.report}")
     else:
         print("Failed to fetch ticker list.")
 
@@ -0,0 +1,79 @@
+import argparse
+import os
+import pandas as pd
+from src.data.data_manager import DataManager
+from src.engine.optimizer import METRIC_COLUMNS, ParameterOptimizer, parse_grid
+from src.engine.walk_forward import WalkForwardOptimizer
+from src.strategies.registry import STRATEGIES, get_strategy_class
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep a strategy's parameters over one or many tickers.")
+    parser.add_argument('--strategy', default='sma_stack', choices=sorted(STRATEGIES))
+    parser.add_argument('--tickers', nargs='*', help="Tickers to test (default: all stocks, excluding indices)")
+    parser.add_argument('--timeframe', default='daily', choices=['daily', 'weekly', 'monthly'])
+    parser.add_argument('--grid', nargs='*', default=[],
+                        help="Parameter grid, e.g. p_fast=5,8,13 p_slow=50:200:25 (default: the strategy's PARAM_GRID)")
+    parser.add_argument('--rank-by', default='total_return_pct', choices=METRIC_COLUMNS)
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument('--capital', type=float, default=100000)
+    parser.add_argument('--top', type=int, default=20)
+    parser.add_argument('--output', help="Write the full ranked table to this CSV file")
+    parser.add_argument('--walk-forward', nargs=2, type=int, metavar=('IN_SAMPLE', 'OUT_SAMPLE'),
+                        help="Walk-forward mode: optimize on IN_SAMPLE bars, trade the next OUT_SAMPLE bars, roll forward")
+    args = parser.parse_args()
+
+    dm = DataManager(lazy=True)
+    tickers = args.tickers or [t for t in dm.get_all_tickers() if not t.startswith('^')]
+    frames = {t: dm.get_data(t, args.timeframe) for t in tickers}
+    missing = [t for t, df in frames.items() if df is None]
+    if missing:
+        print(f"Warning: No data for {', '.join(missing)}")
+
+    strategy_cls = get_strategy_class(args.strategy)
+    if args.walk_forward:
+        run_walk_forward(args, strategy_cls, frames)
+        return
+
+    optimizer = ParameterOptimizer(strategy_cls, parse_grid(args.grid) or None,
+                                   initial_capital=args.capital, workers=args.workers)
+    print(f"Testing {len(optimizer.combinations())} parameter sets on {len(frames) - len(missing)} tickers...")
+    table = optimizer.run(frames, rank_by=args.rank_by)
+    if table.empty:
+        print("Nothing to evaluate.")
+        return
+
+    print("\nBest parameter sets (averaged across tickers):")
+    print(optimizer.summarize(table, rank_by=args.rank_by).head(args.top).to_string(index=False))
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        table.to_csv(args.output, index=False)
+        print(f"\nSaved {len(table)} rows to {args.output}")
+
+def run_walk_forward(args, strategy_cls, frames):
+    wfo = WalkForwardOptimizer(strategy_cls, parse_grid(args.grid) or None,
+                               in_sample_bars=args.walk_forward[0], out_sample_bars=args.walk_forward[1],
+                               rank_by=args.rank_by, initial_capital=args.capital, workers=args.workers)
+    summary = []
+    for ticker, df in frames.items():
+        if df is None:
+            continue
+        print(f"\n=== {ticker} ===")
+        results = wfo.run(df)
+        if not results:
+            continue
+        print(results['windows'].to_string(index=False))
+        summary.append({'ticker': ticker, 'total_return_pct': results['total_return_pct'],
+                        'max_drawdown_pct': results['max_drawdown_pct'], 'total_trades': results['total_trades']})
+
+    if summary:
+        table = pd.DataFrame(summary).sort_values(args.rank_by if args.rank_by in summary[0] else 'total_return_pct', ascending=False)
+        print("\nStitched out-of-sample results:")
+        print(table.to_string(index=False))
+        if args.output:
+            os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+            table.to_csv(args.output, index=False)
+            print(f"\nSaved {len(table)} rows to {args.output}")
+
+if __name__ == "__main__":
+    main()
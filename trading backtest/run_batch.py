@@ -0,0 +1,42 @@
+"""
+Headless batch backtest over the whole universe (no Qt import), e.g. for a nightly job:
+    python run_batch.py --strategy sma_stack --params p_fast=8 p_med=20 p_slow=50 --workers 4
+"""
+import argparse
+from datetime import datetime
+from src.data.data_manager import DataManager
+from src.engine.batch_runner import BatchRunner
+from src.engine.optimizer import parse_grid
+from src.strategies.registry import STRATEGIES, get_strategy_class
+
+def main():
+    parser = argparse.ArgumentParser(description="Run one strategy over every ticker and timeframe and save a summary table.")
+    parser.add_argument('--strategy', default='sma_stack', choices=sorted(STRATEGIES))
+    parser.add_argument('--params', nargs='*', default=[], help="Strategy parameters, e.g. p_fast=8 p_med=20 p_slow=50")
+    parser.add_argument('--tickers', nargs='*', help="Restrict to these tickers (default: all)")
+    parser.add_argument('--timeframes', nargs='*', default=['daily', 'weekly', 'monthly'],
+                        choices=['daily', 'weekly', 'monthly'])
+    parser.add_argument('--workers', type=int, default=1, help="Worker processes (0 = all cores)")
+    parser.add_argument('--capital', type=float, default=100000)
+    parser.add_argument('--output', help="Output .csv or .parquet (default: results/batch_<strategy>_<date>.csv)")
+    args = parser.parse_args()
+
+    params = {name: values[0] for name, values in parse_grid(args.params).items()}
+    strategy_cls = get_strategy_class(args.strategy)
+    if not strategy_cls.valid_params(**params):
+        parser.error(f"Invalid parameters for {args.strategy}: {params}")
+
+    dm = DataManager(workers=args.workers)
+    runner = BatchRunner(dm, strategy_cls, params, initial_capital=args.capital, workers=args.workers)
+    summary = runner.run(args.tickers, args.timeframes)
+    if summary.empty:
+        print("Nothing to run.")
+        return
+
+    output = args.output or f"results/batch_{args.strategy}_{datetime.now():%Y%m%d}.csv"
+    runner.save(summary, output)
+    print(summary.head(20).to_string(index=False))
+    print(f"\nSaved {len(summary)} rows to {output}")
+
+if __name__ == "__main__":
+    main()
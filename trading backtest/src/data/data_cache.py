@@ -0,0 +1,173 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import numpy as np
+import pandas as pd
+
+def npz_path(cache_dir, ticker):
+    return os.path.join(cache_dir, f"{ticker}.npz")
+
+def atomic_write(path, write_fn):
+    """
+    Writes via a temp file in the same directory and renames it over path,
+    so readers never observe a half-written file. An existing file keeps its
+    permissions (mkstemp creates the temp file owner-only).
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write_fn(f)
+        if os.path.exists(path):
+            shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def write_frames(cache_dir, ticker, frames):
+    """
+    Writes a ticker's .npz without touching the manifest (safe to call from worker processes).
+    Returns the layout to pass to DataCache.record().
+    """
+    arrays, layout = DataCache.build_arrays(frames)
+    atomic_write(npz_path(cache_dir, ticker), lambda f: np.savez(f, **arrays))
+    return layout
+
+class DataCache:
+    """
+    On-disk columnar cache of parsed and resampled OHLCV frames.
+
+    Layout:
+    data/cache/
+      manifest.json   (source CSV signature + column layout per ticker)
+      <ticker>.npz    (index + one 2D block per dtype, per timeframe)
+    """
+    VERSION = 2
+    TIMEFRAMES = ('daily', 'weekly', 'monthly')
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.manifest_path = os.path.join(cache_dir, 'manifest.json')
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self.manifest = self._read_manifest()
+        self._dirty = False
+        # Guards the manifest: lazy loads and background jobs record entries from other threads
+        self._lock = threading.RLock()
+
+    def _read_manifest(self):
+        try:
+            with open(self.manifest_path, 'r') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        # Discard caches written by an incompatible layout
+        if manifest.get('version') != self.VERSION:
+            return {}
+        return manifest.get('tickers', {})
+
+    def save_manifest(self):
+        """
+        Writes the manifest atomically if any entry changed since it was loaded.
+        """
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = {'version': self.VERSION, 'tickers': self.manifest}
+            atomic_write(self.manifest_path, lambda f: f.write(json.dumps(payload, indent=1).encode()))
+            self._dirty = False
+
+    @staticmethod
+    def signature(csv_path):
+        """
+        Cheap change detector for a source CSV (modification time + size).
+        """
+        st = os.stat(csv_path)
+        return {'mtime_ns': st.st_mtime_ns, 'size': st.st_size}
+
+    def _npz_path(self, ticker):
+        return npz_path(self.cache_dir, ticker)
+
+    def is_fresh(self, ticker, csv_path):
+        entry = self.manifest.get(ticker)
+        if entry is None or not os.path.exists(self._npz_path(ticker)):
+            return False
+        try:
+            return entry['source'] == self.signature(csv_path)
+        except (OSError, KeyError):
+            return False
+
+    def load(self, ticker, timeframes=TIMEFRAMES):
+        """
+        Returns {timeframe: DataFrame} for the requested timeframes, or None if unreadable.
+        Only the arrays of the requested timeframes are read from disk.
+        """
+        try:
+            layout = self.manifest[ticker]['layout']
+            with np.load(self._npz_path(ticker), allow_pickle=False) as npz:
+                return {tf: self._frame_from_npz(npz, tf, layout[tf]) for tf in timeframes}
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Cache read failed for {ticker}, rebuilding: {e}")
+            return None
+
+    @staticmethod
+    def _frame_from_npz(npz, tf, layout):
+        index = pd.DatetimeIndex(npz[f"{tf}__index"], name=layout['index_name'])
+        # One 2D block per dtype keeps the number of arrays (and header parses) small
+        data = {}
+        for j, block_cols in enumerate(layout['blocks']):
+            block = npz[f"{tf}__block{j}"]
+            for i, col in enumerate(block_cols):
+                data[col] = block[i]
+        return pd.DataFrame(data, index=index, columns=layout['columns'])
+
+    @staticmethod
+    def build_arrays(frames):
+        """
+        Splits frames into the .npz arrays and the manifest layout describing them.
+        """
+        arrays, layout = {}, {}
+        for tf, df in frames.items():
+            arrays[f"{tf}__index"] = df.index.values
+            blocks = {}
+            for col in df.columns:
+                blocks.setdefault(df[col].dtype.str, []).append(col)
+            for j, block_cols in enumerate(blocks.values()):
+                arrays[f"{tf}__block{j}"] = np.vstack([df[col].to_numpy() for col in block_cols])
+            layout[tf] = {
+                'index_name': df.index.name,
+                'columns': [str(c) for c in df.columns],
+                'blocks': [[str(c) for c in cols] for cols in blocks.values()]
+            }
+        return arrays, layout
+
+    def store(self, ticker, csv_path, frames, signature=None):
+        """
+        Persists the frames for a ticker and records the source CSV signature.
+        """
+        layout = write_frames(self.cache_dir, ticker, frames)
+        self.record(ticker, signature or self.signature(csv_path), layout)
+
+    def record(self, ticker, signature, layout):
+        """
+        Updates the manifest entry for a ticker whose .npz was written elsewhere (e.g. a worker process).
+        """
+        with self._lock:
+            self.manifest[ticker] = {'source': signature, 'layout': layout}
+            self._dirty = True
+
+    def prune(self, tickers):
+        """
+        Drops cache entries whose source CSV no longer exists.
+        """
+        with self._lock:
+            for ticker in set(self.manifest) - set(tickers):
+                del self.manifest[ticker]
+                self._dirty = True
+                try:
+                    os.remove(self._npz_path(ticker))
+                except OSError:
+                    pass
@@ -1,14 +1,42 @@
 import pandas as pd
 import os
 import glob
+import time
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import yfinance as yf
+from src.data.data_cache import DataCache, write_frames
+from src.data.panel_store import PanelStore
+from src.utils.lru_cache import LRUCache, frame_nbytes
+from src.utils.indicators import IndicatorLibrary
+
+def _ingest_csv(ticker, file_path, cache_dir):
+    """
+    Worker task: parse + resample one CSV and write its cache file.
+    Returns (ticker, frames, signature, layout, elapsed_seconds, error).
+    """
+    start = time.perf_counter()
+    try:
+        signature = DataCache.signature(file_path)
+        frames = DataManager._parse_and_resample(file_path)
+        layout = None
+        if frames is not None and cache_dir is not None:
+            layout = write_frames(cache_dir, ticker, frames)
+        return ticker, frames, signature, layout, time.perf_counter() - start, None
+    except Exception as e:
+        return ticker, None, None, None, time.perf_counter() - start, str(e)
 
 class DataManager:
-    def __init__(self, data_dir='data'):
+    def __init__(self, data_dir='data', use_cache=True, lazy=False, max_memory_mb=512, workers=1):
         """
         Initializes the DataManager with the directory structure:
         data/
           daily/ (contains CSVs)
+          cache/ (binary copies of parsed + resampled CSVs, rebuilt when a CSV changes)
+
+        lazy: if True, nothing is loaded up front; get_data() loads and resamples a ticker on
+              first access and keeps it in an LRU bounded to max_memory_mb.
+        workers: number of processes used to parse and resample changed CSVs (None = all cores).
         """
         self.data_dir = data_dir
         self.daily_dir = os.path.join(data_dir, 'daily')
@@ -17,59 +45,161 @@ class DataManager:
         if not os.path.exists(self.daily_dir):
             os.makedirs(self.daily_dir, exist_ok=True)
         
-        # Dictionaries for fast access
+        self.cache = DataCache(os.path.join(data_dir, 'cache')) if use_cache else None
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.panels = {}  # dtype -> PanelStore
+        self._panel_lock = threading.Lock()  # one panel build at a time (views call get_panel from jobs)
+        
+        # Bumped on every reload so memoized results keyed on it go stale
+        self.data_version = 0
+        self.ticker_versions = {}
+        self.indicators = IndicatorLibrary(self)
+        
+        # Dictionaries for fast access (eager mode)
         self.daily_data = {}
         self.weekly_data = {}
         self.monthly_data = {}
         
-        self.load_and_resample_all()
+        # Bounded (ticker, timeframe) -> DataFrame store (lazy mode)
+        self.lazy = lazy
+        self.frame_cache = LRUCache(max_bytes=int(max_memory_mb * 1024 * 1024), sizeof=frame_nbytes) if lazy else None
+        
+        if not lazy:
+            self.load_and_resample_all()
 
-    def load_and_resample_all(self):
+    def load_and_resample_all(self, workers=None):
         """
         Loads all CSV files from data/daily, resamples them, and populates the dictionaries.
+        Tickers whose CSV is unchanged since the last run are read from the binary cache instead;
+        the remaining CSVs are parsed and resampled across `workers` processes (default: self.workers).
         """
+        workers = self.workers if workers is None else workers
+        self.data_version += 1
+        self.indicators.invalidate()
         csv_files = glob.glob(os.path.join(self.daily_dir, "*.csv"))
         if not csv_files:
             print(f"Warning: No CSV files found in {self.daily_dir}")
             return
 
         print(f"Loading and resampling {len(csv_files)} files...")
+        tickers = []
+        pending = []
         for file_path in csv_files:
             ticker = os.path.basename(file_path).replace(".csv", "")
-            try:
-                # Robust loading: check first few lines to see if we need to skip rows
-                with open(file_path, 'r') as f:
-                    first_line = f.readline()
-                
-                if "Ticker" in first_line or "Price," in first_line:
-                    # Skip the metadata rows in original files (Ticker and Date rows)
-                    df_daily = pd.read_csv(file_path, skiprows=[1, 2], index_col=0, parse_dates=True)
-                else:
-                    # Normal yfinance style or index file
-                    df_daily = pd.read_csv(file_path, index_col=0, parse_dates=True)
-                
-                if df_daily.empty:
+            tickers.append(ticker)
+            if self.cache is not None and self.cache.is_fresh(ticker, file_path):
+                frames = self.cache.load(ticker)
+                if frames is not None:
+                    self._store_frames(ticker, frames)
                     continue
-                
-                # Standardize columns to lowercase for easier access
-                df_daily.columns = [col.lower() for col in df_daily.columns]
-                
-                # Verify that we have a DatetimeIndex
-                if not isinstance(df_daily.index, pd.DatetimeIndex):
-                    df_daily.index = pd.to_datetime(df_daily.index, errors='coerce')
-                    df_daily = df_daily.dropna(subset=None)
-                
-                # Store Daily
-                self.daily_data[ticker] = df_daily
-                
-                # Resample to Weekly and Monthly ONCE per session
-                self.weekly_data[ticker] = self._resample_data(df_daily, 'W-FRI')
-                self.monthly_data[ticker] = self._resample_data(df_daily, 'ME')
-                
-            except Exception as e:
-                print(f"Error processing {ticker}: {e}")
+            pending.append((ticker, file_path))
+
+        if pending:
+            self._ingest(pending, workers)
+
+        if self.cache is not None:
+            self.cache.prune(tickers)
+            self.cache.save_manifest()
+
+    def _ingest(self, pending, workers):
+        """
+        Parses and resamples (ticker, csv_path) pairs, in a process pool when workers > 1.
+        """
+        cache_dir = self.cache.cache_dir if self.cache is not None else None
+        start = time.perf_counter()
+        
+        if workers > 1 and len(pending) > 1:
+            workers = min(workers, len(pending))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_ingest_csv, ticker, file_path, cache_dir) for ticker, file_path in pending]
+                for future in as_completed(futures):
+                    self._merge_ingested(*future.result())
+        else:
+            workers = 1
+            for ticker, file_path in pending:
+                self._merge_ingested(*_ingest_csv(ticker, file_path, cache_dir))
+        
+        print(f"Parsed {len(pending)} files in {time.perf_counter() - start:.2f}s using {workers} worker(s)")
+
+    def _merge_ingested(self, ticker, frames, signature, layout, elapsed, error):
+        if error is not None:
+            print(f"Error processing {ticker}: {error}")
+            return
+        print(f"  {ticker}: {elapsed * 1000:.0f} ms")
+        if frames is None:
+            return
+        self._store_frames(ticker, frames)
+        if self.cache is not None and layout is not None:
+            self.cache.record(ticker, signature, layout)
+
+    def _store_frames(self, ticker, frames):
+        self.daily_data[ticker] = frames['daily']
+        self.weekly_data[ticker] = frames['weekly']
+        self.monthly_data[ticker] = frames['monthly']
 
-    def _resample_data(self, df, timeframe):
+    def _load_ticker(self, ticker, file_path, timeframes=DataCache.TIMEFRAMES):
+        """
+        Returns {timeframe: DataFrame} for one ticker, from the cache when fresh.
+        A cache miss parses the CSV and yields all timeframes.
+        """
+        if self.cache is not None and self.cache.is_fresh(ticker, file_path):
+            frames = self.cache.load(ticker, timeframes)
+            if frames is not None:
+                return frames
+
+        frames = self._parse_and_resample(file_path)
+        if frames is not None and self.cache is not None:
+            self.cache.store(ticker, file_path, frames)
+        return frames
+
+    @staticmethod
+    def _read_csv(file_path):
+        """
+        Parses a daily OHLCV CSV (yfinance multi-header or plain) into a lowercase-column DataFrame.
+        file_path may also be a text buffer (e.g. a downloaded CSV).
+        """
+        # Robust loading: check first few lines to see if we need to skip rows
+        if isinstance(file_path, str):
+            with open(file_path, 'r') as f:
+                first_line = f.readline()
+        else:
+            first_line = file_path.readline()
+            file_path.seek(0)
+        
+        if "Ticker" in first_line or "Price," in first_line:
+            # Skip the metadata rows in original files (Ticker and Date rows)
+            df_daily = pd.read_csv(file_path, skiprows=[1, 2], index_col=0, parse_dates=True)
+        else:
+            # Normal yfinance style or index file
+            df_daily = pd.read_csv(file_path, index_col=0, parse_dates=True)
+        
+        if df_daily.empty:
+            return df_daily
+        
+        # Standardize columns to lowercase for easier access
+        df_daily.columns = [col.lower() for col in df_daily.columns]
+        
+        # Verify that we have a DatetimeIndex
+        if not isinstance(df_daily.index, pd.DatetimeIndex):
+            df_daily.index = pd.to_datetime(df_daily.index, errors='coerce')
+            df_daily = df_daily.dropna(subset=None)
+        return df_daily
+
+    @staticmethod
+    def _parse_and_resample(file_path):
+        df_daily = DataManager._read_csv(file_path)
+        if df_daily.empty:
+            return None
+        
+        # Resample to Weekly and Monthly ONCE per session
+        return {
+            'daily': df_daily,
+            'weekly': DataManager._resample_data(df_daily, 'W-FRI'),
+            'monthly': DataManager._resample_data(df_daily, 'ME')
+        }
+
+    @staticmethod
+    def _resample_data(df, timeframe):
         """
         Resamples OHLCV data to a given timeframe.
         """
@@ -83,10 +213,36 @@ class DataManager:
         }).dropna()
         return resampled_df
 
+    def _load_on_demand(self, ticker, timeframe):
+        file_path = os.path.join(self.daily_dir, f"{ticker}.csv")
+        if not os.path.exists(file_path):
+            return None
+        try:
+            frames = self._load_ticker(ticker, file_path, (timeframe,))
+            if self.cache is not None:
+                self.cache.save_manifest()
+        except Exception as e:
+            print(f"Error processing {ticker}: {e}")
+            return None
+        if frames is None:
+            return None
+        
+        df = frames[timeframe]
+        self.frame_cache.put((ticker, timeframe), df)
+        return df
+
     def get_data(self, ticker, timeframe='daily'):
         """
-        Returns the requested dataframe from memory.
+        Returns the requested dataframe from memory (loading it first in lazy mode).
         """
+        if self.lazy:
+            if timeframe not in DataCache.TIMEFRAMES:
+                return None
+            df = self.frame_cache.get((ticker, timeframe))
+            if df is None:
+                df = self._load_on_demand(ticker, timeframe)
+            return df
+        
         if timeframe == 'daily':
             return self.daily_data.get(ticker)
         elif timeframe == 'weekly':
@@ -95,26 +251,167 @@ class DataManager:
             return self.monthly_data.get(ticker)
         return None
 
+    def get_data_version(self, ticker):
+        """
+        Changes whenever the data of `ticker` changes (full reload or incremental update).
+        """
+        return (self.data_version, self.ticker_versions.get(ticker, 0))
+
+    def _cached_frames(self, ticker):
+        """
+        Current frames for a ticker from memory or the binary cache, even if the CSV has
+        since been appended to. None if the ticker was never loaded.
+        """
+        if not self.lazy and ticker in self.daily_data:
+            return {'daily': self.daily_data[ticker], 'weekly': self.weekly_data[ticker], 'monthly': self.monthly_data[ticker]}
+        if self.cache is not None and ticker in self.cache.manifest:
+            return self.cache.load(ticker)
+        return None
+
+    def apply_update(self, ticker, new_bars):
+        """
+        Folds newly appended daily bars into the daily/weekly/monthly frames without
+        re-parsing the CSV: only the last (possibly partial) week/month is re-aggregated.
+        Must be called after the bars were written to data/daily/<ticker>.csv.
+        """
+        file_path = os.path.join(self.daily_dir, f"{ticker}.csv")
+        frames = self._cached_frames(ticker)
+        if frames is None:
+            frames = self._parse_and_resample(file_path)
+            if frames is None:
+                return
+        else:
+            old_daily = frames['daily']
+            new_bars = new_bars.reindex(columns=old_daily.columns).astype(old_daily.dtypes)
+            new_bars.index = new_bars.index.rename(old_daily.index.name)
+            daily = pd.concat([old_daily, new_bars])
+            daily = daily[~daily.index.duplicated(keep='last')]
+            frames = {
+                'daily': daily,
+                'weekly': self._extend_resampled(frames['weekly'], daily, 'W-FRI'),
+                'monthly': self._extend_resampled(frames['monthly'], daily, 'ME')
+            }
+        
+        if self.lazy:
+            for tf, df in frames.items():
+                if (ticker, tf) in self.frame_cache:
+                    self.frame_cache.put((ticker, tf), df)
+        else:
+            self._store_frames(ticker, frames)
+        if self.cache is not None:
+            self.cache.store(ticker, file_path, frames)
+            self.cache.save_manifest()
+        
+        self.ticker_versions[ticker] = self.ticker_versions.get(ticker, 0) + 1
+        self.indicators.invalidate(ticker)
+
+    @staticmethod
+    def _extend_resampled(resampled, daily, timeframe):
+        """
+        Re-aggregates only the daily bars after the second-to-last bucket, which covers
+        the last bucket (possibly partial before the update) and any new ones.
+        """
+        if len(resampled) < 2:
+            return DataManager._resample_data(daily, timeframe)
+        tail = DataManager._resample_data(daily[daily.index > resampled.index[-2]], timeframe)
+        return pd.concat([resampled.iloc[:-1], tail])
+
     def get_all_tickers(self):
+        if self.lazy:
+            return sorted(os.path.basename(f).replace(".csv", "") for f in glob.glob(os.path.join(self.daily_dir, "*.csv")))
         return sorted(list(self.daily_data.keys()))
 
+    def _source_signatures(self):
+        signatures = {}
+        for file_path in glob.glob(os.path.join(self.daily_dir, "*.csv")):
+            ticker = os.path.basename(file_path).replace(".csv", "")
+            signatures[ticker] = DataCache.signature(file_path)
+        return signatures
+
+    def _panel_frames(self):
+        """
+        Daily frames for the panel, read from the cache or the CSVs on disk rather than from
+        memory: frames loaded at startup may predate CSV changes the panel key already reflects.
+        """
+        frames = {}
+        for file_path in sorted(glob.glob(os.path.join(self.daily_dir, "*.csv"))):
+            ticker = os.path.basename(file_path).replace(".csv", "")
+            try:
+                loaded = self._load_ticker(ticker, file_path, ('daily',))
+            except Exception as e:
+                print(f"Error processing {ticker}: {e}")
+                continue
+            if loaded is not None:
+                frames[ticker] = loaded['daily']
+        if self.cache is not None:
+            self.cache.save_manifest()
+        return frames
+
+    def get_panel(self, dtype='float64'):
+        """
+        Returns the memory-mapped daily OHLCV panel (tickers x dates) for the whole universe.
+        The panel is rebuilt only when a CSV in data/daily changes, from the current files;
+        other processes opening the same data map the same files.
+        """
+        with self._panel_lock:
+            source_key = PanelStore.make_source_key(self._source_signatures())
+            panel = self.panels.get(dtype)
+            if panel is not None and panel.is_current(source_key):
+                return panel
+            
+            panel = PanelStore(os.path.join(self.data_dir, 'panel'), dtype)
+            if not panel.open(source_key):
+                print(f"Building {panel.dtype.name} panel...")
+                panel.build(self._panel_frames(), source_key)
+            self.panels[dtype] = panel
+            return panel
+
     def download_nifty_index(self):
         """
-        Downloads max historical data for the Nifty 50 Index (^NSEI) and saves to data/daily.
+        Downloads the Nifty 50 Index (^NSEI) into data/daily: max history the first time,
+        afterwards only the bars after the last stored date.
         """
+        # Imported here: the updater builds on DataManager
+        from src.data.updater import DataUpdater
+        
         ticker = "^NSEI"
         print(f"Downloading data for Index: {ticker}...")
         try:
-            df = yf.download(ticker, period="max")
-            if not df.empty:
-                filename = os.path.join(self.daily_dir, f"{ticker}.csv")
-                df.to_csv(filename)
-                print(f"Saved Nifty Index to {filename}")
-                return True
+            added = DataUpdater(self).update_ticker(ticker)
+            filename = os.path.join(self.daily_dir, f"{ticker}.csv")
+            print(f"Saved Nifty Index to {filename} ({added} new bars)")
+            return True
         except Exception as e:
             print(f"Error downloading Nifty Index: {e}")
         return False
 
+    def get_nifty_50_tickers(self):
+        return self.get_index_tickers('nifty50')
+
+    def get_index_tickers(self, index_type='nifty50'):
+        """
+        Constituents of an NSE index (see downloader.INDEX_LIST_URLS). Falls back to the
+        stocks already in data/daily if the list cannot be fetched.
+        """
+        from src.data.downloader import fetch_index_tickers
+        try:
+            return fetch_index_tickers(index_type)
+        except Exception as e:
+            print(f"Error fetching {index_type} list: {e}")
+            return [t for t in self.get_all_tickers() if not t.startswith('^')]
+
+    def download_all_nifty_data(self, index_type='nifty50', tickers=None, source=None, workers=8, rate_limit=2.0, retries=3, timeout=30):
+        """
+        Downloads (or incrementally updates) every constituent of an index concurrently.
+        Returns the per-ticker report DataFrame of UniverseDownloader.run.
+        """
+        from src.data.downloader import UniverseDownloader
+        
+        tickers = tickers or self.get_index_tickers(index_type)
+        os.makedirs(self.daily_dir, exist_ok=True)
+        downloader = UniverseDownloader(self, source, workers=workers, rate_limit=rate_limit, retries=retries, timeout=timeout)
+        return downloader.run(tickers)
+
 if __name__ == "__main__":
     dm = DataManager()
     tickers = dm.get_all_tickers()
@@ -0,0 +1,138 @@
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import pandas as pd
+from src.data.updater import DataUpdater
+
+# NSE constituent lists (column 'Symbol'), keyed by DataManager.download_all_nifty_data index_type
+INDEX_LIST_URLS = {
+    'nifty50': 'https://archives.nseindia.com/content/indices/ind_nifty50list.csv',
+    'nifty100': 'https://archives.nseindia.com/content/indices/ind_nifty100list.csv',
+    'nifty200': 'https://archives.nseindia.com/content/indices/ind_nifty200list.csv',
+    'nifty500': 'https://archives.nseindia.com/content/indices/ind_nifty500list.csv'
+}
+
+def fetch_index_tickers(index_type='nifty50', url=None, timeout=15):
+    """
+    Constituent symbols of an NSE index (e.g. 'RELIANCE'), from the NSE CSV list or `url`.
+    """
+    if url is None:
+        if index_type not in INDEX_LIST_URLS:
+            raise ValueError(f"Unknown index '{index_type}', expected one of {sorted(INDEX_LIST_URLS)}")
+        url = INDEX_LIST_URLS[index_type]
+    # NSE rejects requests without a browser-like user agent
+    request = urllib.request.Request(url, headers={'User-Agent': 'Mozilla/5.0'})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        table = pd.read_csv(response)
+    return [str(s).strip() for s in table['Symbol'].dropna()]
+
+class RateLimiter:
+    """
+    Thread-safe token bucket: at most `rate` acquisitions per second on average,
+    with bursts of up to `burst`.
+    """
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+def is_retryable(error):
+    """
+    Client errors (bad symbol, 404) fail immediately; throttling, server errors and
+    network/timeouts are retried.
+    """
+    if isinstance(error, urllib.error.HTTPError):
+        return error.code == 429 or error.code >= 500
+    return True
+
+class UniverseDownloader:
+    def __init__(self, data_manager, source=None, workers=8, rate_limit=2.0, retries=3, backoff=1.0, timeout=30):
+        """
+        Downloads/updates many tickers concurrently through DataUpdater (same incremental
+        fetch and atomic append as a single-ticker update).
+        workers: download threads (requests are I/O bound)
+        rate_limit: max requests per second across all threads (None = unlimited)
+        retries: extra attempts per ticker, waiting backoff * 2**attempt seconds (+ jitter)
+        timeout: per-request timeout in seconds
+        """
+        self.dm = data_manager
+        self.updater = DataUpdater(data_manager, source)
+        self.workers = max(1, workers)
+        self.limiter = RateLimiter(rate_limit, burst=self.workers) if rate_limit else None
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+
+    def _fetch_with_retry(self, attempts):
+        def fetch(ticker, start=None, timeout=None):
+            for attempt in range(self.retries + 1):
+                if self.limiter is not None:
+                    self.limiter.acquire()
+                attempts[ticker] = attempt + 1
+                try:
+                    return self.updater.source.fetch(ticker, start=start, timeout=timeout)
+                except Exception as e:
+                    if attempt == self.retries or not is_retryable(e):
+                        raise
+                    time.sleep(self.backoff * 2 ** attempt * (1 + random.random() * 0.25))
+        return fetch
+
+    def _download(self, ticker, fetch):
+        """
+        Runs on a worker thread: fetch the missing bars and append them to the ticker's own CSV.
+        """
+        start = time.perf_counter()
+        bars = self.updater.fetch_missing(ticker, self.timeout, fetch=fetch)
+        if not bars.empty:
+            self.updater.append_bars(self.updater.csv_path(ticker), bars)
+        return bars, time.perf_counter() - start
+
+    def run(self, tickers, progress=None):
+        """
+        Returns a report DataFrame: ticker, status ('ok'/'failed'), new_bars, attempts, seconds, error.
+        progress: optional callable(done, total).
+        """
+        rows = []
+        attempts = {}  # ticker -> requests made, written by the worker threads
+        fetch = self._fetch_with_retry(attempts)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(self._download, t, fetch): t for t in tickers}
+            for future in as_completed(futures):
+                ticker = futures[future]
+                try:
+                    bars, seconds = future.result()
+                    # Frames and cache manifest are only touched from this thread
+                    if not bars.empty:
+                        self.dm.apply_update(ticker, bars)
+                    rows.append({'ticker': ticker, 'status': 'ok', 'new_bars': len(bars),
+                                 'attempts': attempts.get(ticker, 0), 'seconds': seconds, 'error': ''})
+                except Exception as e:
+                    rows.append({'ticker': ticker, 'status': 'failed', 'new_bars': 0,
+                                 'attempts': attempts.get(ticker, 0), 'seconds': float('nan'), 'error': str(e)})
+                    print(f"Error downloading {ticker}: {e}")
+                if progress:
+                    progress(len(rows), len(futures))
+
+        report = pd.DataFrame(rows, columns=['ticker', 'status', 'new_bars', 'attempts', 'seconds', 'error'])
+        failed = int((report['status'] == 'failed').sum())
+        print(f"Downloaded {len(report) - failed}/{len(report)} tickers "
+              f"({int(report['new_bars'].sum())} new bars) in {time.perf_counter() - start:.2f}s")
+        return report.sort_values('ticker', ignore_index=True)
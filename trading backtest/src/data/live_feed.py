@@ -0,0 +1,228 @@
+import os
+import socket
+import threading
+import time
+import numpy as np
+import pandas as pd
+
+FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+def parse_bar_line(line):
+    """
+    Parses 'ticker,date,open,high,low,close,volume' into (ticker, bar dict).
+    Returns None for blank, header or malformed lines.
+    """
+    parts = line.strip().split(',')
+    if len(parts) != 7:
+        return None
+    try:
+        bar = {'date': pd.Timestamp(parts[1])}
+        for name, value in zip(FIELDS, parts[2:]):
+            bar[name] = float(value)
+    except ValueError:
+        return None
+    return parts[0].strip(), bar
+
+class BarRingBuffer:
+    """
+    Fixed-size buffer of the last `capacity` bars of one ticker, preallocated once.
+    Every bar is written twice (slot and slot + capacity), so the last n bars are always
+    one contiguous slice and view(n) returns NumPy views without copying or reallocating.
+    """
+    def __init__(self, capacity=500):
+        self.capacity = capacity
+        self.dates = np.zeros(2 * capacity, dtype='datetime64[ns]')
+        self.values = np.zeros((len(FIELDS), 2 * capacity))  # one contiguous row per field
+        self.count = 0  # bars appended so far
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def last_date(self):
+        return self.dates[(self.count - 1) % self.capacity] if self.count else None
+
+    def append(self, bar):
+        """
+        Appends a bar (mapping with 'date' and the OHLCV fields). A bar with the same date
+        as the last one replaces it (intrabar revision). Returns True if a new bar was added.
+        """
+        date = np.datetime64(pd.Timestamp(bar['date']), 'ns')
+        is_new = self.count == 0 or date != self.last_date()
+        if is_new:
+            self.count += 1
+        slot = (self.count - 1) % self.capacity
+        for pos in (slot, slot + self.capacity):
+            self.dates[pos] = date
+            self.values[:, pos] = [bar[name] for name in FIELDS]
+        return is_new
+
+    def extend(self, df):
+        """
+        Seeds the buffer from an OHLCV DataFrame (only its last `capacity` rows are kept).
+        """
+        tail = df.iloc[-self.capacity:]
+        for date, *values in tail[list(FIELDS)].itertuples(name=None):
+            self.append(dict(zip(FIELDS, values), date=date))
+
+    def view(self, n=None):
+        """
+        Last n bars (default: all) in chronological order: (dates, {field: array}).
+        The arrays are views into the buffer; copy them if the buffer is written concurrently.
+        """
+        n = len(self) if n is None else min(n, len(self))
+        end = (self.count - 1) % self.capacity + self.capacity + 1 if self.count else 0
+        window = slice(end - n, end)
+        return self.dates[window], {name: self.values[i, window] for i, name in enumerate(FIELDS)}
+
+class FileTailSource:
+    """
+    Follows a text file of bar lines (see parse_bar_line) like `tail -f`.
+    from_start: also emit the lines already in the file.
+    A file truncated in place (e.g. rewritten by its producer) is read again from the start.
+    """
+    def __init__(self, path, poll_interval=0.25, from_start=False):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.from_start = from_start
+        self._stop = threading.Event()
+
+    def bars(self):
+        while not os.path.exists(self.path) and not self._stop.is_set():
+            time.sleep(self.poll_interval)
+        with open(self.path, 'r') as f:
+            if not self.from_start:
+                f.seek(0, os.SEEK_END)
+            pending = ''
+            while not self._stop.is_set():
+                chunk = f.readline()
+                if not chunk:
+                    if os.fstat(f.fileno()).st_size < f.tell():
+                        f.seek(0)
+                        pending = ''
+                        continue
+                    time.sleep(self.poll_interval)
+                    continue
+                pending += chunk
+                if not pending.endswith('\n'):
+                    continue  # partially written line
+                parsed = parse_bar_line(pending)
+                pending = ''
+                if parsed is not None:
+                    yield parsed
+
+    def stop(self):
+        self._stop.set()
+
+class SocketSource:
+    """
+    Reads newline-delimited bar lines (see parse_bar_line) from a TCP server.
+    """
+    def __init__(self, host='127.0.0.1', port=9009, timeout=1.0):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._stop = threading.Event()
+
+    def bars(self):
+        with socket.create_connection((self.host, self.port), timeout=self.timeout) as sock:
+            pending = b''
+            while not self._stop.is_set():
+                try:
+                    data = sock.recv(65536)
+                except socket.timeout:
+                    continue
+                if not data:
+                    break  # server closed the connection
+                pending += data
+                *lines, pending = pending.split(b'\n')
+                for line in lines:
+                    parsed = parse_bar_line(line.decode('utf-8', errors='ignore'))
+                    if parsed is not None:
+                        yield parsed
+
+    def stop(self):
+        self._stop.set()
+
+class LiveFeed:
+    def __init__(self, source, capacity=500):
+        """
+        Pumps bars from a source (object with bars() -> iterator of (ticker, bar) and stop())
+        into one BarRingBuffer per ticker on a background thread.
+        Consumers either poll version(ticker)/snapshot(ticker) (e.g. ChartView on a timer)
+        or subscribe(callback) to be called on the feed thread for every new bar
+        (e.g. a StreamingBacktest's on_bar).
+        """
+        self.source = source
+        self.capacity = capacity
+        self.buffers = {}
+        self.versions = {}
+        self.subscribers = []
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def seed(self, ticker, df):
+        """
+        Preloads history (e.g. dm.get_data(ticker, 'daily')) so the chart has context before live bars arrive.
+        """
+        with self._lock:
+            buffer = self.buffers.setdefault(ticker, BarRingBuffer(self.capacity))
+            buffer.extend(df)
+            self.versions[ticker] = self.versions.get(ticker, 0) + 1
+
+    def subscribe(self, callback, ticker=None):
+        """
+        callback(ticker, bar) for every new bar (of `ticker` only, if given).
+        Revisions of the last bar update the buffer but are not re-sent.
+        """
+        self.subscribers.append((ticker, callback))
+
+    def push(self, ticker, bar):
+        with self._lock:
+            buffer = self.buffers.get(ticker)
+            if buffer is None:
+                buffer = self.buffers[ticker] = BarRingBuffer(self.capacity)
+            is_new = buffer.append(bar)
+            self.versions[ticker] = self.versions.get(ticker, 0) + 1
+        if is_new:
+            for wanted, callback in self.subscribers:
+                if wanted is None or wanted == ticker:
+                    callback(ticker, bar)
+
+    def tickers(self):
+        with self._lock:
+            return list(self.buffers)
+
+    def version(self, ticker):
+        """
+        Increments on every bar or revision for ticker; cheap to poll.
+        """
+        return self.versions.get(ticker, 0)
+
+    def snapshot(self, ticker, n=None):
+        """
+        Copy of the last n bars of ticker taken under the lock: (dates, {field: array}), or None.
+        """
+        with self._lock:
+            buffer = self.buffers.get(ticker)
+            if buffer is None or len(buffer) == 0:
+                return None
+            dates, fields = buffer.view(n)
+            return dates.copy(), {name: values.copy() for name, values in fields.items()}
+
+    def _pump(self):
+        try:
+            for ticker, bar in self.source.bars():
+                self.push(ticker, bar)
+        except Exception as e:
+            print(f"Live feed stopped: {e}")
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._pump, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self.source.stop()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
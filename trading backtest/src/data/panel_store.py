@@ -0,0 +1,148 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+
+class PanelStore:
+    """
+    Universe-wide daily OHLCV panel backed by numpy.memmap files, so several processes
+    (GUI, batch runners, optimizers) can share one physical copy through the OS page cache.
+
+    Layout:
+    data/panel/<dtype>-<source key>/
+      meta.json     (tickers, fields, dtype, shape)
+      dates.npy     (shared calendar: union of all trading days)
+      <field>.dat   (tickers x dates matrix, NaN where a ticker has no bar)
+    """
+    FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, panel_root, dtype='float64'):
+        self.panel_root = panel_root
+        self.dtype = np.dtype(dtype)
+
+        self.source_key = None
+        self.tickers = []
+        self.dates = None
+        self._rows = {}
+        self._fields = {}
+
+    @staticmethod
+    def make_source_key(signatures):
+        """
+        Stable digest of {ticker: source signature}; changes whenever any CSV changes.
+        """
+        payload = json.dumps(signatures, sort_keys=True).encode()
+        return hashlib.sha1(payload).hexdigest()[:16]
+
+    def _panel_dir(self, source_key):
+        return os.path.join(self.panel_root, f"{self.dtype.name}-{source_key}")
+
+    def is_current(self, source_key):
+        return self.source_key == source_key
+
+    def open(self, source_key):
+        """
+        Maps an existing panel read-only. Returns False if none was built for source_key.
+        """
+        panel_dir = self._panel_dir(source_key)
+        meta_path = os.path.join(panel_dir, 'meta.json')
+        if not os.path.exists(meta_path):
+            return False
+
+        with open(meta_path, 'r') as f:
+            meta = json.load(f)
+        shape = tuple(meta['shape'])
+
+        self.tickers = meta['tickers']
+        self._rows = {ticker: i for i, ticker in enumerate(self.tickers)}
+        self.dates = pd.DatetimeIndex(np.load(os.path.join(panel_dir, 'dates.npy'), mmap_mode='r'))
+        self._fields = {
+            field: np.memmap(os.path.join(panel_dir, f"{field}.dat"), dtype=self.dtype, mode='r', shape=shape)
+            for field in meta['fields']
+        }
+        self.source_key = source_key
+        return True
+
+    def build(self, frames, source_key):
+        """
+        Aligns {ticker: daily DataFrame} onto one calendar and writes the memmap files.
+        The panel is written to a temp directory and renamed into place, so concurrent
+        builders never expose a partial panel to readers.
+        """
+        frames = {t: df for t, df in frames.items() if df is not None and not df.empty}
+        tickers = sorted(frames)
+        if not tickers:
+            print("Warning: No daily data to build a panel from")
+            return False
+        os.makedirs(self.panel_root, exist_ok=True)
+
+        dates = np.unique(np.concatenate([frames[t].index.values for t in tickers]))
+        shape = (len(tickers), len(dates))
+
+        tmp_dir = tempfile.mkdtemp(dir=self.panel_root, prefix='.building-')
+        try:
+            np.save(os.path.join(tmp_dir, 'dates.npy'), dates)
+            for field in self.FIELDS:
+                mm = np.memmap(os.path.join(tmp_dir, f"{field}.dat"), dtype=self.dtype, mode='w+', shape=shape)
+                mm[:] = np.nan
+                for row, ticker in enumerate(tickers):
+                    df = frames[ticker]
+                    if field not in df.columns:
+                        continue
+                    cols = np.searchsorted(dates, df.index.values)
+                    mm[row, cols] = df[field].to_numpy(dtype=self.dtype)
+                mm.flush()
+                del mm
+
+            meta = {'tickers': tickers, 'fields': list(self.FIELDS), 'dtype': self.dtype.name, 'shape': list(shape)}
+            with open(os.path.join(tmp_dir, 'meta.json'), 'w') as f:
+                json.dump(meta, f)
+
+            try:
+                os.rename(tmp_dir, self._panel_dir(source_key))
+            except OSError:
+                # Another process finished the same panel first; use theirs
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        self._prune(source_key)
+        return self.open(source_key)
+
+    def _prune(self, keep_key):
+        """
+        Removes panels of this dtype built from older data (best effort: files still
+        mapped by another process may not be removable on Windows).
+        """
+        prefix = f"{self.dtype.name}-"
+        for name in os.listdir(self.panel_root):
+            if name.startswith(prefix) and name != f"{prefix}{keep_key}":
+                shutil.rmtree(os.path.join(self.panel_root, name), ignore_errors=True)
+
+    def field(self, name):
+        """
+        Returns the read-only tickers x dates memmap for an OHLCV field.
+        """
+        return self._fields[name]
+
+    def ticker_row(self, ticker):
+        return self._rows.get(ticker)
+
+    def series(self, ticker, field='close'):
+        """
+        Zero-copy view of one ticker's values on the shared calendar (or None).
+        """
+        row = self._rows.get(ticker)
+        if row is None:
+            return None
+        return self._fields[field][row]
+
+    def to_frame(self, field='close'):
+        """
+        Dates x tickers DataFrame over the memmap (transposed view, no copy).
+        """
+        return pd.DataFrame(self._fields[field].T, index=self.dates, columns=self.tickers, copy=False)
@@ -0,0 +1,186 @@
+import io
+import os
+import urllib.parse
+import urllib.request
+import pandas as pd
+import yfinance as yf
+from src.data.data_cache import atomic_write
+from src.data.data_manager import DataManager
+
+# Column order of the yfinance CSVs in data/daily
+CSV_COLUMNS = ['close', 'high', 'low', 'open', 'volume']
+# The CSVs hold split/dividend-adjusted prices (yfinance's default), so appended bars
+# must be downloaded the same way or they would not line up with the stored history
+AUTO_ADJUST = True
+
+class YFinanceSource:
+    """
+    Daily bars from Yahoo Finance. Files in data/daily are named by NSE symbol, so
+    `suffix` is appended to symbols without an exchange suffix (indices like ^NSEI excepted).
+    """
+    def __init__(self, suffix='.NS'):
+        self.suffix = suffix
+
+    def symbol(self, ticker):
+        if ticker.startswith('^') or '.' in ticker:
+            return ticker
+        return ticker + self.suffix
+
+    def fetch(self, ticker, start=None, timeout=30):
+        """
+        Returns daily bars from `start` (inclusive; None = max history) as a
+        lowercase-column DataFrame indexed by date.
+        """
+        symbol = self.symbol(ticker)
+        if start is None:
+            df = yf.download(symbol, period="max", progress=False, auto_adjust=AUTO_ADJUST, timeout=timeout)
+        else:
+            df = yf.download(symbol, start=start.strftime('%Y-%m-%d'), progress=False, auto_adjust=AUTO_ADJUST, timeout=timeout)
+        if df is None or df.empty:
+            return pd.DataFrame(columns=CSV_COLUMNS)
+        if isinstance(df.columns, pd.MultiIndex):
+            df.columns = df.columns.get_level_values(0)
+        df.columns = [c.lower() for c in df.columns]
+        df.index = pd.to_datetime(df.index).tz_localize(None)
+        return df
+
+class CSVDirectorySource:
+    """
+    Daily bars from another directory of <ticker>.csv files (e.g. a vendor drop or a network share).
+    """
+    def __init__(self, directory):
+        self.directory = directory
+
+    def fetch(self, ticker, start=None, timeout=None):
+        path = os.path.join(self.directory, f"{ticker}.csv")
+        if not os.path.exists(path):
+            return pd.DataFrame(columns=CSV_COLUMNS)
+        df = DataManager._read_csv(path)
+        return df if start is None else df[df.index >= start]
+
+class HTTPCSVSource:
+    """
+    Daily bars served as CSV over HTTP: GET <base_url>/<ticker>.csv[?start=YYYY-MM-DD].
+    """
+    def __init__(self, base_url, timeout=30):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    def url(self, ticker, start=None):
+        url = f"{self.base_url}/{urllib.parse.quote(ticker)}.csv"
+        if start is not None:
+            url += '?' + urllib.parse.urlencode({'start': start.strftime('%Y-%m-%d')})
+        return url
+
+    def fetch(self, ticker, start=None, timeout=None):
+        with urllib.request.urlopen(self.url(ticker, start), timeout=timeout or self.timeout) as response:
+            text = response.read().decode('utf-8')
+        if not text.strip():
+            return pd.DataFrame(columns=CSV_COLUMNS)
+        df = DataManager._read_csv(io.StringIO(text))
+        # The server may ignore the start parameter
+        return df if start is None else df[df.index >= start]
+
+class DataUpdater:
+    def __init__(self, data_manager, source=None):
+        """
+        Brings data/daily/<ticker>.csv up to date by fetching only the bars after the last
+        stored date and appending them, then folds them into the DataManager's frames and
+        cache (see DataManager.apply_update) instead of reloading everything.
+        source: object with fetch(ticker, start=None, timeout=None) -> DataFrame (default: Yahoo Finance)
+        """
+        self.dm = data_manager
+        self.source = source or YFinanceSource()
+
+    def csv_path(self, ticker):
+        return os.path.join(self.dm.daily_dir, f"{ticker}.csv")
+
+    @staticmethod
+    def last_stored_date(path):
+        """
+        Date of the last row of a daily CSV, read from the end of the file. None if there are no rows.
+        """
+        if not os.path.exists(path):
+            return None
+        with open(path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(0, size - 4096))
+            lines = f.read().decode('utf-8', errors='ignore').splitlines()
+        for line in reversed(lines):
+            date = pd.to_datetime(line.split(',', 1)[0], errors='coerce')
+            if not pd.isna(date):
+                return date
+        return None
+
+    @staticmethod
+    def _header_columns(path):
+        """
+        Column order of an existing CSV, so appended rows line up with its header.
+        """
+        with open(path, 'r') as f:
+            header = f.readline().strip().split(',')
+        return [c.lower() for c in header[1:]]
+
+    def fetch_missing(self, ticker, timeout=30, fetch=None):
+        """
+        Bars after the last stored date of a ticker (all history for a new ticker).
+        fetch: optional replacement for self.source.fetch (e.g. wrapped with retries).
+        """
+        last = self.last_stored_date(self.csv_path(ticker))
+        start = None if last is None else last + pd.Timedelta(days=1)
+        bars = (fetch or self.source.fetch)(ticker, start=start, timeout=timeout)
+        if last is not None:
+            bars = bars[bars.index > last]
+        return bars[~bars.index.duplicated(keep='last')].sort_index()
+
+    def update_ticker(self, ticker, timeout=30):
+        """
+        Appends the missing bars for one ticker. Returns the number of new bars.
+        """
+        bars = self.fetch_missing(ticker, timeout)
+        if bars.empty:
+            return 0
+
+        self.append_bars(self.csv_path(ticker), bars)
+        self.dm.apply_update(ticker, bars)
+        return len(bars)
+
+    def append_bars(self, path, bars):
+        """
+        Writes existing rows + new rows to a temp file and renames it over the CSV, so a
+        crash mid-update never leaves a truncated file behind.
+        """
+        if os.path.exists(path):
+            columns = self._header_columns(path)
+            with open(path, 'rb') as f:
+                existing = f.read()
+            if existing and not existing.endswith(b'\n'):
+                existing += b'\n'
+            header = False
+        else:
+            columns = CSV_COLUMNS
+            existing = b''
+            header = True
+
+        rows = bars.reindex(columns=columns)
+        rows.index.name = 'Date'
+        rows.columns = [c.capitalize() for c in columns]
+        text = rows.to_csv(header=header, date_format='%Y-%m-%d')
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        atomic_write(path, lambda f: f.write(existing + text.encode('utf-8')))
+
+    def update_all(self, tickers=None, timeout=30):
+        """
+        Updates each ticker in turn (default: every ticker in data/daily).
+        Returns {ticker: number of new bars, or the error message}.
+        """
+        report = {}
+        for ticker in tickers or self.dm.get_all_tickers():
+            try:
+                report[ticker] = self.update_ticker(ticker, timeout=timeout)
+                print(f"  {ticker}: +{report[ticker]} bars")
+            except Exception as e:
+                report[ticker] = str(e)
+                print(f"Error updating {ticker}: {e}")
+        return report
@@ -1,16 +1,28 @@
 import pandas as pd
 import numpy as np
 
+# Record layout of BacktestEngine.trades in fast mode
+TRADE_DTYPE = np.dtype([
+    ('type', 'U4'),
+    ('date', 'datetime64[ns]'),
+    ('price', 'f8'),
+    ('units', 'i8'),
+    ('value', 'f8'),
+    ('costs', 'f8')
+])
+
 class BacktestEngine:
-    def __init__(self, initial_capital=100000, brokerage=0.0005, stt=0.001):
+    def __init__(self, initial_capital=100000, brokerage=0.0005, stt=0.001, fast=False):
         """
         initial_capital: Starting cash in INR
         brokerage: Percentage per trade (default 0.05%)
         stt: Securities Transaction Tax (approx 0.1% for delivery)
+        fast: run on raw NumPy arrays; trades are kept in a TRADE_DTYPE structured array
         """
         self.initial_capital = initial_capital
         self.brokerage = brokerage
         self.stt = stt
+        self.fast = fast
         
         self.reset()
 
@@ -26,6 +38,10 @@ class BacktestEngine:
         data: DataFrame with OHLC
         signals: Series/DataFrame with 1 (Buy), -1 (Sell), 0 (Hold)
         """
+        if self.fast:
+            signals = pd.Series(signals, index=data.index) if not isinstance(signals, pd.Series) else signals.reindex(data.index)
+            return self.run_arrays(data['close'].to_numpy(dtype=float), signals.to_numpy(), data.index.values)
+        
         self.reset()
         
         # Ensure data and signals are aligned
@@ -33,68 +49,134 @@ class BacktestEngine:
         df['signal'] = signals
         
         for i in range(len(df)):
-            current_price = df['close'].iloc[i]
-            signal = df['signal'].iloc[i]
-            current_date = df.index[i]
+            self.step(df.index[i], df['close'].iloc[i], df['signal'].iloc[i])
 
-            # 1. Execute Sell Signal
-            if signal == -1 and self.position > 0:
-                sell_value = self.position * current_price
-                costs = sell_value * (self.brokerage + self.stt)
-                self.cash += (sell_value - costs)
+        return self.get_results()
+
+    def step(self, current_date, current_price, signal):
+        """
+        Advances the engine by one bar: executes the bar's signal at its close and appends
+        to the equity curve. O(1), so it can be driven bar by bar (see StreamingBacktest).
+        """
+        # 1. Execute Sell Signal
+        if signal == -1 and self.position > 0:
+            sell_value = self.position * current_price
+            costs = sell_value * (self.brokerage + self.stt)
+            self.cash += (sell_value - costs)
+            
+            self.trades.append({
+                'type': 'SELL',
+                'date': current_date,
+                'price': current_price,
+                'units': self.position,
+                'value': sell_value,
+                'costs': costs
+            })
+            self.position = 0
+
+        # 2. Execute Buy Signal
+        elif signal == 1 and self.position == 0:
+            # Buy with all available cash
+            # (Leaving a small buffer for costs)
+            max_buy_value = self.cash * 0.995 
+            units_to_buy = int(max_buy_value // current_price)
+            
+            if units_to_buy > 0:
+                buy_value = units_to_buy * current_price
+                costs = buy_value * self.brokerage # STT usually not on buy for delivery
+                self.cash -= (buy_value + costs)
+                self.position = units_to_buy
                 
                 self.trades.append({
-                    'type': 'SELL',
+                    'type': 'BUY',
                     'date': current_date,
                     'price': current_price,
-                    'units': self.position,
-                    'value': sell_value,
+                    'units': units_to_buy,
+                    'value': buy_value,
                     'costs': costs
                 })
-                self.position = 0
 
-            # 2. Execute Buy Signal
+        # 3. Update Equity Curve
+        current_val = self.cash + (self.position * current_price)
+        self.equity_curve.append(current_val)
+
+    def run_arrays(self, close, signals, dates):
+        """
+        Fast path over plain arrays (close prices, signals, datetime64 dates).
+        Only bars carrying a signal are visited in Python; between trades cash and
+        position are constant, so the equity curve is filled in one vectorized pass.
+        """
+        self.reset()
+        n = len(close)
+        
+        # 1. Walk the signal bars, applying the same sizing and cost rules as run()
+        trade_bars = []
+        trades = []
+        cash_after = []
+        position_after = []
+        for i in np.flatnonzero(signals):
+            signal = signals[i]
+            current_price = close[i]
+            if signal == -1 and self.position > 0:
+                sell_value = self.position * current_price
+                costs = sell_value * (self.brokerage + self.stt)
+                self.cash += (sell_value - costs)
+                trades.append(('SELL', dates[i], current_price, self.position, sell_value, costs))
+                self.position = 0
             elif signal == 1 and self.position == 0:
-                # Buy with all available cash
-                # (Leaving a small buffer for costs)
-                max_buy_value = self.cash * 0.995 
+                max_buy_value = self.cash * 0.995
                 units_to_buy = int(max_buy_value // current_price)
-                
-                if units_to_buy > 0:
-                    buy_value = units_to_buy * current_price
-                    costs = buy_value * self.brokerage # STT usually not on buy for delivery
-                    self.cash -= (buy_value + costs)
-                    self.position = units_to_buy
-                    
-                    self.trades.append({
-                        'type': 'BUY',
-                        'date': current_date,
-                        'price': current_price,
-                        'units': units_to_buy,
-                        'value': buy_value,
-                        'costs': costs
-                    })
-
-            # 3. Update Equity Curve
-            current_val = self.cash + (self.position * current_price)
-            self.equity_curve.append(current_val)
-
+                if units_to_buy <= 0:
+                    continue
+                buy_value = units_to_buy * current_price
+                costs = buy_value * self.brokerage
+                self.cash -= (buy_value + costs)
+                self.position = units_to_buy
+                trades.append(('BUY', dates[i], current_price, units_to_buy, buy_value, costs))
+            else:
+                continue
+            trade_bars.append(i)
+            cash_after.append(self.cash)
+            position_after.append(self.position)
+        
+        # 2. Equity = cash + position * close, with cash/position stepping at trade bars
+        cash = np.full(n, float(self.initial_capital))
+        position = np.zeros(n)
+        if trade_bars:
+            segment = np.searchsorted(trade_bars, np.arange(n), side='right') - 1
+            traded = segment >= 0
+            cash[traded] = np.asarray(cash_after)[segment[traded]]
+            position[traded] = np.asarray(position_after)[segment[traded]]
+        
+        self.trades = np.array(trades, dtype=TRADE_DTYPE)
+        self.equity_curve = cash + position * close
         return self.get_results()
 
     def get_results(self):
-        if not self.equity_curve:
+        if len(self.equity_curve) == 0:
             return {}
-            
-        final_value = self.equity_curve[-1]
-        total_return = (final_value - self.initial_capital) / self.initial_capital * 100
         
-        # Convert equity curve to series for easier analysis
-        equity_series = pd.Series(self.equity_curve)
-        
-        # Max Drawdown
-        roll_max = equity_series.cummax()
-        drawdown = (equity_series - roll_max) / roll_max
-        max_drawdown = drawdown.min() * 100
+        if self.fast:
+            equity = np.asarray(self.equity_curve)
+            final_value = equity[-1]
+            total_return = (final_value - self.initial_capital) / self.initial_capital * 100
+            
+            # fmax/nanmin skip NaN bars the same way cummax()/min() do
+            roll_max = np.fmax.accumulate(equity)
+            max_drawdown = np.nanmin((equity - roll_max) / roll_max) * 100
+            equity_curve = equity.tolist()
+        else:
+            final_value = self.equity_curve[-1]
+            total_return = (final_value - self.initial_capital) / self.initial_capital * 100
+            
+            # Convert equity curve to series for easier analysis
+            equity_series = pd.Series(self.equity_curve)
+            
+            # Max Drawdown
+            roll_max = equity_series.cummax()
+            drawdown = (equity_series - roll_max) / roll_max
+            max_drawdown = drawdown.min() * 100
+            equity_curve = self.equity_curve
         
         return {
             'initial_capital': self.initial_capital,
@@ -102,5 +184,5 @@ class BacktestEngine:
             'total_return_pct': total_return,
             'max_drawdown_pct': max_drawdown,
             'total_trades': len(self.trades),
-            'equity_curve': self.equity_curve
+            'equity_curve': equity_curve
         }
@@ -0,0 +1,52 @@
+import os
+import time
+import pandas as pd
+from src.engine.optimizer import ParameterOptimizer
+
+class BatchRunner:
+    def __init__(self, data_manager, strategy_cls, params=None, initial_capital=100000, workers=None):
+        """
+        Runs one strategy configuration over every ticker and timeframe, without any GUI.
+        params: constructor arguments for strategy_cls (defaults if None)
+        """
+        self.dm = data_manager
+        self.strategy_cls = strategy_cls
+        self.params = params or {}
+        # A one-point grid: the optimizer's worker pool does the fan-out
+        self.optimizer = ParameterOptimizer(strategy_cls, {k: [v] for k, v in self.params.items()},
+                                            initial_capital=initial_capital, workers=workers)
+
+    def run(self, tickers=None, timeframes=('daily', 'weekly', 'monthly')):
+        """
+        Returns a summary DataFrame with one row per (ticker, timeframe).
+        """
+        tickers = tickers or self.dm.get_all_tickers()
+        start = time.perf_counter()
+        tables = []
+        for tf in timeframes:
+            frames = {t: self.dm.get_data(t, tf) for t in tickers}
+            table = self.optimizer.run(frames)
+            if table.empty:
+                continue
+            table.insert(1, 'timeframe', tf)
+            tables.append(table)
+
+        if not tables:
+            return pd.DataFrame()
+        summary = pd.concat(tables, ignore_index=True).sort_values(['timeframe', 'total_return_pct'], ascending=[True, False], ignore_index=True)
+        print(f"Batch finished: {len(summary)} backtests in {time.perf_counter() - start:.2f}s")
+        return summary
+
+    @staticmethod
+    def save(table, path):
+        """
+        Writes the summary as CSV, or Parquet when path ends in .parquet (needs pyarrow).
+        """
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        if path.endswith('.parquet'):
+            try:
+                table.to_parquet(path, index=False)
+            except ImportError as e:
+                raise RuntimeError(f"Writing Parquet requires pyarrow ({e}); use a .csv path instead") from e
+        else:
+            table.to_csv(path, index=False)
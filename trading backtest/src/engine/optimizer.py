@@ -0,0 +1,116 @@
+import itertools
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pandas as pd
+from src.engine.backtest_engine import BacktestEngine
+
+METRIC_COLUMNS = ['total_return_pct', 'max_drawdown_pct', 'total_trades', 'final_value']
+
+# Price data installed once per worker process by _init_worker
+_worker_frames = {}
+
+def _init_worker(frames):
+    global _worker_frames
+    _worker_frames = frames
+
+def evaluate(strategy_cls, df, param_sets, engine_kwargs):
+    """
+    Backtests each parameter set on one price series; returns one row of metrics per set.
+    """
+    engine = BacktestEngine(fast=True, **engine_kwargs)
+    cache = {}  # indicators shared by all parameter sets on this series
+    rows = []
+    for params in param_sets:
+        signals = strategy_cls(**params).generate_signals(df, cache)
+        results = engine.run(df, signals)
+        row = dict(params)
+        row.update({k: results.get(k) for k in METRIC_COLUMNS})
+        rows.append(row)
+    return rows
+
+def _pool_task(strategy_cls, ticker, param_sets, engine_kwargs):
+    rows = evaluate(strategy_cls, _worker_frames[ticker], param_sets, engine_kwargs)
+    for row in rows:
+        row['ticker'] = ticker
+    return rows
+
+def parse_grid(specs):
+    """
+    Parses CLI grid specs such as ['p_fast=5,8,13', 'p_slow=50:200:25'] (ranges are inclusive).
+    """
+    grid = {}
+    for spec in specs:
+        name, _, values = spec.partition('=')
+        if not values:
+            raise ValueError(f"Invalid grid spec '{spec}', expected name=v1,v2 or name=start:stop:step")
+        if ':' in values:
+            start, stop, step = (int(v) for v in values.split(':'))
+            grid[name] = list(range(start, stop + 1, step))
+        else:
+            grid[name] = [int(v) for v in values.split(',')]
+    return grid
+
+class ParameterOptimizer:
+    def __init__(self, strategy_cls, param_grid=None, initial_capital=100000, brokerage=0.0005, stt=0.001, workers=None):
+        """
+        Sweeps a strategy's parameter grid over one or many tickers on a process pool.
+        param_grid: {constructor argument: candidate values}, defaults to strategy_cls.PARAM_GRID
+        workers: process count (None = all cores, 1 = run in-process)
+        """
+        self.strategy_cls = strategy_cls
+        self.param_grid = strategy_cls.PARAM_GRID if param_grid is None else param_grid
+        self.engine_kwargs = {'initial_capital': initial_capital, 'brokerage': brokerage, 'stt': stt}
+        self.workers = max(1, workers or os.cpu_count() or 1)
+
+    def combinations(self):
+        names = list(self.param_grid)
+        combos = [dict(zip(names, values)) for values in itertools.product(*self.param_grid.values())]
+        return [c for c in combos if self.strategy_cls.valid_params(**c)]
+
+    def run(self, frames, rank_by='total_return_pct', ascending=False, progress=None):
+        """
+        frames: {ticker: OHLC DataFrame}. Each worker receives the price data once, at start-up.
+        progress: optional callable(done, total) invoked as chunks complete.
+        Returns a DataFrame with one row per (ticker, parameter set), best first.
+        """
+        frames = {t: df for t, df in frames.items() if df is not None and not df.empty}
+        combos = self.combinations()
+        total = len(frames) * len(combos)
+        if total == 0:
+            return pd.DataFrame()
+
+        start = time.perf_counter()
+        rows = []
+        if self.workers == 1:
+            for ticker, df in frames.items():
+                for row in evaluate(self.strategy_cls, df, combos, self.engine_kwargs):
+                    row['ticker'] = ticker
+                    rows.append(row)
+                if progress:
+                    progress(len(rows), total)
+        else:
+            # A few chunks per worker keeps the pool busy without per-backtest task overhead
+            chunk = max(1, math.ceil(total / (self.workers * 4)))
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(frames,)) as pool:
+                futures = [pool.submit(_pool_task, self.strategy_cls, ticker, combos[i:i + chunk], self.engine_kwargs)
+                           for ticker in frames for i in range(0, len(combos), chunk)]
+                for future in as_completed(futures):
+                    rows.extend(future.result())
+                    if progress:
+                        progress(len(rows), total)
+
+        print(f"Evaluated {total} backtests in {time.perf_counter() - start:.2f}s using {self.workers} worker(s)")
+        table = pd.DataFrame(rows, columns=['ticker'] + list(self.param_grid) + METRIC_COLUMNS)
+        return table.sort_values(rank_by, ascending=ascending, ignore_index=True)
+
+    def summarize(self, table, rank_by='total_return_pct', ascending=False):
+        """
+        Averages the metrics of each parameter set across tickers, best first.
+        """
+        if table.empty:
+            return table
+        summary = table.groupby(list(self.param_grid))[METRIC_COLUMNS].mean()
+        summary['tickers'] = table.groupby(list(self.param_grid)).size()
+        return summary.sort_values(rank_by, ascending=ascending).reset_index()
@@ -0,0 +1,210 @@
+import pandas as pd
+import numpy as np
+
+# Record layout of PortfolioEngine.trades
+PORTFOLIO_TRADE_DTYPE = np.dtype([
+    ('ticker', 'U20'),
+    ('type', 'U4'),
+    ('date', 'datetime64[ns]'),
+    ('price', 'f8'),
+    ('units', 'i8'),
+    ('value', 'f8'),
+    ('costs', 'f8')
+])
+
+class PortfolioEngine:
+    SIZING_RULES = ('equal_weight', 'fixed_fraction', 'fixed_amount')
+
+    def __init__(self, initial_capital=1000000, brokerage=0.0005, stt=0.001,
+                 max_positions=10, sizing='equal_weight', position_size=None):
+        """
+        Runs one strategy over many tickers with shared cash on a common date calendar.
+
+        max_positions: cap on simultaneously open positions (None = no cap)
+        sizing: how much each new position targets
+            'equal_weight'   -> current equity / max_positions (or / number of tickers)
+            'fixed_fraction' -> position_size x current equity (e.g. 0.05)
+            'fixed_amount'   -> position_size INR
+        Costs follow BacktestEngine: brokerage on buys, brokerage + STT on sells,
+        and buys keep the same 0.995 cash buffer.
+        """
+        if sizing not in self.SIZING_RULES:
+            raise ValueError(f"Unknown sizing rule: {sizing}")
+        if sizing != 'equal_weight' and position_size is None:
+            raise ValueError(f"Sizing rule '{sizing}' requires position_size")
+
+        self.initial_capital = initial_capital
+        self.brokerage = brokerage
+        self.stt = stt
+        self.max_positions = max_positions
+        self.sizing = sizing
+        self.position_size = position_size
+
+        self.reset()
+
+    def reset(self):
+        self.cash = self.initial_capital
+        self.tickers = []
+        self.dates = None
+        self.units = None
+        self.trades = np.array([], dtype=PORTFOLIO_TRADE_DTYPE)
+        self.equity_curve = np.array([])
+
+    @staticmethod
+    def align(frames, signals):
+        """
+        Aligns {ticker: OHLC DataFrame} and {ticker: signal Series} onto the union of their dates.
+        Returns (tickers, dates, close matrix, signal matrix), matrices shaped tickers x dates;
+        close is NaN and the signal 0 where a ticker has no bar.
+        """
+        tickers = sorted(t for t, df in frames.items() if df is not None and not df.empty)
+        if not tickers:
+            return [], np.array([], dtype='datetime64[ns]'), np.empty((0, 0)), np.empty((0, 0), dtype=np.int8)
+
+        dates = np.unique(np.concatenate([frames[t].index.values for t in tickers]))
+        close = np.full((len(tickers), len(dates)), np.nan)
+        sig = np.zeros((len(tickers), len(dates)), dtype=np.int8)
+        for row, ticker in enumerate(tickers):
+            df = frames[ticker]
+            cols = np.searchsorted(dates, df.index.values)
+            close[row, cols] = df['close'].to_numpy(dtype=float)
+            s = signals.get(ticker)
+            if s is not None:
+                sig[row, cols] = np.nan_to_num(np.asarray(s, dtype=float)).astype(np.int8)
+        return tickers, dates, close, sig
+
+    def run_strategy(self, strategy, frames, caches=None):
+        """
+        Generates the strategy's signals per ticker and runs the portfolio over all of them.
+        caches: optional {ticker: indicator cache} passed through to generate_signals.
+        """
+        caches = caches or {}
+        signals = {t: strategy.generate_signals(df, caches.get(t)) for t, df in frames.items() if df is not None and not df.empty}
+        tickers, dates, close, sig = self.align(frames, signals)
+        return self.run(close, sig, dates, tickers)
+
+    def _target_value(self, equity, n_tickers):
+        if self.sizing == 'equal_weight':
+            return equity / (self.max_positions or n_tickers)
+        if self.sizing == 'fixed_fraction':
+            return equity * self.position_size
+        return float(self.position_size)
+
+    def run(self, close, signals, dates, tickers):
+        """
+        close, signals: tickers x dates matrices (NaN close = no bar that day).
+        Sells are processed before buys on each bar so freed cash can be reused.
+        Buy candidates are filled in ticker order while open slots and cash last.
+        """
+        self.reset()
+        n_tickers, n_dates = close.shape
+        self.tickers = list(tickers)
+        self.dates = dates
+        if n_dates == 0:
+            return self.get_results()
+
+        has_bar = ~np.isnan(close)
+        # Last known price, used to value holdings on days a ticker does not trade
+        mark = pd.DataFrame(close.T).ffill().fillna(0.0).to_numpy().T
+
+        units = np.zeros(n_tickers, dtype=np.int64)
+        cash = float(self.initial_capital)
+        tickers_arr = np.asarray(self.tickers)
+        trades = []
+        snap_bars, snap_cash, snap_units = [], [], []
+
+        active_bars = np.flatnonzero((signals != 0).any(axis=0))
+        for t in active_bars:
+            sig = signals[:, t]
+            px = close[:, t]
+            changed = False
+
+            # 1. Sells
+            sell = np.flatnonzero((sig == -1) & (units > 0) & has_bar[:, t])
+            if len(sell):
+                sell_value = units[sell] * px[sell]
+                costs = sell_value * (self.brokerage + self.stt)
+                cash += float((sell_value - costs).sum())
+                trades.extend(zip(tickers_arr[sell], ['SELL'] * len(sell), [dates[t]] * len(sell),
+                                  px[sell], units[sell], sell_value, costs))
+                units[sell] = 0
+                changed = True
+
+            # 2. Buys
+            candidates = np.flatnonzero((sig == 1) & (units == 0) & has_bar[:, t])
+            slots = len(candidates) if self.max_positions is None else max(0, self.max_positions - int((units > 0).sum()))
+            if len(candidates) and slots:
+                equity = cash + float(units @ mark[:, t])
+                target = self._target_value(equity, n_tickers)
+                # Greedy fill in ticker order: each candidate gets its target or whatever is
+                # left of the budget (cash minus the cost buffer), the marginal one partially.
+                # A candidate that cannot afford one share takes neither a slot nor budget.
+                budget = cash * 0.995
+                buy, units_to_buy = [], []
+                for i in candidates:
+                    n_units = int(min(target, budget) // px[i])
+                    if n_units <= 0:
+                        continue
+                    budget -= n_units * px[i] * (1 + self.brokerage)
+                    buy.append(i)
+                    units_to_buy.append(n_units)
+                    if len(buy) == slots:
+                        break
+                if buy:
+                    buy, units_to_buy = np.asarray(buy), np.asarray(units_to_buy, dtype=np.int64)
+                    buy_value = units_to_buy * px[buy]
+                    costs = buy_value * self.brokerage
+                    cash -= float((buy_value + costs).sum())
+                    units[buy] = units_to_buy
+                    trades.extend(zip(tickers_arr[buy], ['BUY'] * len(buy), [dates[t]] * len(buy),
+                                      px[buy], units_to_buy, buy_value, costs))
+                    changed = True
+
+            if changed:
+                snap_bars.append(t)
+                snap_cash.append(cash)
+                snap_units.append(units.copy())
+
+        # 3. Combined equity: holdings are constant between trade bars
+        equity = np.full(n_dates, float(self.initial_capital))
+        if snap_bars:
+            segment = np.searchsorted(snap_bars, np.arange(n_dates), side='right') - 1
+            traded = segment >= 0
+            held = np.asarray(snap_units, dtype=float)[segment[traded]]
+            equity[traded] = np.asarray(snap_cash)[segment[traded]] + np.einsum('ij,ji->i', held, mark[:, traded])
+
+        self.cash = cash
+        self.units = units
+        self.trades = np.array(trades, dtype=PORTFOLIO_TRADE_DTYPE)
+        self.equity_curve = equity
+        return self.get_results()
+
+    def get_positions(self):
+        """
+        Open positions at the end of the run as {ticker: units}.
+        """
+        if self.units is None:
+            return {}
+        return {self.tickers[i]: int(self.units[i]) for i in np.flatnonzero(self.units)}
+
+    def get_results(self):
+        if len(self.equity_curve) == 0:
+            return {}
+
+        equity = self.equity_curve
+        final_value = equity[-1]
+        total_return = (final_value - self.initial_capital) / self.initial_capital * 100
+
+        roll_max = np.fmax.accumulate(equity)
+        max_drawdown = np.nanmin((equity - roll_max) / roll_max) * 100
+
+        return {
+            'initial_capital': self.initial_capital,
+            'final_value': final_value,
+            'total_return_pct': total_return,
+            'max_drawdown_pct': max_drawdown,
+            'total_trades': len(self.trades),
+            'equity_curve': equity.tolist(),
+            'dates': self.dates,
+            'open_positions': len(self.get_positions())
+        }
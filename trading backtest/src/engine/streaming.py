@@ -0,0 +1,70 @@
+import numpy as np
+from src.engine.backtest_engine import BacktestEngine, TRADE_DTYPE
+
+class StreamingBacktest:
+    def __init__(self, strategy, initial_capital=100000, brokerage=0.0005, stt=0.001):
+        """
+        Event-driven backtest: each bar goes through strategy.on_bar() and
+        BacktestEngine.step(), so state advances one bar at a time without touching
+        history. Usable for paper trading or replaying a live feed.
+        """
+        self.strategy = strategy
+        self.engine = BacktestEngine(initial_capital=initial_capital, brokerage=brokerage, stt=stt)
+        self.reset()
+
+    def reset(self):
+        self.strategy.reset_stream()
+        self.engine.reset()
+        self.bars = 0
+
+    def on_bar(self, bar):
+        """
+        bar: mapping with 'date' and 'close' (plus any fields the strategy uses).
+        Returns the signal generated on this bar.
+        """
+        signal = self.strategy.on_bar(bar)
+        self.engine.step(bar['date'], bar['close'], signal)
+        self.bars += 1
+        return signal
+
+    def replay(self, data):
+        """
+        Feeds an OHLC DataFrame bar by bar (e.g. to check against the batch engine).
+        """
+        self.reset()
+        columns = list(data.columns)
+        for date, *values in data.itertuples(name=None):
+            bar = dict(zip(columns, values))
+            bar['date'] = date
+            self.on_bar(bar)
+        return self.results()
+
+    def results(self):
+        return self.engine.get_results()
+
+    @property
+    def trades(self):
+        return self.engine.trades
+
+def trades_array(trades):
+    """
+    Trades as a TRADE_DTYPE array, from either engine's representation (list of dicts or array).
+    """
+    if isinstance(trades, np.ndarray):
+        return trades
+    return np.array([tuple(t[name] for name in TRADE_DTYPE.names) for t in trades], dtype=TRADE_DTYPE)
+
+def compare_with_batch(strategy_cls, params, data, **engine_kwargs):
+    """
+    Runs the batch (generate_signals + fast engine) and streaming paths on the same data.
+    Returns (identical, batch trades, streamed trades).
+    """
+    batch = BacktestEngine(fast=True, **engine_kwargs)
+    batch_results = batch.run(data, strategy_cls(**params).generate_signals(data))
+    stream = StreamingBacktest(strategy_cls(**params), **engine_kwargs)
+    stream_results = stream.replay(data)
+
+    batch_trades, stream_trades = trades_array(batch.trades), trades_array(stream.trades)
+    identical = np.array_equal(batch_trades, stream_trades) and np.array_equal(
+        np.asarray(batch_results.get('equity_curve', [])), np.asarray(stream_results.get('equity_curve', [])))
+    return identical, batch_trades, stream_trades
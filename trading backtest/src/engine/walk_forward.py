@@ -0,0 +1,165 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from src.engine.backtest_engine import BacktestEngine
+from src.engine.optimizer import ParameterOptimizer
+
+# Per-worker copy of the series and precomputed conditions, installed once by _init_worker
+_worker_state = {}
+
+def _init_worker(state):
+    global _worker_state
+    _worker_state = state
+
+def _run_window(state, window, rank_by, ascending, engine_kwargs):
+    """
+    Optimizes on the in-sample slice, then backtests the winner on the out-of-sample slice.
+    Conditions were computed once on the full history, so each slice only re-runs the
+    entry/exit state machine and the engine.
+    """
+    is_start, is_end, oos_start, oos_end = window
+    close, dates, combos, conditions, warmups = (state[k] for k in ('close', 'dates', 'combos', 'conditions', 'warmups'))
+    build_signals = state['strategy_cls'].build_signals
+    engine = BacktestEngine(fast=True, **engine_kwargs)
+
+    def backtest(k, start, end):
+        entry, exit = conditions[k]
+        signals = build_signals(entry[start:end], exit[start:end], None, start=max(0, warmups[k] - start))
+        return engine.run_arrays(close[start:end], signals.to_numpy(), dates[start:end])
+
+    best_k, best_score = None, None
+    for k in range(len(combos)):
+        score = backtest(k, is_start, is_end).get(rank_by)
+        if score is None or np.isnan(score):
+            continue
+        if best_score is None or (score < best_score if ascending else score > best_score):
+            best_k, best_score = k, score
+    if best_k is None:
+        return None
+
+    results = backtest(best_k, oos_start, oos_end)
+    return {
+        'window': window,
+        'params': combos[best_k],
+        'in_sample_score': best_score,
+        'equity_curve': np.asarray(results['equity_curve']),
+        'trades': results['total_trades']
+    }
+
+def _pool_window(window, rank_by, ascending, engine_kwargs):
+    return _run_window(_worker_state, window, rank_by, ascending, engine_kwargs)
+
+class WalkForwardOptimizer:
+    def __init__(self, strategy_cls, param_grid=None, in_sample_bars=756, out_sample_bars=252,
+                 rank_by='total_return_pct', ascending=False,
+                 initial_capital=100000, brokerage=0.0005, stt=0.001, workers=None):
+        """
+        Rolling walk-forward analysis: optimize on in_sample_bars, trade the winner on the
+        following out_sample_bars, then roll forward by out_sample_bars.
+        The strategy must provide entry_exit_conditions(data, cache) (see SMAStackStrategy).
+        workers: process count for running windows in parallel (None = all cores, 1 = in-process)
+        """
+        self.strategy_cls = strategy_cls
+        self.optimizer = ParameterOptimizer(strategy_cls, param_grid, workers=1)
+        self.in_sample_bars = in_sample_bars
+        self.out_sample_bars = out_sample_bars
+        self.rank_by = rank_by
+        self.ascending = ascending
+        self.initial_capital = initial_capital
+        self.engine_kwargs = {'initial_capital': initial_capital, 'brokerage': brokerage, 'stt': stt}
+        self.workers = max(1, workers or os.cpu_count() or 1)
+
+    def windows(self, n_bars):
+        """
+        Returns (is_start, is_end, oos_start, oos_end) bar ranges, end-exclusive.
+        """
+        windows = []
+        start = 0
+        while start + self.in_sample_bars < n_bars:
+            is_end = start + self.in_sample_bars
+            windows.append((start, is_end, is_end, min(is_end + self.out_sample_bars, n_bars)))
+            start += self.out_sample_bars
+        return windows
+
+    def precompute(self, data):
+        """
+        Entry/exit conditions for every parameter set over the full history. Indicators are
+        shared between parameter sets through one cache, and every window slices these arrays.
+        """
+        cache = {}
+        combos = self.optimizer.combinations()
+        conditions, warmups = [], []
+        for params in combos:
+            strategy = self.strategy_cls(**params)
+            conditions.append(strategy.entry_exit_conditions(data, cache))
+            warmups.append(strategy.warmup_bars)
+        return {
+            'strategy_cls': self.strategy_cls,
+            'close': data['close'].to_numpy(dtype=float),
+            'dates': data.index.values,
+            'combos': combos,
+            'conditions': conditions,
+            'warmups': warmups
+        }
+
+    def run(self, data):
+        windows = self.windows(len(data))
+        if not windows:
+            print(f"Warning: Need more than {self.in_sample_bars} bars for a walk-forward run")
+            return {}
+
+        start = time.perf_counter()
+        state = self.precompute(data)
+        args = (self.rank_by, self.ascending, self.engine_kwargs)
+        if self.workers == 1 or len(windows) == 1:
+            segments = [_run_window(state, w, *args) for w in windows]
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(windows)),
+                                     initializer=_init_worker, initargs=(state,)) as pool:
+                segments = list(pool.map(_pool_window, windows, *[[a] * len(windows) for a in args]))
+        print(f"Walk-forward over {len(windows)} windows x {len(state['combos'])} parameter sets "
+              f"in {time.perf_counter() - start:.2f}s")
+
+        return self._stitch(data.index, [s for s in segments if s is not None])
+
+    def _stitch(self, index, segments):
+        """
+        Chains the out-of-sample equity curves: each segment is rescaled to start from the
+        previous segment's final value (open positions are marked to market at the boundary).
+        """
+        if not segments:
+            return {}
+
+        rows, curves, dates = [], [], []
+        capital = float(self.initial_capital)
+        total_trades = 0
+        for seg in segments:
+            is_start, is_end, oos_start, oos_end = seg['window']
+            curve = seg['equity_curve'] / self.initial_capital * capital
+            oos_return = (curve[-1] / capital - 1) * 100
+            rows.append({
+                'in_sample_start': index[is_start], 'in_sample_end': index[is_end - 1],
+                'out_sample_start': index[oos_start], 'out_sample_end': index[oos_end - 1],
+                **seg['params'],
+                f"in_sample_{self.rank_by}": seg['in_sample_score'],
+                'out_sample_return_pct': oos_return,
+                'out_sample_trades': seg['trades']
+            })
+            curves.append(curve)
+            dates.append(index[oos_start:oos_end])
+            capital = curve[-1]
+            total_trades += seg['trades']
+
+        equity = np.concatenate(curves)
+        roll_max = np.fmax.accumulate(equity)
+        return {
+            'initial_capital': self.initial_capital,
+            'final_value': equity[-1],
+            'total_return_pct': (equity[-1] - self.initial_capital) / self.initial_capital * 100,
+            'max_drawdown_pct': np.nanmin((equity - roll_max) / roll_max) * 100,
+            'total_trades': total_trades,
+            'equity_curve': pd.Series(equity, index=pd.DatetimeIndex(np.concatenate([d.values for d in dates]))),
+            'windows': pd.DataFrame(rows)
+        }
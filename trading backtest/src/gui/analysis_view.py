@@ -7,6 +7,12 @@ import pyqtgraph as pg
 import pandas as pd
 import numpy as np
 from src.utils.metrics_calculator import MetricsCalculator
+from src.utils.lru_cache import LRUCache
+from src.utils.rolling_metrics import RollingMetrics
+from src.gui.jobs import JobRunner
+
+# Rolling window choices (trading days)
+ROLLING_WINDOWS = {'1 Month': 21, '3 Months': 63, '6 Months': 126, '1 Year': 252}
 
 class MetricCard(QFrame):
     def __init__(self, title, value, unit="", is_percent=False, scale_factor=1.0):
@@ -43,6 +49,19 @@ class AnalysisView(QWidget):
         self.dm = data_manager
         self.scale_factor = 1.2
         self.current_ticker = None
+        self.current_returns = None
+        self.current_range = None
+        self.rankings = LRUCache(max_items=8)  # (window, panel source key) -> ranking table
+        self.ranking_key = None  # key of the ranking currently shown
+        self.indexes = LRUCache(max_items=32)  # (ticker, data version) -> PerformanceIndex
+        self.results = LRUCache(max_items=64)  # (ticker, period, data version) -> analysis result
+        self.rolling = LRUCache(max_items=32)  # (ticker, window, data versions) -> rolling metrics
+        self.shown_key = None  # key of the result currently on screen
+        self.pending_key = None  # key being computed in the background
+        self.jobs = JobRunner(self)
+        self.mc_jobs = JobRunner(self)
+        self.roll_jobs = JobRunner(self)
+        self.rank_jobs = JobRunner(self)
         
         self.init_ui()
 
@@ -69,7 +88,7 @@ class AnalysisView(QWidget):
         
         self.run_btn = QPushButton("Refresh Analysis")
         self.run_btn.setStyleSheet(f"background-color: #2962ff; color: white; padding: 8px 20px; font-weight: bold; border-radius: 4px; font-size: {int(13 * self.scale_factor)}px;")
-        self.run_btn.clicked.connect(lambda: self.update_analysis(self.ticker_selector.currentText()))
+        self.run_btn.clicked.connect(lambda: self.update_analysis(self.ticker_selector.currentText(), force=True))
 
         header_layout.addWidget(QLabel("Ticker:"))
         header_layout.addWidget(self.ticker_selector)
@@ -125,6 +144,70 @@ class AnalysisView(QWidget):
         self.heatmap_table.setFixedHeight(int(450 * self.scale_factor))
         self.dash_layout.addWidget(self.heatmap_table)
         
+        # Section E: Rolling Metrics (selected ticker) and universe ranking
+        roll_header = QHBoxLayout()
+        roll_label = QLabel("ROLLING METRICS")
+        roll_label.setStyleSheet(f"color: #d1d4dc; font-weight: bold; font-size: {int(14 * self.scale_factor)}px;")
+        self.roll_window = QComboBox()
+        self.roll_window.addItems(list(ROLLING_WINDOWS))
+        self.roll_window.setCurrentText('3 Months')
+        self.roll_window.currentTextChanged.connect(self.update_rolling)
+        self.roll_metric = QComboBox()
+        self.roll_metric.addItems(['Sharpe', 'Volatility', 'Drawdown', 'Beta'])
+        self.roll_metric.currentTextChanged.connect(self.update_rolling)
+        roll_header.addWidget(roll_label)
+        roll_header.addStretch()
+        roll_header.addWidget(QLabel("Window:"))
+        roll_header.addWidget(self.roll_window)
+        roll_header.addWidget(QLabel("Metric:"))
+        roll_header.addWidget(self.roll_metric)
+        self.dash_layout.addLayout(roll_header)
+        
+        roll_splitter = QSplitter(Qt.Horizontal)
+        self.roll_plot = pg.PlotWidget()
+        self.roll_plot.setBackground('#131722')
+        self.roll_plot.showGrid(x=True, y=True, alpha=0.1)
+        roll_splitter.addWidget(self.roll_plot)
+        
+        self.rank_table = QTableWidget()
+        self.rank_table.setStyleSheet("""
+            QTableWidget { background-color: #131722; color: #d1d4dc; border: 1px solid #363c4e; gridline-color: #2a2e39; }
+            QHeaderView::section { background-color: #1e222d; color: #d1d4dc; padding: 5px; border: 1px solid #363c4e; }
+        """)
+        self.rank_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.rank_table.cellDoubleClicked.connect(lambda row, col: self.ticker_selector.setCurrentText(self.rank_table.item(row, 0).text()))
+        roll_splitter.addWidget(self.rank_table)
+        roll_splitter.setSizes([700, 500])
+        roll_splitter.setMinimumHeight(int(350 * self.scale_factor))
+        self.dash_layout.addWidget(roll_splitter)
+        
+        # Section F: Monte Carlo (bootstrapped daily returns of the selected period)
+        mc_header = QHBoxLayout()
+        self.mc_label = QLabel("MONTE CARLO (BOOTSTRAPPED DAILY RETURNS)")
+        self.mc_label.setStyleSheet(f"color: #d1d4dc; font-weight: bold; font-size: {int(14 * self.scale_factor)}px;")
+        self.mc_sims = QComboBox()
+        self.mc_sims.addItems(['1,000', '10,000', '50,000'])
+        self.mc_sims.setCurrentText('10,000')
+        self.mc_btn = QPushButton("Run Simulation")
+        self.mc_btn.setStyleSheet(f"background-color: #2962ff; color: white; padding: 6px 15px; border-radius: 4px; font-size: {int(13 * self.scale_factor)}px;")
+        self.mc_btn.clicked.connect(self.run_monte_carlo)
+        mc_header.addWidget(self.mc_label)
+        mc_header.addStretch()
+        mc_header.addWidget(QLabel("Paths:"))
+        mc_header.addWidget(self.mc_sims)
+        mc_header.addWidget(self.mc_btn)
+        self.dash_layout.addLayout(mc_header)
+        
+        self.mc_plot = pg.PlotWidget(title="Simulated Cumulative Returns (%): 5-95 / 25-75 percentile bands, median")
+        self.mc_plot.setBackground('#131722')
+        self.mc_plot.showGrid(x=True, y=True, alpha=0.1)
+        self.mc_plot.setMinimumHeight(int(350 * self.scale_factor))
+        self.dash_layout.addWidget(self.mc_plot)
+        
+        self.mc_summary = QLabel("Run a simulation to see the distribution of CAGR, max drawdown and Sharpe ratio.")
+        self.mc_summary.setStyleSheet(f"color: #d1d4dc; font-family: monospace; font-size: {int(13 * self.scale_factor)}px;")
+        self.dash_layout.addWidget(self.mc_summary)
+        
         scroll.setWidget(self.dash_content)
         main_layout.addWidget(scroll)
 
@@ -139,14 +222,101 @@ class AnalysisView(QWidget):
     def on_period_changed(self, period):
         self.update_analysis(self.ticker_selector.currentText())
 
-    def update_analysis(self, ticker):
+    def update_analysis(self, ticker, force=False):
+        """
+        Shows the analysis of ticker over the selected period. Results are cached per
+        (ticker, period, data version) and computed on a worker thread on a miss. A refresh
+        for what is already on screen or being computed (e.g. the selector signal repeating
+        an explicit call) is skipped unless force is set.
+        """
         if not ticker: return
-        self.current_ticker = ticker
+        period_str = self.period_selector.currentText()
+        key = (ticker, period_str, self.dm.get_data_version(ticker))
+        if not force and key == self.pending_key and self.jobs.is_running(): return
+        if not force and key == self.shown_key:
+            self.jobs.cancel()  # back to what is shown before another selection finished
+            self.pending_key = None
+            self.info_label.setText(self.results.get(key, {}).get('info', ""))
+            return
+        if force:
+            self.results.pop(key)
+        result = self.results.get(key)
+        if result is not None:
+            self.jobs.cancel()  # an older selection still computing is no longer wanted
+            self.pending_key = None
+            self.display(key, result)
+            return
+        
+        # Cache miss: compute on a worker thread; the runner drops the result if the
+        # selection changes again before it finishes
+        self.pending_key = key
+        window = ROLLING_WINDOWS[self.roll_window.currentText()]
+        self.info_label.setText(f"Computing {ticker} ({period_str})...")
+        self.jobs.submit(self.prepare_analysis, ticker, period_str, window,
+                         on_result=lambda result: self.on_analysis_ready(key, result),
+                         on_progress=lambda percent, message: self.info_label.setText(f"{message}... {percent}%"),
+                         on_error=lambda error: self.info_label.setText(f"Analysis failed: {error}"))
+
+    def prepare_analysis(self, job, ticker, period_str, window):
+        """
+        Worker-thread part of update_analysis: the analysis result plus the performance index,
+        rolling metrics and universe ranking it will show, each with its cache key. Caches are
+        only read here; on_analysis_ready stores the new entries on the GUI thread.
+        """
+        job.report(0, f"Loading {ticker}")
         raw_data = self.dm.get_data(ticker, 'daily')
-        if raw_data is None or raw_data.empty: return
+        if raw_data is None or raw_data.empty: return None
+        # Built once per ticker; any period is then a pair of bar positions
+        index_key = (ticker, self.dm.get_data_version(ticker))
+        index = self.indexes.get(index_key)
+        if index is None:
+            index = MetricsCalculator.build_index(raw_data)
+        analysis = self.compute_analysis(raw_data, index, period_str)
+        if analysis is None: return None
         
+        job.report(60, "Rolling metrics")
+        min_periods = max(2, int(window * 0.8))
+        rolling_key = (ticker, window, self.dm.get_data_version(ticker), self.dm.get_data_version('^NSEI'))
+        rolling = self.rolling.get(rolling_key)
+        if rolling is None:
+            rolling = self.compute_rolling(ticker, window, min_periods)
+        
+        job.report(80, "Ranking universe")
+        panel = self.dm.get_panel()
+        ranking_key = (window, panel.source_key)
+        ranking = self.rankings.get(ranking_key)
+        if ranking is None:
+            ranking = self.compute_ranking(panel, window, min_periods)
+        return {
+            'analysis': analysis,
+            'index': (index_key, index),
+            'rolling': (rolling_key, rolling),
+            'ranking': (ranking_key, ranking)
+        }
+
+    def on_analysis_ready(self, key, prepared):
+        self.pending_key = None
+        if prepared is None:
+            self.info_label.setText(f"No data for {key[0]}.")
+            return
+        self.indexes.put(*prepared['index'])
+        self.rolling.put(*prepared['rolling'])
+        self.rankings.put(*prepared['ranking'])
+        self.ranking_key = prepared['ranking'][0]
+        self.results.put(key, prepared['analysis'])
+        self.display(key, prepared['analysis'])
+
+    def display(self, key, result):
+        self.shown_key = key
+        self.current_ticker = key[0]
+        self.show_analysis(result)
+
+    def compute_analysis(self, raw_data, index, period_str):
+        """
+        Everything update_analysis displays for a ticker's daily data and its
+        PerformanceIndex over period_str, or None without data.
+        """
         # Determine timeframe
-        period_str = self.period_selector.currentText()
         if period_str == 'Max':
             years = 'max'
         else:
@@ -158,16 +328,36 @@ class AnalysisView(QWidget):
         available_years = (last_date - first_date).days / 365.25
         
         if years != 'max' and available_years < years:
-            self.info_label.setText(f"Warning: Stock only has {available_years:.1f} years of history. Showing MAX history.")
-            data = raw_data
+            info = f"Warning: Stock only has {available_years:.1f} years of history. Showing MAX history."
+            start, end = index.window('max')
             display_period = "MAX HISTORY"
         else:
-            self.info_label.setText(f"Analytics for last {period_str}")
-            data = MetricsCalculator.filter_data_by_years(raw_data, years)
+            info = f"Analytics for last {period_str}"
+            start, end = index.window(years)
             display_period = f"LAST {years}Y" if years != 'max' else "MAX HISTORY"
 
-        metrics = MetricsCalculator.calculate_metrics(data)
-        if not metrics: return
+        metrics = index.metrics(start, end)
+        if not metrics: return None
+        return {
+            'info': info,
+            'display_period': display_period,
+            'metrics': metrics,
+            'range': (pd.Timestamp(index.dates[start]), pd.Timestamp(index.dates[end])),
+            'cum_returns': index.cumulative_returns(start, end) * 100,
+            'drawdown': metrics['drawdown_series'].to_numpy() * 100,
+            'monthly': index.monthly_returns_matrix(start, end)
+        }
+
+    def show_analysis(self, result):
+        metrics, display_period = result['metrics'], result['display_period']
+        self.info_label.setText(result['info'])
+        self.current_returns = metrics['returns_series']
+        self.current_range = result['range']
+        if self.mc_jobs.is_running():
+            self.mc_jobs.cancel()  # a simulation of the previous selection is stale
+            self.mc_summary.setText("Run a simulation to see the distribution of CAGR, max drawdown and Sharpe ratio.")
+        self.mc_plot.clear()
+        self.update_rolling()
         
         # A. Update Cards
         while self.cards_layout.count():
@@ -183,12 +373,12 @@ class AnalysisView(QWidget):
         self.ret_plot.clear()
         self.dd_plot.clear()
         
-        cum_ret = (1 + metrics['returns_series']).cumprod() - 1
-        self.ret_plot.plot(np.arange(len(cum_ret)), cum_ret.values * 100, pen=pg.mkPen('#2962ff', width=2))
-        self.dd_plot.plot(np.arange(len(metrics['drawdown_series'])), metrics['drawdown_series'].values * 100, pen=pg.mkPen('#ff7675', width=1), fillLevel=0, brush=(255, 118, 117, 50))
+        cum_ret, drawdown = result['cum_returns'], result['drawdown']
+        self.ret_plot.plot(np.arange(len(cum_ret)), cum_ret, pen=pg.mkPen('#2962ff', width=2))
+        self.dd_plot.plot(np.arange(len(drawdown)), drawdown, pen=pg.mkPen('#ff7675', width=1), fillLevel=0, brush=(255, 118, 117, 50))
         
         # C. Update Heatmap
-        matrix = MetricsCalculator.get_monthly_returns_matrix(metrics['returns_series'])
+        matrix = result['monthly']
         self.heatmap_table.setRowCount(len(matrix))
         self.heatmap_table.setColumnCount(len(matrix.columns))
         self.heatmap_table.setHorizontalHeaderLabels([str(c) for c in matrix.columns])
@@ -212,6 +402,143 @@ class AnalysisView(QWidget):
         
         self.heatmap_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
 
+    def update_rolling(self, *args):
+        """
+        Rolling metric of the selected ticker over the displayed period (computed on the
+        full history so the first windows of the period are complete), plus the universe
+        ranking by current rolling Sharpe. Cached results are shown directly; misses are
+        computed on worker threads.
+        """
+        ticker = self.current_ticker
+        if ticker is None or self.current_range is None: return
+        window = ROLLING_WINDOWS[self.roll_window.currentText()]
+        min_periods = max(2, int(window * 0.8))
+        key = (ticker, window, self.dm.get_data_version(ticker), self.dm.get_data_version('^NSEI'))
+        metrics = self.rolling.get(key)
+        if metrics is not None:
+            self.roll_jobs.cancel()
+            self.show_rolling(metrics)
+        else:
+            self.roll_plot.clear()
+            self.roll_plot.setTitle(f"Computing rolling metrics ({self.roll_window.currentText()})...")
+            self.roll_jobs.submit(lambda job: self.compute_rolling(ticker, window, min_periods),
+                                  on_result=lambda metrics: self.on_rolling_ready(key, metrics),
+                                  on_error=lambda error: self.roll_plot.setTitle(f"Rolling metrics failed: {error}"))
+        self.update_ranking(window, min_periods)
+
+    def on_rolling_ready(self, key, metrics):
+        self.rolling.put(key, metrics)
+        if key[0] == self.current_ticker:
+            self.show_rolling(metrics)
+
+    def show_rolling(self, metrics):
+        name = self.roll_metric.currentText().lower()
+        self.roll_plot.clear()
+        self.roll_plot.setTitle(f"Rolling {self.roll_metric.currentText()} ({self.roll_window.currentText()})")
+        if name in metrics:
+            series = metrics[name].loc[self.current_range[0]:self.current_range[1]]
+            scale = 100 if name in ('volatility', 'drawdown') else 1
+            self.roll_plot.plot(np.arange(len(series)), series.to_numpy() * scale, pen=pg.mkPen('#2962ff', width=2), connect='finite')
+
+    def compute_rolling(self, ticker, window, min_periods):
+        """
+        Rolling metrics of ticker from the shared indicator library, so other consumers
+        of the same (ticker, window) reuse them.
+        """
+        library = self.dm.indicators
+        metrics = {
+            'sharpe': library.get(ticker, 'daily', 'rolling_sharpe', window, min_periods),
+            'volatility': library.get(ticker, 'daily', 'rolling_volatility', window, min_periods),
+            'drawdown': library.get(ticker, 'daily', 'rolling_drawdown', window)
+        }
+        beta = library.get_relative(ticker, '^NSEI', 'daily', 'rolling_beta', window, min_periods)
+        if beta is not None:
+            metrics['beta'] = beta
+        return metrics
+
+    @staticmethod
+    def compute_ranking(panel, window, min_periods):
+        closes = panel.to_frame('close')
+        benchmark = closes['^NSEI'] if '^NSEI' in closes.columns else None
+        return RollingMetrics.rank_universe(closes.drop(columns=['^NSEI'], errors='ignore'), window, benchmark, min_periods=min_periods)
+
+    def update_ranking(self, window, min_periods):
+        """
+        Shows the universe ranking for window. The ranking last confirmed against the panel
+        (by prepare_analysis or prepare_ranking) is reused for the same window; otherwise
+        the panel check and the ranking run on a worker thread.
+        """
+        table = None
+        if self.ranking_key is not None and self.ranking_key[0] == window:
+            table = self.rankings.get(self.ranking_key)
+        if table is not None:
+            self.rank_jobs.cancel()
+            self.show_ranking(table)
+            return
+        self.rank_jobs.submit(self.prepare_ranking, window, min_periods,
+                              on_result=self.on_ranking_ready,
+                              on_error=lambda error: self.info_label.setText(f"Ranking failed: {error}"))
+
+    def prepare_ranking(self, job, window, min_periods):
+        """
+        Worker-thread part of update_ranking: (cache key, ranking table). Caches are only read here.
+        """
+        panel = self.dm.get_panel()
+        key = (window, panel.source_key)
+        table = self.rankings.get(key)
+        if table is None:
+            job.check()
+            table = self.compute_ranking(panel, window, min_periods)
+        return key, table
+
+    def on_ranking_ready(self, prepared):
+        key, table = prepared
+        self.rankings.put(key, table)
+        self.ranking_key = key
+        self.show_ranking(table)
+
+    def show_ranking(self, table):
+        headers = ['Ticker', 'Sharpe', 'Volatility', 'Drawdown', 'Beta']
+        self.rank_table.setRowCount(len(table))
+        self.rank_table.setColumnCount(len(headers))
+        self.rank_table.setHorizontalHeaderLabels(headers)
+        for r_idx, (ticker, row) in enumerate(table.iterrows()):
+            cells = [ticker, f"{row['sharpe']:.2f}", f"{row['volatility'] * 100:.1f}%", f"{row['drawdown'] * 100:.1f}%",
+                     f"{row['beta']:.2f}" if 'beta' in row and not pd.isna(row['beta']) else "-"]
+            for c_idx, text in enumerate(cells):
+                item = QTableWidgetItem(text)
+                item.setTextAlignment(Qt.AlignCenter)
+                if ticker == self.current_ticker:
+                    item.setBackground(QColor(41, 98, 255, 90))
+                self.rank_table.setItem(r_idx, c_idx, item)
+        self.rank_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+
+    def run_monte_carlo(self):
+        if self.current_returns is None or self.current_returns.empty: return
+        n_sims = int(self.mc_sims.currentText().replace(',', ''))
+        self.mc_summary.setText(f"Simulating {n_sims:,} paths...")
+        self.mc_jobs.submit(lambda job, returns: MetricsCalculator.monte_carlo(returns, n_sims=n_sims),
+                            self.current_returns.values,
+                            on_result=self.show_monte_carlo,
+                            on_error=lambda error: self.mc_summary.setText(f"Simulation failed: {error}"))
+
+    def show_monte_carlo(self, mc):
+        if not mc: return
+        self.mc_plot.clear()
+        x, bands = mc['band_x'], {p: (b - 1) * 100 for p, b in mc['bands'].items()}
+        for low, high, alpha in ((5, 95, 40), (25, 75, 70)):
+            lower = self.mc_plot.plot(x, bands[low], pen=pg.mkPen((41, 98, 255, 120), width=1))
+            upper = self.mc_plot.plot(x, bands[high], pen=pg.mkPen((41, 98, 255, 120), width=1))
+            self.mc_plot.addItem(pg.FillBetweenItem(lower, upper, brush=(41, 98, 255, alpha)))
+        self.mc_plot.plot(x, bands[50], pen=pg.mkPen('#f1c40f', width=2))
+        
+        rows = []
+        for key, label, is_percent in (('cagr', 'CAGR', True), ('max_drawdown', 'Max DD', True), ('sharpe_ratio', 'Sharpe', False)):
+            dist = MetricsCalculator.summarize_distribution(mc[key])
+            fmt = (lambda v: f"{v * 100:7.1f}%") if is_percent else (lambda v: f"{v:8.2f}")
+            rows.append(f"{label:<7}" + "  ".join(f"P{p}: {fmt(v)}" for p, v in dist.items()))
+        self.mc_summary.setText(f"{mc['n_sims']:,} paths x {mc['horizon']} days\n" + "\n".join(rows))
+
 if __name__ == "__main__":
     import sys
     from PySide6.QtWidgets import QApplication
@@ -1,16 +1,20 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QComboBox, 
-                             QPushButton, QLabel, QFrame, QTableWidget, QTableWidgetItem, QHeaderView)
+                             QPushButton, QLabel, QFrame, QTableWidget, QTableWidgetItem, QHeaderView,
+                             QProgressBar)
 from PySide6.QtCore import Qt
 import pyqtgraph as pg
+import pandas as pd
 from src.engine.backtest_engine import BacktestEngine
 from src.strategies.sma_strategy import SMAStackStrategy
+from src.gui.jobs import JobRunner
 
 class BacktestView(QWidget):
     def __init__(self, data_manager):
         super().__init__()
         self.dm = data_manager
-        self.engine = BacktestEngine(initial_capital=100000)
+        self.engine = BacktestEngine(initial_capital=100000, fast=True)
         self.strategy = SMAStackStrategy()
+        self.jobs = JobRunner(self)
         
         # Scaling Factor (Consistent with ChartView)
         self.scale_factor = 1.2
@@ -38,12 +42,28 @@ class BacktestView(QWidget):
         self.run_btn.setStyleSheet("background-color: #2962ff; color: white; padding: 10px 20px; font-weight: bold;")
         self.run_btn.clicked.connect(self.run_backtest)
         
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.setStyleSheet("padding: 10px 20px;")
+        self.cancel_btn.clicked.connect(self.cancel_backtest)
+        self.cancel_btn.setEnabled(False)
+        
+        self.progress = QProgressBar()
+        self.progress.setFixedWidth(220)
+        self.progress.setTextVisible(True)
+        self.progress.hide()
+        
+        # A run for a selection the user has left is cancelled and its result dropped
+        self.ticker_selector.currentTextChanged.connect(self.cancel_backtest)
+        self.tf_selector.currentTextChanged.connect(self.cancel_backtest)
+        
         config_layout.addWidget(QLabel("Ticker:"))
         config_layout.addWidget(self.ticker_selector)
         config_layout.addWidget(QLabel("Timeframe:"))
         config_layout.addWidget(self.tf_selector)
         config_layout.addStretch()
+        config_layout.addWidget(self.progress)
         config_layout.addWidget(self.run_btn)
+        config_layout.addWidget(self.cancel_btn)
         
         layout.addWidget(config_bar)
 
@@ -76,22 +96,71 @@ class BacktestView(QWidget):
         layout.addWidget(self.trade_table)
 
     def run_backtest(self):
+        """
+        Starts the backtest of the selected ticker/timeframe on a worker thread; the
+        dashboard is updated when it finishes. Starting another run cancels this one.
+        """
         ticker = self.ticker_selector.currentText()
         tf = self.tf_selector.currentText().lower()
+        if not ticker: return
         
+        self.progress.setValue(0)
+        self.progress.setFormat(f"{ticker}: %p%")
+        self.progress.show()
+        self.cancel_btn.setEnabled(True)
+        self.jobs.submit(self.compute_backtest, ticker, tf,
+                         on_result=self.on_backtest_finished, on_progress=self.on_backtest_progress,
+                         on_error=self.on_backtest_failed)
+
+    def compute_backtest(self, job, ticker, tf):
+        """
+        Runs on the worker thread: only data, strategy and a private engine, no widgets.
+        """
+        job.report(0, "Loading data")
         data = self.dm.get_data(ticker, tf)
         if data is None or data.empty:
-            return
+            return None
 
         # Generate Signals
-        signals = self.strategy.generate_signals(data)
+        job.report(30, "Generating signals")
+        signals = self.strategy.generate_signals(data, self.dm.indicators.for_series(ticker, tf))
         
         # Run Engine
-        results = self.engine.run(data, signals)
+        job.report(60, "Running engine")
+        engine = BacktestEngine(initial_capital=self.engine.initial_capital, brokerage=self.engine.brokerage,
+                                stt=self.engine.stt, fast=self.engine.fast)
+        results = engine.run(data, signals)
+        job.report(90, "Collecting results")
+        return engine, results
+
+    def on_backtest_progress(self, percent, message):
+        self.progress.setValue(percent)
+        self.progress.setToolTip(message)
+
+    def on_backtest_finished(self, outcome):
+        self.end_run()
+        if outcome is None:
+            self.stats_label.setText("No data for this ticker/timeframe.")
+            return
+        self.engine, results = outcome
         
         # Update Dashboard
         self.update_ui_with_results(results)
 
+    def on_backtest_failed(self, error):
+        self.end_run()
+        self.stats_label.setText(f"Backtest failed: {error}")
+
+    def cancel_backtest(self, *args):
+        if self.jobs.is_running():
+            self.jobs.cancel()
+            self.stats_label.setText("Backtest cancelled.")
+        self.end_run()
+
+    def end_run(self):
+        self.progress.hide()
+        self.cancel_btn.setEnabled(False)
+
     def update_ui_with_results(self, results):
         # Update Stats Text
         ret_color = "#00b894" if results['total_return_pct'] >= 0 else "#ff7675"
@@ -115,8 +184,8 @@ class BacktestView(QWidget):
             row_pos = self.trade_table.rowCount()
             self.trade_table.insertRow(row_pos)
             
-            self.trade_table.setItem(row_pos, 0, QTableWidgetItem(trade['date'].strftime('%Y-%m-%d')))
-            self.trade_table.setItem(row_pos, 1, QTableWidgetItem(trade['type']))
+            self.trade_table.setItem(row_pos, 0, QTableWidgetItem(pd.Timestamp(trade['date']).strftime('%Y-%m-%d')))
+            self.trade_table.setItem(row_pos, 1, QTableWidgetItem(str(trade['type'])))
             self.trade_table.setItem(row_pos, 2, QTableWidgetItem(f"{trade['price']:.2f}"))
             self.trade_table.setItem(row_pos, 3, QTableWidgetItem(str(trade['units'])))
             self.trade_table.setItem(row_pos, 4, QTableWidgetItem(f"{trade['costs']:.2f}"))
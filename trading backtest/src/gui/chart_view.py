@@ -1,55 +1,156 @@
 import pyqtgraph as pg
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QComboBox, 
                              QPushButton, QLabel, QFrame, QListWidget, QMenu)
-from PySide6.QtCore import Qt, QPointF
+from PySide6.QtCore import Qt, QPointF, QTimer
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from src.utils.range_query import RangeExtremes
+
+STUDY_COLORS = {8: '#00d2d3', 20: '#f1c40f', 50: '#ff9f43', 100: '#54a0ff', 200: '#ee5253'}
+VOLUME_COLORS = {True: (0, 184, 148, 120), False: (255, 118, 117, 120)}
+MONTH_ABBR = np.array([list(m.encode()) for m in ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+                                                   'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')], dtype=np.uint8)
+
+def date_labels(dates):
+    """
+    ('%Y-%m-%d', '%d %b %y') string arrays for datetime64 dates, assembled from the bytes
+    of np.datetime_as_string (pandas' strftime formats one element at a time).
+    """
+    days = np.asarray(dates, dtype='datetime64[D]')
+    iso = np.datetime_as_string(days, unit='D')
+    chars = iso.astype('S10').view(np.uint8).reshape(-1, 10)
+    months = days.astype('datetime64[M]').astype(np.int64) % 12
+    short = np.empty((len(iso), 9), dtype=np.uint8)
+    short[:, 0:2] = chars[:, 8:10]
+    short[:, 2] = short[:, 6] = ord(' ')
+    short[:, 3:6] = MONTH_ABBR[months]
+    short[:, 7:9] = chars[:, 2:4]
+    return iso, short.view('S9').ravel().astype(str)
+
+def series_arrays(dates, opens, highs, lows, closes, volumes):
+    """
+    Per-bar arrays for everything the chart reads on the UI thread (volume colours,
+    crosshair legend, axis labels), built once per loaded series so no pandas row
+    access or date formatting happens while panning or hovering.
+    """
+    series = {name: np.asarray(values, dtype=float) for name, values in
+              (('open', opens), ('high', highs), ('low', lows), ('close', closes), ('volume', volumes))}
+    series['up'] = series['close'] >= series['open']
+    series['date_labels'], series['tick_labels'] = date_labels(dates)
+    return series
 
 class DateAxisItem(pg.AxisItem):
-    def __init__(self, dates, scale_factor, *args, **kwargs):
+    def __init__(self, labels, scale_factor, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.dates = dates
+        self.labels = labels  # preformatted date string per bar index
         self.setTickFont(pg.QtGui.QFont("Arial", int(10 * scale_factor)))
 
+    def set_labels(self, labels):
+        self.labels = labels
+        self.picture = None  # drop the cached tick text
+        self.update()
+
     def tickStrings(self, values, scale, spacing):
-        strings = []
-        for v in values:
-            idx = int(v)
-            if 0 <= idx < len(self.dates):
-                strings.append(self.dates[idx].strftime('%d %b %y'))
-            else:
-                strings.append("")
-        return strings
+        n = len(self.labels)
+        return [self.labels[int(v)] if 0 <= int(v) < n else "" for v in values]
 
 class CandlestickItem(pg.GraphicsObject):
+    """
+    Candles drawn straight from NumPy arrays. Each paint only covers the visible index range,
+    and when several bars share a pixel they are merged into min/max OHLC buckets, so the
+    cost depends on the width of the view rather than on the length of the history.
+    """
     def __init__(self, data, scale_factor):
         pg.GraphicsObject.__init__(self)
         self.data = data
         self.scale_factor = scale_factor
-        self.picture = None
-        self.generatePicture()
-
-    def generatePicture(self):
-        self.picture = pg.QtGui.QPicture()
-        p = pg.QtGui.QPainter(self.picture)
-        width = 0.7
-        pen_w = max(1, 0.8 * self.scale_factor)
-        for i, (idx, row) in enumerate(self.data.iterrows()):
-            open_p, close_p = row['open'], row['close']
-            high_p, low_p = row['high'], row['low']
-            color = pg.mkColor(0, 184, 148) if close_p >= open_p else pg.mkColor(255, 118, 117)
-            p.setPen(pg.mkPen(color, width=pen_w))
-            p.setBrush(pg.mkBrush(color))
-            p.drawLine(QPointF(i, low_p), QPointF(i, high_p))
-            p.drawRect(pg.QtCore.QRectF(i - width/2, open_p, width, close_p - open_p))
-        p.end()
+        self.up_pen = pg.mkPen(pg.mkColor(0, 184, 148), width=max(1, 0.8 * scale_factor))
+        self.down_pen = pg.mkPen(pg.mkColor(255, 118, 117), width=max(1, 0.8 * scale_factor))
+        self.up_brush = pg.mkBrush(pg.mkColor(0, 184, 148))
+        self.down_brush = pg.mkBrush(pg.mkColor(255, 118, 117))
+        self.set_arrays(*(data[c].to_numpy(dtype=float) for c in ('open', 'high', 'low', 'close')))
+
+    def set_arrays(self, opens, highs, lows, closes):
+        """
+        Replaces the bars (e.g. on a live update) and redraws, keeping the same item in the plot.
+        """
+        self.prepareGeometryChange()
+        self.bars = tuple(np.ascontiguousarray(a, dtype=float) for a in (opens, highs, lows, closes))
+        self.paths_key = None  # (first bar, last bar, bars per bucket) of the cached paths
+        self.paths = None
+        n = len(closes)
+        if n and not np.all(np.isnan(lows)):
+            low, high = np.nanmin(lows), np.nanmax(highs)
+            self.bounds = pg.QtCore.QRectF(-0.5, low, n, high - low)
+        else:
+            self.bounds = pg.QtCore.QRectF()
+        self.update()
+
+    def visible_range(self):
+        """
+        (first, last + 1, bars per bucket) for the current view; buckets are aligned to
+        multiples of their size so panning does not change how bars are grouped.
+        """
+        n = len(self.bars[0])
+        view = self.viewRect()
+        if view is None:
+            return 0, n, 1
+        step = max(1, int(self.pixelWidth()))  # bars per screen pixel
+        lo = max(0, int(np.floor(view.left())) - 1)
+        lo -= lo % step
+        hi = min(n, int(np.ceil(view.right())) + 2)
+        return lo, hi, step
+
+    def bucket_bars(self, lo, hi, step):
+        """
+        x centres, widths and OHLC of bars lo..hi-1 merged `step` at a time.
+        """
+        opens, highs, lows, closes = (a[lo:hi] for a in self.bars)
+        if step == 1:
+            return np.arange(lo, hi, dtype=float), 0.7, opens, highs, lows, closes
+        starts = np.arange(0, hi - lo, step)
+        ends = np.minimum(starts + step, hi - lo) - 1
+        x = lo + (starts + ends) / 2.0
+        return (x, 0.7 * step, opens[starts], np.fmax.reduceat(highs, starts),
+                np.fmin.reduceat(lows, starts), closes[ends])
+
+    def build_paths(self, lo, hi, step):
+        """
+        One wick path and one body path per colour, built with vectorized arrayToQPath calls.
+        """
+        x, width, opens, highs, lows, closes = self.bucket_bars(lo, hi, step)
+        valid = ~(np.isnan(opens) | np.isnan(closes) | np.isnan(highs) | np.isnan(lows))
+        up = closes >= opens
+        paths = []
+        for mask, pen, brush in ((valid & up, self.up_pen, self.up_brush), (valid & ~up, self.down_pen, self.down_brush)):
+            xm, o, h, l, c = x[mask], opens[mask], highs[mask], lows[mask], closes[mask]
+            if not len(xm):
+                continue
+            wicks = pg.arrayToQPath(np.repeat(xm, 2), np.column_stack([l, h]).ravel(), connect='pairs')
+            # Bodies: closed 5-point rectangles, disconnected from each other
+            left, right = xm - width / 2, xm + width / 2
+            rx = np.column_stack([left, right, right, left, left]).ravel()
+            ry = np.column_stack([o, o, c, c, o]).ravel()
+            connect = np.tile(np.array([1, 1, 1, 1, 0], dtype=np.int32), len(xm))
+            bodies = pg.arrayToQPath(rx, ry, connect=connect)
+            paths.append((pen, brush, wicks, bodies))
+        return paths
 
     def paint(self, p, *args):
-        if self.picture: p.drawPicture(0, 0, self.picture)
+        if not len(self.bars[0]): return
+        key = self.visible_range()
+        if key[0] >= key[1]: return
+        if key != self.paths_key:
+            self.paths_key, self.paths = key, self.build_paths(*key)
+        for pen, brush, wicks, bodies in self.paths:
+            p.setPen(pen)
+            p.drawPath(wicks)
+            p.setBrush(brush)
+            p.drawPath(bodies)
 
     def boundingRect(self):
-        return pg.QtCore.QRectF(self.picture.boundingRect()) if self.picture else pg.QtCore.QRectF()
+        return self.bounds
 
 class ChartView(QWidget):
     def __init__(self, data_manager):
@@ -58,13 +159,26 @@ class ChartView(QWidget):
         self.current_ticker = None
         self.current_timeframe = 'weekly'
         self.data = None
+        self.extremes = None  # RangeExtremes of the plotted bars, for auto-scaling
+        self.series = None    # series_arrays() of the plotted bars
         self.active_studies = {'SMA 8', 'SMA 20', 'SMA 50'} 
         self.scale_factor = 1.2
         
+        # Plot items, created once by create_plots() and then only fed new arrays
         self.p1 = None
         self.p2 = None
+        self.axis = None
+        self.candles = None
         self.vLine = None
         self.hLine = None
+        self.volume_items = None
+        self.study_curves = {}  # SMA period -> curve on p1
+        
+        # Live mode: a LiveFeed's ring buffer replaces dm data for tickers it carries
+        self.feed = None
+        self.live_view = None     # (dates, {field: array}) currently plotted
+        self.live_version = None
+        self.live_timer = None
         
         self.init_ui()
 
@@ -131,6 +245,7 @@ class ChartView(QWidget):
 
         main_layout.addWidget(self.watchlist)
         main_layout.addWidget(container)
+        self.create_plots()
 
         default_ticker = "^NSEI" if "^NSEI" in tickers else (tickers[0] if tickers else None)
         if default_ticker:
@@ -151,41 +266,56 @@ class ChartView(QWidget):
         else:
             if name in self.active_studies: self.active_studies.remove(name)
             else: self.active_studies.add(name)
-        self.update_chart(self.current_ticker)
+        self.sync_studies()
 
     def change_timeframe(self, tf):
         self.current_timeframe = tf.lower()
         self.update_chart(self.current_ticker)
 
     def update_y_range(self):
-        if self.data is None or self.data.empty or self.p1 is None: return
+        if self.p1 is None or self.extremes is None: return
         vb = self.p1.vb
         rect = vb.viewRect()
         idx_min = max(0, int(rect.left()))
-        idx_max = min(len(self.data), int(rect.right()) + 1)
+        idx_max = min(len(self.extremes), int(rect.right()) + 1)
         if idx_min >= idx_max: return
-        visible_data = self.data.iloc[idx_min:idx_max]
-        if visible_data.empty: return
-        v_min, v_max = visible_data['low'].min(), visible_data['high'].max()
+        v_min, v_max = self.extremes.query(idx_min, idx_max)
         if np.isnan(v_min) or np.isnan(v_max): return
         padding = (v_max - v_min) * 0.05
         if padding == 0: padding = v_max * 0.01
         self.p1.setYRange(v_min - padding, v_max + padding, padding=0)
 
-    def update_chart(self, ticker):
-        if not ticker: return
-        self.current_ticker = ticker
-        self.ticker_label.setText(ticker)
-        self.data = self.dm.get_data(ticker, self.current_timeframe)
-        if self.data is None or self.data.empty: return
+    def attach_feed(self, feed, interval_ms=500):
+        """
+        Shows live bars for tickers carried by `feed` (a LiveFeed), polling it on the GUI
+        thread. Updates only push the ring buffer's arrays into the existing plot items.
+        """
+        self.feed = feed
+        if self.live_timer is None:
+            self.live_timer = QTimer(self)
+            self.live_timer.timeout.connect(self.poll_feed)
+        self.live_timer.start(interval_ms)
+        self.update_chart(self.current_ticker)
 
-        self.win.ci.clear()
-        
+    def poll_feed(self):
+        ticker = self.current_ticker
+        if self.feed is None or ticker not in self.feed.buffers or self.feed.version(ticker) == self.live_version:
+            return
+        if self.live_view is None:
+            self.update_chart(ticker)  # first bars for this ticker
+        else:
+            self.refresh_live()
+
+    def create_plots(self):
+        """
+        Creates the price plot (top), the volume plot with date axis (bottom) and every item
+        on them once. Changing ticker, timeframe or studies then only updates these items.
+        """
         # P1: Price Plot (Top)
         self.p1 = self.win.addPlot(row=0, col=0)
         # P2: Volume Plot with Date Axis (Bottom)
-        axis = DateAxisItem(self.data.index, scale_factor=self.scale_factor, orientation='bottom')
-        self.p2 = self.win.addPlot(row=1, col=0, axisItems={'bottom': axis})
+        self.axis = DateAxisItem([], scale_factor=self.scale_factor, orientation='bottom')
+        self.p2 = self.win.addPlot(row=1, col=0, axisItems={'bottom': self.axis})
         
         self.p2.setXLink(self.p1)
         self.p1.hideAxis('bottom') # Hide P1 bottom axis, let P2 show the dates
@@ -199,25 +329,36 @@ class ChartView(QWidget):
             p.getAxis('bottom').setTextPen('#d1d4dc')
             p.getAxis('left').setPen(pen_grid)
 
-        self.p1.addItem(CandlestickItem(self.data, self.scale_factor))
-        v_colors = [(0, 184, 148, 120) if r['close'] >= r['open'] else (255, 118, 117, 120) for _, r in self.data.iterrows()]
-        self.p2.addItem(pg.BarGraphItem(x=np.arange(len(self.data)), height=self.data['volume'], width=0.6, brushes=v_colors))
+        self.candles = CandlestickItem(pd.DataFrame(columns=['open', 'high', 'low', 'close']), self.scale_factor)
+        self.p1.addItem(self.candles)
+        self.add_volume()
+        self.add_crosshair()
+        self.p1.sigXRangeChanged.connect(self.update_y_range)
 
-        # Studies
-        legend_items = []
-        colors = {8: '#00d2d3', 20: '#f1c40f', 50: '#ff9f43', 100: '#54a0ff', 200: '#ee5253'}
-        sorted_studies = sorted(list(self.active_studies), key=lambda x: int(x.split()[1]) if len(x.split()) > 1 else 0)
-        for s in sorted_studies:
-            try:
-                period = int(s.split()[1])
-                vals = self.data['close'].rolling(window=period).mean()
-                color = colors.get(period, '#ffffff')
-                y_vals, x_vals = vals.values, np.arange(len(self.data))
-                mask = ~np.isnan(y_vals)
-                self.p1.plot(x_vals[mask], y_vals[mask], pen=pg.mkPen(color, width=max(1.5, 1.2*self.scale_factor)))
-                legend_items.append(f"<span style='color:{color}'>{s}</span>")
-            except: continue
+    def add_volume(self):
+        """
+        Up and down volume bars as two single-colour items, which pyqtgraph draws with one
+        drawRects call each instead of a brush change per bar.
+        """
+        self.volume_items = {up: pg.BarGraphItem(x=[], height=[], width=0.6, brush=color) for up, color in VOLUME_COLORS.items()}
+        for item in self.volume_items.values():
+            self.p2.addItem(item)
+
+    def set_volume(self, series):
+        x = np.arange(len(series['volume']))
+        for up, item in self.volume_items.items():
+            mask = series['up'] if up else ~series['up']
+            item.setOpts(x=x[mask], height=series['volume'][mask])
+
+    def add_crosshair(self):
+        ch_pen = pg.mkPen('#787b86', width=max(1, 0.8 * self.scale_factor), style=Qt.DashLine)
+        self.vLine = pg.InfiniteLine(angle=90, movable=False, pen=ch_pen)
+        self.hLine = pg.InfiniteLine(angle=0, movable=False, pen=ch_pen)
+        self.p1.addItem(self.vLine, ignoreBounds=True)
+        self.p1.addItem(self.hLine, ignoreBounds=True)
+        self.proxy = pg.SignalProxy(self.p1.scene().sigMouseMoved, rateLimit=60, slot=self.mouseMoved)
 
+    def show_study_legend(self, legend_items):
         if legend_items:
             self.study_legend_label.setText(" • ".join(legend_items))
             self.study_legend_label.show()
@@ -225,33 +366,125 @@ class ChartView(QWidget):
             self.study_legend_label.adjustSize()
         else: self.study_legend_label.hide()
 
+    def sorted_study_periods(self):
+        return sorted(int(s.split()[1]) for s in self.active_studies if len(s.split()) > 1)
+
+    def study_values(self, period):
+        """
+        (x, y) of the SMA of the plotted bars: from the indicator cache for dm data, or a
+        cumulative sum over the live window (O(n) for all bars in view).
+        """
+        if self.series is None:
+            return [], []
+        closes = self.series['close']
+        if self.live_view is not None:
+            n = len(closes)
+            if n < period:
+                return [], []
+            csum = np.concatenate([[0.0], np.cumsum(closes)])
+            return np.arange(period - 1, n), (csum[period:] - csum[:-period]) / period
+        sma = self.dm.indicators.get(self.current_ticker, self.current_timeframe, 'sma', period)
+        if sma is None:
+            return [], []
+        y_vals = sma.to_numpy()
+        mask = ~np.isnan(y_vals)
+        return np.arange(len(y_vals))[mask], y_vals[mask]
+
+    def sync_studies(self, refresh=False):
+        """
+        Adds a curve for each newly active study and removes curves of inactive ones.
+        refresh: also recompute the curves that stay (the plotted series changed).
+        """
+        periods = self.sorted_study_periods()
+        for period in [p for p in self.study_curves if p not in periods]:
+            self.p1.removeItem(self.study_curves.pop(period))
+        legend_items = []
+        for period in periods:
+            color = STUDY_COLORS.get(period, '#ffffff')
+            curve = self.study_curves.get(period)
+            if curve is None:
+                curve = self.study_curves[period] = self.p1.plot([], [], pen=pg.mkPen(color, width=max(1.5, 1.2*self.scale_factor)))
+                curve.setData(*self.study_values(period))
+            elif refresh:
+                curve.setData(*self.study_values(period))
+            legend_items.append(f"<span style='color:{color}'>SMA {period}</span>")
+        self.show_study_legend(legend_items)
+
+    def set_series(self, dates, bars):
+        """
+        Feeds one series (dates and {field: array}) into the existing plot items.
+        """
+        self.series = series_arrays(dates, *(bars[f] for f in ('open', 'high', 'low', 'close', 'volume')))
+        self.extremes = RangeExtremes(self.series['low'], self.series['high'])
+        self.axis.set_labels(self.series['tick_labels'])
+        self.candles.set_arrays(*(self.series[f] for f in ('open', 'high', 'low', 'close')))
+        self.set_volume(self.series)
+        self.sync_studies(refresh=True)
+
+    def update_chart(self, ticker):
+        if not ticker: return
+        self.current_ticker = ticker
+        self.live_view = self.live_version = None
+        if self.feed is not None and ticker in self.feed.buffers:
+            self.data = None
+            self.ticker_label.setText(f"{ticker} (LIVE)")
+            self.refresh_live()
+            return
+        
+        self.ticker_label.setText(ticker)
+        self.data = self.dm.get_data(ticker, self.current_timeframe)
+        if self.data is None or self.data.empty: return
+        self.set_series(self.data.index, self.data)
+
         total_len = len(self.data)
         zoom_range = 200
+        self.p2.enableAutoRange(axis='y')
         if total_len > zoom_range: self.p1.setXRange(total_len - zoom_range, total_len, padding=0)
         else: self.p1.autoRange()
+        self.update_y_range()
 
-        self.p1.sigXRangeChanged.connect(self.update_y_range)
+    def refresh_live(self):
+        """
+        Pulls the current ring-buffer window and updates the existing items in place.
+        Keeps following the newest bar if it was in view.
+        """
+        ticker = self.current_ticker
+        self.live_version = self.feed.version(ticker)
+        snapshot = self.feed.snapshot(ticker)
+        if snapshot is None: return
+        dates, bars = snapshot
+        n = len(dates)
+        prev_n = len(self.live_view[0]) if self.live_view is not None else 0
+        self.live_view = snapshot
+        # Rebuilt per refresh, bounded by the buffer capacity
+        self.set_series(dates, bars)
+        
+        zoom_range = 200
+        right = self.p1.vb.viewRect().right()
+        if prev_n == 0 or right >= prev_n - 1:
+            self.p1.setXRange(max(0, n - zoom_range), n, padding=0)
         self.update_y_range()
 
-        ch_pen = pg.mkPen('#787b86', width=max(1, 0.8 * self.scale_factor), style=Qt.DashLine)
-        self.vLine = pg.InfiniteLine(angle=90, movable=False, pen=ch_pen)
-        self.hLine = pg.InfiniteLine(angle=0, movable=False, pen=ch_pen)
-        self.p1.addItem(self.vLine, ignoreBounds=True)
-        self.p1.addItem(self.hLine, ignoreBounds=True)
-        self.proxy = pg.SignalProxy(self.p1.scene().sigMouseMoved, rateLimit=60, slot=self.mouseMoved)
+    def bar_at(self, index):
+        """
+        (date label, open, high, low, close) of the bar at x index, from the cached series arrays.
+        """
+        series = self.series
+        if series is None or not 0 <= index < len(series['close']):
+            return None
+        return (series['date_labels'][index],) + tuple(series[f][index] for f in ('open', 'high', 'low', 'close'))
 
     def mouseMoved(self, evt):
         pos = evt[0]
         if self.p1 and self.p1.sceneBoundingRect().contains(pos):
             mousePoint = self.p1.vb.mapSceneToView(pos)
-            index = int(mousePoint.x())
-            if self.data is not None and 0 <= index < len(self.data):
-                row = self.data.iloc[index]
+            bar = self.bar_at(int(mousePoint.x()))
+            if bar is not None:
+                date_str, open_p, high_p, low_p, close_p = bar
                 self.vLine.setPos(mousePoint.x())
                 self.hLine.setPos(mousePoint.y())
-                date_str = self.data.index[index].strftime('%Y-%m-%d')
-                color = "#00b894" if row['close'] >= row['open'] else "#ff7675"
-                self.legend.setText(f"<span style='color:#787b86'>{date_str}</span> | O: <span style='color:{color}'>{row['open']:.2f}</span> H: <span style='color:{color}'>{row['high']:.2f}</span> L: <span style='color:{color}'>{row['low']:.2f}</span> C: <span style='color:{color}'>{row['close']:.2f}</span>")
+                color = "#00b894" if close_p >= open_p else "#ff7675"
+                self.legend.setText(f"<span style='color:#787b86'>{date_str}</span> | O: <span style='color:{color}'>{open_p:.2f}</span> H: <span style='color:{color}'>{high_p:.2f}</span> L: <span style='color:{color}'>{low_p:.2f}</span> C: <span style='color:{color}'>{close_p:.2f}</span>")
 
 if __name__ == "__main__":
     import sys
@@ -0,0 +1,179 @@
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QComboBox, QLabel, QFrame, QSplitter)
+from PySide6.QtCore import Qt
+import pyqtgraph as pg
+import pandas as pd
+import numpy as np
+from src.utils.correlation import CorrelationService
+from src.gui.jobs import JobRunner
+
+PERIODS = {'Max': None, '10 Years': 10, '5 Years': 5, '3 Years': 3, '1 Year': 1}
+METHODS = {'Pearson': ('pearson', None), 'EWMA (21d half-life)': ('ewma', 21), 'EWMA (63d half-life)': ('ewma', 63)}
+
+class CorrelationView(QWidget):
+    def __init__(self, data_manager):
+        super().__init__()
+        self.dm = data_manager
+        self.service = CorrelationService(data_manager)
+        self.scale_factor = 1.2
+        self.corr = None  # DataFrame currently shown (in display order)
+        self.stale = True  # selection changed while hidden (or never built)
+        self.jobs = JobRunner(self)
+
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(20, 20, 20, 20)
+        layout.setSpacing(15)
+
+        # 1. Controls
+        header = QFrame()
+        header_layout = QHBoxLayout(header)
+        self.period_selector = QComboBox()
+        self.period_selector.addItems(list(PERIODS))
+        self.period_selector.setCurrentText('3 Years')
+        self.method_selector = QComboBox()
+        self.method_selector.addItems(list(METHODS))
+        self.universe_selector = QComboBox()
+        self.universe_selector.addItems(['Stocks', 'Stocks + Indices'])
+        self.order_selector = QComboBox()
+        self.order_selector.addItems(['Alphabetical', 'Average Correlation'])
+        for combo in (self.period_selector, self.method_selector, self.universe_selector, self.order_selector):
+            combo.setStyleSheet(f"font-size: {int(13 * self.scale_factor)}px; padding: 4px;")
+            combo.currentTextChanged.connect(self.update_matrix)
+
+        header_layout.addWidget(QLabel("Period:"))
+        header_layout.addWidget(self.period_selector)
+        header_layout.addWidget(QLabel("Method:"))
+        header_layout.addWidget(self.method_selector)
+        header_layout.addWidget(QLabel("Universe:"))
+        header_layout.addWidget(self.universe_selector)
+        header_layout.addWidget(QLabel("Order:"))
+        header_layout.addWidget(self.order_selector)
+        header_layout.addStretch()
+        self.hover_label = QLabel("")
+        self.hover_label.setStyleSheet(f"color: #d1d4dc; font-family: monospace; font-size: {int(14 * self.scale_factor)}px;")
+        header_layout.addWidget(self.hover_label)
+        layout.addWidget(header)
+
+        # 2. Heatmap (top) and rolling correlation of the clicked pair (bottom)
+        splitter = QSplitter(Qt.Vertical)
+        self.heatmap = pg.PlotWidget()
+        self.heatmap.setBackground('#131722')
+        self.heatmap.setAspectLocked(True)
+        self.heatmap.invertY(True)
+        self.heatmap.setMenuEnabled(False)
+        self.image = pg.ImageItem()
+        self.image.setLookupTable(pg.ColorMap([0.0, 0.5, 1.0], [(255, 118, 117), (30, 34, 45), (0, 184, 148)]).getLookupTable(nPts=256))
+        self.image.setLevels([-1, 1])
+        self.heatmap.addItem(self.image)
+        self.heatmap.scene().sigMouseMoved.connect(self.on_mouse_moved)
+        self.heatmap.scene().sigMouseClicked.connect(self.on_mouse_clicked)
+        splitter.addWidget(self.heatmap)
+
+        self.pair_plot = pg.PlotWidget(title="Rolling 63-day correlation (click a cell)")
+        self.pair_plot.setBackground('#131722')
+        self.pair_plot.showGrid(x=True, y=True, alpha=0.1)
+        self.pair_plot.setYRange(-1, 1)
+        self.pair_plot.setAxisItems({'bottom': pg.DateAxisItem()})
+        splitter.addWidget(self.pair_plot)
+        splitter.setSizes([700, 250])
+        layout.addWidget(splitter)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Built on first show rather than at startup: the panel and the matrix are not
+        # needed until the tab is opened
+        if self.stale:
+            self.update_matrix()
+
+    def update_matrix(self, *args):
+        """
+        Recomputes the heatmap for the current selection on a worker thread. While the
+        view is hidden this only marks it stale; showEvent catches up.
+        """
+        if not self.isVisible():
+            self.stale = True
+            return
+        self.stale = False
+        years = PERIODS[self.period_selector.currentText()]
+        method, halflife = METHODS[self.method_selector.currentText()]
+        self.hover_label.setText("Computing correlations...")
+        self.jobs.submit(self.compute_matrix, self.universe_selector.currentText(), years, method, halflife,
+                         self.order_selector.currentText(),
+                         on_result=self.show_matrix,
+                         on_error=lambda error: self.hover_label.setText(f"Correlation failed: {error}"))
+
+    def compute_matrix(self, job, universe, years, method, halflife, order):
+        """
+        Worker-thread part of update_matrix: the correlation DataFrame in display order.
+        """
+        dates, tickers, _ = self.service.returns_matrix()
+        if not tickers: return None
+        if universe == 'Stocks':
+            tickers = [t for t in tickers if not t.startswith('^')]
+        end = pd.Timestamp(dates[-1])
+        start = None if years is None else end - pd.DateOffset(years=years)
+
+        job.check()
+        kwargs = {'halflife': halflife} if halflife else {}
+        corr = self.service.correlation(start, end, sorted(tickers), method, **kwargs)
+        if order == 'Average Correlation':
+            order = corr.mean().sort_values(ascending=False).index
+            corr = corr.loc[order, order]
+        return corr
+
+    def show_matrix(self, corr):
+        if corr is None:
+            self.hover_label.setText("")
+            return
+        self.corr = corr
+
+        # ImageItem is indexed image[x, y]; NaN (too little overlap) is drawn as 0
+        self.image.setImage(np.nan_to_num(corr.to_numpy()), autoLevels=False)
+        self.image.setRect(pg.QtCore.QRectF(0, 0, len(corr), len(corr)))
+        ticks = [[(i + 0.5, name) for i, name in enumerate(corr.index)]]
+        for side in ('left', 'bottom'):
+            axis = self.heatmap.getAxis(side)
+            axis.setTicks(ticks)
+            axis.setTextPen('#d1d4dc')
+        self.heatmap.setRange(xRange=(0, len(corr)), yRange=(0, len(corr)), padding=0)
+
+        values = corr.to_numpy()[np.triu_indices(len(corr), k=1)]
+        self.hover_label.setText(f"Avg. pairwise correlation: {np.nanmean(values):.2f}" if len(values) else "")
+
+    def cell_at(self, pos):
+        if self.corr is None or not self.heatmap.sceneBoundingRect().contains(pos):
+            return None
+        point = self.heatmap.getViewBox().mapSceneToView(pos)
+        i, j = int(np.floor(point.x())), int(np.floor(point.y()))
+        if 0 <= i < len(self.corr) and 0 <= j < len(self.corr):
+            return self.corr.index[i], self.corr.columns[j], self.corr.iat[i, j]
+        return None
+
+    def on_mouse_moved(self, pos):
+        cell = self.cell_at(pos)
+        if cell is not None:
+            a, b, value = cell
+            self.hover_label.setText(f"{a} / {b}: {value:.2f}" if not np.isnan(value) else f"{a} / {b}: -")
+
+    def on_mouse_clicked(self, event):
+        cell = self.cell_at(event.scenePos())
+        if cell is None or cell[0] == cell[1]: return
+        a, b, _ = cell
+        series = self.service.rolling_pair(a, b, 63).dropna()
+        self.pair_plot.clear()
+        self.pair_plot.setTitle(f"Rolling 63-day correlation: {a} / {b}")
+        if not series.empty:
+            x = series.index.values.astype('datetime64[s]').astype(np.int64)
+            self.pair_plot.plot(x, series.to_numpy(), pen=pg.mkPen('#2962ff', width=2))
+
+if __name__ == "__main__":
+    import sys
+    from PySide6.QtWidgets import QApplication
+    from src.data.data_manager import DataManager
+    app = QApplication(sys.argv)
+    dm = DataManager(lazy=True)
+    view = CorrelationView(dm)
+    view.show()
+    sys.exit(app.exec())
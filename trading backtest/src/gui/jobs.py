@@ -0,0 +1,133 @@
+import itertools
+import threading
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Slot
+
+class JobCancelled(Exception):
+    pass
+
+class JobSignals(QObject):
+    # Emitted on the worker thread, delivered (queued) to the JobRunner on the GUI thread.
+    # Only ints/strings cross threads; results go through JobRunner.store() instead of a
+    # queued object argument (PySide6 6.12.0 corrupts reference counts on these paths and
+    # is excluded in requirements.txt).
+    progress = Signal(int, int, str)     # job id, percent, message
+    finished = Signal(int)               # job id (result is in the runner's store)
+    failed = Signal(int, str)            # job id, error text
+    cancelled = Signal(int)              # job id
+
+class Job(QRunnable):
+    """
+    Runs fn(job, *args, **kwargs) on a QThreadPool thread. fn reports with
+    job.report(percent, message) and should call job.check() between steps so a
+    cancellation stops it early (check() raises JobCancelled).
+    """
+    _ids = itertools.count(1)
+
+    def __init__(self, fn, *args, store=None, **kwargs):
+        super().__init__()
+        self.id = next(Job._ids)
+        self.store = store  # callable(job id, result), called on the worker before `finished`
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = JobSignals()
+        self.is_cancelled = False
+
+    def cancel(self):
+        self.is_cancelled = True
+
+    def check(self):
+        if self.is_cancelled:
+            raise JobCancelled()
+
+    def report(self, percent, message=""):
+        self.check()
+        self.signals.progress.emit(self.id, int(percent), message)
+
+    def run(self):
+        try:
+            result = self.fn(self, *self.args, **self.kwargs)
+            self.check()
+        except JobCancelled:
+            self.signals.cancelled.emit(self.id)
+        except Exception as e:
+            print(f"Background job failed: {e}")
+            self.signals.failed.emit(self.id, str(e) or type(e).__name__)
+        else:
+            if self.store is not None:
+                self.store(self.id, result)
+            self.signals.finished.emit(self.id)
+
+class JobRunner(QObject):
+    def __init__(self, parent=None, pool=None):
+        """
+        Keeps at most one live job for its owner (a view): submitting a new job cancels the
+        previous one, and results, progress or errors of any job other than the latest are
+        dropped, so a slow run for a ticker the user already left never reaches the UI.
+        Callbacks always run on the GUI thread.
+        """
+        super().__init__(parent)
+        self.pool = pool or QThreadPool.globalInstance()
+        self.current = None
+        self.callbacks = {}  # job id -> (on_result, on_progress, on_error)
+        self.results = {}    # job id -> result, written by worker threads
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, on_result=None, on_progress=None, on_error=None, **kwargs):
+        self.cancel()
+        job = Job(fn, *args, store=self.store, **kwargs)
+        job.signals.progress.connect(self._on_progress)
+        job.signals.finished.connect(self._on_finished)
+        job.signals.failed.connect(self._on_failed)
+        job.signals.cancelled.connect(self._on_cancelled)
+        self.callbacks[job.id] = (on_result, on_progress, on_error)
+        self.current = job
+        self.pool.start(job)
+        return job
+
+    def cancel(self):
+        if self.current is not None:
+            self.current.cancel()
+            self.current = None
+
+    def store(self, job_id, result):
+        with self._lock:
+            self.results[job_id] = result
+
+    def take(self, job_id):
+        with self._lock:
+            return self.results.pop(job_id, None)
+
+    def is_running(self):
+        return self.current is not None
+
+    def _is_current(self, job_id):
+        return self.current is not None and self.current.id == job_id
+
+    def _done(self, job_id):
+        callbacks = self.callbacks.pop(job_id, (None, None, None))
+        if self._is_current(job_id):
+            self.current = None
+            return callbacks
+        return None, None, None  # stale: superseded or cancelled
+
+    @Slot(int, int, str)
+    def _on_progress(self, job_id, percent, message):
+        if self._is_current(job_id):
+            on_progress = self.callbacks[job_id][1]
+            if on_progress: on_progress(percent, message)
+
+    @Slot(int)
+    def _on_finished(self, job_id):
+        result = self.take(job_id)  # always popped, so stale results do not pile up
+        on_result, _, _ = self._done(job_id)
+        if on_result: on_result(result)
+
+    @Slot(int, str)
+    def _on_failed(self, job_id, error):
+        _, _, on_error = self._done(job_id)
+        if on_error: on_error(error)
+
+    @Slot(int)
+    def _on_cancelled(self, job_id):
+        self._done(job_id)
@@ -0,0 +1,219 @@
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QComboBox, QSpinBox,
+                             QPushButton, QLabel, QFrame, QTableWidget, QTableWidgetItem, QHeaderView,
+                             QProgressBar)
+import pyqtgraph as pg
+import pandas as pd
+from src.engine.portfolio_engine import PortfolioEngine
+from src.strategies.sma_strategy import SMAStackStrategy
+from src.gui.jobs import JobRunner
+
+class PortfolioView(QWidget):
+    def __init__(self, data_manager):
+        super().__init__()
+        self.dm = data_manager
+        self.engine = None
+        self.jobs = JobRunner(self)
+
+        # Scaling Factor (Consistent with ChartView)
+        self.scale_factor = 1.2
+
+        self.init_ui()
+
+    def _spin(self, lo, hi, value, step=1):
+        spin = QSpinBox()
+        spin.setRange(lo, hi)
+        spin.setSingleStep(step)
+        spin.setValue(value)
+        return spin
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(20, 20, 20, 20)
+        layout.setSpacing(20)
+
+        # 1. Configuration Bar
+        config_bar = QFrame()
+        config_bar.setStyleSheet("background-color: #1e222d; border-radius: 8px;")
+        config_layout = QHBoxLayout(config_bar)
+
+        self.universe_selector = QComboBox()
+        self.universe_selector.addItems(['All Stocks (excl. indices)', 'All Tickers'])
+
+        self.tf_selector = QComboBox()
+        self.tf_selector.addItems(['Daily', 'Weekly', 'Monthly'])
+
+        self.fast_spin = self._spin(2, 500, 8)
+        self.med_spin = self._spin(2, 500, 20)
+        self.slow_spin = self._spin(2, 500, 50)
+        self.max_pos_spin = self._spin(1, 500, 10)
+        self.capital_spin = self._spin(10000, 1000000000, 1000000, step=100000)
+
+        self.sizing_selector = QComboBox()
+        self.sizing_selector.addItems(['Equal Weight', 'Fixed 5% of Equity'])
+
+        self.run_btn = QPushButton("Run Portfolio")
+        self.run_btn.setStyleSheet("background-color: #2962ff; color: white; padding: 10px 20px; font-weight: bold;")
+        self.run_btn.clicked.connect(self.run_portfolio)
+
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.setStyleSheet("padding: 10px 20px;")
+        self.cancel_btn.clicked.connect(self.cancel_portfolio)
+        self.cancel_btn.setEnabled(False)
+
+        self.progress = QProgressBar()
+        self.progress.setFixedWidth(220)
+        self.progress.setTextVisible(True)
+        self.progress.hide()
+
+        config_layout.addWidget(QLabel("Universe:"))
+        config_layout.addWidget(self.universe_selector)
+        config_layout.addWidget(QLabel("Timeframe:"))
+        config_layout.addWidget(self.tf_selector)
+        config_layout.addWidget(QLabel("SMA Fast/Med/Slow:"))
+        config_layout.addWidget(self.fast_spin)
+        config_layout.addWidget(self.med_spin)
+        config_layout.addWidget(self.slow_spin)
+        config_layout.addWidget(QLabel("Max Positions:"))
+        config_layout.addWidget(self.max_pos_spin)
+        config_layout.addWidget(QLabel("Sizing:"))
+        config_layout.addWidget(self.sizing_selector)
+        config_layout.addWidget(QLabel("Capital:"))
+        config_layout.addWidget(self.capital_spin)
+        config_layout.addStretch()
+        config_layout.addWidget(self.progress)
+        config_layout.addWidget(self.run_btn)
+        config_layout.addWidget(self.cancel_btn)
+
+        layout.addWidget(config_bar)
+
+        # 2. Results Dashboard
+        dash_layout = QHBoxLayout()
+
+        self.stats_label = QLabel("Run a portfolio backtest to see results...")
+        self.stats_label.setStyleSheet(f"font-size: {int(16 * self.scale_factor)}px; color: #d1d4dc;")
+        dash_layout.addWidget(self.stats_label)
+
+        self.equity_plot = pg.PlotWidget()
+        self.equity_plot.setBackground('#131722')
+        self.equity_plot.showGrid(x=True, y=True, alpha=0.1)
+        self.equity_plot.getAxis('left').setLabel('Portfolio Value (INR)')
+        dash_layout.addWidget(self.equity_plot)
+
+        layout.addLayout(dash_layout)
+
+        # 3. Trade List Table
+        self.trade_table = QTableWidget()
+        self.trade_table.setColumnCount(6)
+        self.trade_table.setHorizontalHeaderLabels(['Date', 'Ticker', 'Type', 'Price', 'Units', 'Costs'])
+        self.trade_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.trade_table.setStyleSheet("""
+            QTableWidget { background-color: #1e222d; color: #d1d4dc; gridline-color: #2a2e39; }
+            QHeaderView::section { background-color: #2a2e39; color: #d1d4dc; padding: 5px; }
+        """)
+        layout.addWidget(self.trade_table)
+
+    def get_universe(self):
+        tickers = self.dm.get_all_tickers()
+        if self.universe_selector.currentIndex() == 0:
+            tickers = [t for t in tickers if not t.startswith('^')]
+        return tickers
+
+    def run_portfolio(self):
+        """
+        Starts the portfolio backtest with the current settings on a worker thread; the
+        dashboard is updated when it finishes. Starting another run cancels this one.
+        """
+        tf = self.tf_selector.currentText().lower()
+        params = (self.fast_spin.value(), self.med_spin.value(), self.slow_spin.value())
+        if self.sizing_selector.currentIndex() == 0:
+            sizing, position_size = 'equal_weight', None
+        else:
+            sizing, position_size = 'fixed_fraction', 0.05
+        engine_kwargs = {'initial_capital': self.capital_spin.value(), 'max_positions': self.max_pos_spin.value(),
+                         'sizing': sizing, 'position_size': position_size}
+
+        self.progress.setValue(0)
+        self.progress.setFormat("Portfolio: %p%")
+        self.progress.show()
+        self.cancel_btn.setEnabled(True)
+        self.jobs.submit(self.compute_portfolio, self.get_universe(), tf, params, engine_kwargs,
+                         on_result=self.on_portfolio_finished, on_progress=self.on_portfolio_progress,
+                         on_error=self.on_portfolio_failed)
+
+    def compute_portfolio(self, job, tickers, tf, params, engine_kwargs):
+        """
+        Runs on the worker thread: only data, strategy and a private engine, no widgets.
+        """
+        frames = {}
+        for i, ticker in enumerate(tickers):
+            job.report(60 * i / max(1, len(tickers)), f"Loading {ticker}")
+            frames[ticker] = self.dm.get_data(ticker, tf)
+        if not any(df is not None and not df.empty for df in frames.values()):
+            return None
+
+        job.report(60, "Running portfolio")
+        strategy = SMAStackStrategy(*params)
+        engine = PortfolioEngine(**engine_kwargs)
+        caches = {t: self.dm.indicators.for_series(t, tf) for t in frames}
+        results = engine.run_strategy(strategy, frames, caches)
+        job.report(95, "Collecting results")
+        return engine, results
+
+    def on_portfolio_progress(self, percent, message):
+        self.progress.setValue(percent)
+        self.progress.setToolTip(message)
+
+    def on_portfolio_finished(self, outcome):
+        self.end_run()
+        if outcome is None:
+            self.stats_label.setText("No data for this universe/timeframe.")
+            return
+        self.engine, results = outcome
+        if results:
+            self.update_ui_with_results(results)
+
+    def on_portfolio_failed(self, error):
+        self.end_run()
+        self.stats_label.setText(f"Portfolio backtest failed: {error}")
+
+    def cancel_portfolio(self, *args):
+        if self.jobs.is_running():
+            self.jobs.cancel()
+            self.stats_label.setText("Portfolio backtest cancelled.")
+        self.end_run()
+
+    def end_run(self):
+        self.progress.hide()
+        self.cancel_btn.setEnabled(False)
+
+    def update_ui_with_results(self, results):
+        ret_color = "#00b894" if results['total_return_pct'] >= 0 else "#ff7675"
+        dates = results['dates']
+        self.stats_label.setText(f"""
+            <div style='line-height: 1.5;'>
+                <b style='font-size: 20px;'>Summary</b><br>
+                Period: {pd.Timestamp(dates[0]):%Y-%m-%d} to {pd.Timestamp(dates[-1]):%Y-%m-%d}<br>
+                Total Return: <span style='color:{ret_color}'>{results['total_return_pct']:.2f}%</span><br>
+                Max Drawdown: <span style='color:#ff7675'>{results['max_drawdown_pct']:.2f}%</span><br>
+                Final Value: ₹{results['final_value']:.2f}<br>
+                Total Trades: {results['total_trades']}<br>
+                Open Positions: {results['open_positions']}
+            </div>
+        """)
+
+        self.equity_plot.clear()
+        self.equity_plot.plot(results['equity_curve'], pen=pg.mkPen('#2962ff', width=2))
+
+        # Most recent trades first
+        trades = self.engine.trades[::-1]
+        self.trade_table.setRowCount(len(trades))
+        for row_pos, trade in enumerate(trades):
+            self.trade_table.setItem(row_pos, 0, QTableWidgetItem(pd.Timestamp(trade['date']).strftime('%Y-%m-%d')))
+            self.trade_table.setItem(row_pos, 1, QTableWidgetItem(str(trade['ticker'])))
+            self.trade_table.setItem(row_pos, 2, QTableWidgetItem(str(trade['type'])))
+            self.trade_table.setItem(row_pos, 3, QTableWidgetItem(f"{trade['price']:.2f}"))
+            self.trade_table.setItem(row_pos, 4, QTableWidgetItem(str(trade['units'])))
+            self.trade_table.setItem(row_pos, 5, QTableWidgetItem(f"{trade['costs']:.2f}"))
+
+            color = "#00b894" if trade['type'] == 'BUY' else "#ff7675"
+            self.trade_table.item(row_pos, 2).setForeground(pg.mkColor(color))
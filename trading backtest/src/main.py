@@ -1,3 +1,4 @@
+import argparse
 import sys
 import os
 
@@ -6,19 +7,23 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from PySide6.QtWidgets import QApplication, QMainWindow, QTabWidget, QVBoxLayout, QWidget
 from src.data.data_manager import DataManager
+from src.data.live_feed import LiveFeed, FileTailSource, SocketSource
 from src.gui.chart_view import ChartView
 from src.gui.backtest_view import BacktestView
 from src.gui.analysis_view import AnalysisView
+from src.gui.portfolio_view import PortfolioView
+from src.gui.correlation_view import CorrelationView
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, feed=None):
         super().__init__()
         self.setWindowTitle("Indian Equities Backtest Framework - Agent 01")
         self.setGeometry(100, 100, 2560, 1440)
         
         # Initialize Data
         print("Initializing Data Manager...")
-        self.dm = DataManager()
+        self.dm = DataManager(lazy=True)
+        self.feed = feed
         
         self.init_ui()
 
@@ -35,6 +40,8 @@ class MainWindow(QMainWindow):
         # 1. Chart Tab
         self.chart_view = ChartView(self.dm)
         self.tabs.addTab(self.chart_view, "Chart View")
+        if self.feed is not None:
+            self.chart_view.attach_feed(self.feed.start())
         
         # 2. Backtest Tab
         self.backtest_view = BacktestView(self.dm)
@@ -43,15 +50,37 @@ class MainWindow(QMainWindow):
         # 3. Analysis Tab
         self.analysis_view = AnalysisView(self.dm)
         self.tabs.addTab(self.analysis_view, "Analytics")
-        self.portfolio_tab = QWidget()
+        
+        # 4. Portfolio Tab
+        self.portfolio_tab = PortfolioView(self.dm)
         self.tabs.addTab(self.portfolio_tab, "Portfolio")
+        
+        # 5. Correlation Tab
+        self.correlation_view = CorrelationView(self.dm)
+        self.tabs.addTab(self.correlation_view, "Correlations")
+
+def make_feed(args):
+    """
+    Optional live bar feed for the chart (lines of 'ticker,date,open,high,low,close,volume').
+    """
+    if args.live_file:
+        return LiveFeed(FileTailSource(args.live_file, from_start=True))
+    if args.live_socket:
+        host, _, port = args.live_socket.rpartition(':')
+        return LiveFeed(SocketSource(host or '127.0.0.1', int(port)))
+    return None
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--live-file', help="Tail this file for live bars")
+    parser.add_argument('--live-socket', metavar='HOST:PORT', help="Read live bars from this TCP server")
+    args, qt_args = parser.parse_known_args()
+    
+    app = QApplication(sys.argv[:1] + qt_args)
     
     # Optional: Apply a global dark theme style
     app.setStyle("Fusion")
     
-    window = MainWindow()
+    window = MainWindow(make_feed(args))
     window.show()
     sys.exit(app.exec())
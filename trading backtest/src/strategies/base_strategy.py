@@ -1,19 +1,104 @@
 from abc import ABC, abstractmethod
+import numpy as np
 import pandas as pd
 
 class Strategy(ABC):
+    # Default search space for optimizers: {constructor argument: candidate values}
+    PARAM_GRID = {}
+
     def __init__(self, name):
         self.name = name
         self.data = None
         self.signals = None
 
     @abstractmethod
-    def generate_signals(self, data):
+    def generate_signals(self, data, cache=None):
         """
         This method should be implemented by subclasses to define trading logic.
         It should return a DataFrame with signals (e.g., 1 for Buy, -1 for Sell, 0 for Hold).
+        cache: optional indicator cache for this series (a dict, or
+               IndicatorLibrary.for_series()), see cached_indicator().
         """
         pass
 
     def set_data(self, data):
         self.data = data
+
+    def reset_stream(self):
+        """
+        Clears the incremental state used by on_bar() before a new stream/replay.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support streaming")
+
+    def on_bar(self, bar):
+        """
+        Streaming counterpart of generate_signals: receives one bar at a time (a mapping
+        with at least 'date' and 'close') and returns that bar's signal (1, -1 or 0),
+        updating indicator state in O(1) instead of recomputing history.
+        Must yield the same signals as generate_signals on the same bars.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support streaming")
+
+    @property
+    def warmup_bars(self):
+        """
+        Number of leading bars on which no signal may fire (indicator warm-up).
+        """
+        return 0
+
+    @staticmethod
+    def cached_indicator(cache, key, compute):
+        """
+        Returns the cached value for key (e.g. ('sma', 20)), computing and storing it on a miss.
+        cache may be None (no reuse), a plain dict, or IndicatorLibrary.for_series(ticker, timeframe).
+        """
+        if cache is None:
+            return compute()
+        value = cache.get(key)
+        if value is None:
+            value = compute()
+            cache[key] = value
+        return value
+
+    @classmethod
+    def valid_params(cls, **params):
+        """
+        Lets subclasses reject meaningless parameter combinations before they are backtested.
+        """
+        return True
+
+    @staticmethod
+    def build_signals(entry, exit, index, start=0):
+        """
+        Vectorized "enter when entry, exit when exit" state machine, equivalent to looping
+        over the bars with: if flat and entry -> Buy (1); elif long and exit -> Sell (-1).
+        entry/exit: boolean arrays aligned with index. Bars before `start` are ignored (warm-up).
+        Returns a Series of 1 (Buy), -1 (Sell), 0 (Hold).
+        """
+        entry = np.array(entry, dtype=bool)
+        exit = np.array(exit, dtype=bool)
+        entry[:start] = False
+        exit[:start] = False
+        n = len(entry)
+
+        events = np.flatnonzero(entry | exit)
+        if (entry & exit).any():
+            # A bar that is both an entry and an exit flips the position, so the outcome
+            # depends on history: walk the (sparse) event bars only
+            after = np.empty(len(events), dtype=np.int64)
+            position = 0
+            for k, i in enumerate(events):
+                position = 1 if (position == 0 and entry[i]) or (position == 1 and not exit[i]) else 0
+                after[k] = position
+        else:
+            # Otherwise an entry always leaves us long and an exit always leaves us flat
+            after = entry[events].astype(np.int64)
+
+        # Carry each event's resulting position forward until the next event
+        position = np.zeros(n, dtype=np.int64)
+        if len(events):
+            last_event = np.searchsorted(events, np.arange(n), side='right') - 1
+            position = np.where(last_event >= 0, after[last_event], 0)
+
+        signals = np.diff(position, prepend=0)
+        return pd.Series(signals, index=index)
@@ -0,0 +1,12 @@
+from .sma_strategy import SMAStackStrategy
+
+# Strategies selectable by name from the command-line tools
+STRATEGIES = {
+    'sma_stack': SMAStackStrategy
+}
+
+def get_strategy_class(name):
+    try:
+        return STRATEGIES[name]
+    except KeyError:
+        raise ValueError(f"Unknown strategy '{name}'. Available: {', '.join(sorted(STRATEGIES))}")
@@ -1,45 +1,74 @@
 import pandas as pd
 from .base_strategy import Strategy
+from src.utils import indicators
 
 class SMAStackStrategy(Strategy):
+    PARAM_GRID = {
+        'p_fast': [5, 8, 10, 13, 15, 20],
+        'p_med': [20, 26, 30, 40, 50],
+        'p_slow': [50, 75, 100, 150, 200]
+    }
+
     def __init__(self, p_fast=8, p_med=20, p_slow=50):
         super().__init__(f"SMA Stack ({p_fast}, {p_med}, {p_slow})")
         self.p_fast = p_fast
         self.p_med = p_med
         self.p_slow = p_slow
+        self.reset_stream()
+
+    @classmethod
+    def valid_params(cls, p_fast=8, p_med=20, p_slow=50, **params):
+        return p_fast < p_med < p_slow
 
-    def generate_signals(self, data):
+    @property
+    def warmup_bars(self):
+        # Need enough data for the slowest SMA
+        return self.p_slow
+
+    def entry_exit_conditions(self, data, cache=None):
         """
-        Buy: SMA 8 > SMA 20 > SMA 50
-        Sell: SMA 8 < SMA 20
+        Entry: bullish stack (fast > medium > slow). Exit: fast < medium.
+        Returns (entry, exit) boolean arrays aligned with data.
+        cache: optional indicator cache shared across calls on the same data to reuse SMAs.
         """
-        df = data.copy()
+        close = data['close']
+        def sma(period):
+            return self.cached_indicator(cache, ('sma', period), lambda: indicators.sma(close, period)).to_numpy()
         
-        # Calculate SMAs
-        df['sma_f'] = df['close'].rolling(window=self.p_fast).mean()
-        df['sma_m'] = df['close'].rolling(window=self.p_med).mean()
-        df['sma_s'] = df['close'].rolling(window=self.p_slow).mean()
+        sma_f = sma(self.p_fast)
+        sma_m = sma(self.p_med)
+        sma_s = sma(self.p_slow)
         
-        signals = pd.Series(0, index=df.index)
-        position = 0 # 0: out, 1: in
+        entry = (sma_f > sma_m) & (sma_m > sma_s)
+        exit = sma_f < sma_m
+        return entry, exit
+
+    def reset_stream(self):
+        self._smas = [indicators.RollingMean(p) for p in (self.p_fast, self.p_med, self.p_slow)]
+        self._bars_seen = 0
+        self._position = 0
+
+    def on_bar(self, bar):
+        """
+        Same rules as generate_signals, with running-sum SMAs.
+        """
+        sma_f, sma_m, sma_s = (sma.update(bar['close']) for sma in self._smas)
+        self._bars_seen += 1
+        if self._bars_seen <= self.warmup_bars:
+            return 0
         
-        for i in range(len(df)):
-            # Need enough data for the slowest SMA
-            if i < self.p_slow:
-                continue
-                
-            row = df.iloc[i]
-            
-            # Entry Logic: Bullish Stack
-            if position == 0:
-                if row['sma_f'] > row['sma_m'] > row['sma_s']:
-                    signals.iloc[i] = 1
-                    position = 1
-            
-            # Exit Logic: Fast crosses below Medium
-            elif position == 1:
-                if row['sma_f'] < row['sma_m']:
-                    signals.iloc[i] = -1
-                    position = 0
-                    
-        return signals
+        if self._position == 0 and sma_f > sma_m and sma_m > sma_s:
+            self._position = 1
+            return 1
+        if self._position == 1 and sma_f < sma_m:
+            self._position = 0
+            return -1
+        return 0
+
+    def generate_signals(self, data, cache=None):
+        """
+        Buy: SMA 8 > SMA 20 > SMA 50
+        Sell: SMA 8 < SMA 20
+        """
+        entry, exit = self.entry_exit_conditions(data, cache)
+        return self.build_signals(entry, exit, data.index, start=self.warmup_bars)
@@ -0,0 +1,161 @@
+import numpy as np
+import pandas as pd
+from src.utils.lru_cache import LRUCache
+
+def pairwise_covariance(returns, min_periods=20):
+    """
+    Covariance and correlation of every pair of columns of a (dates x tickers) array,
+    each pair over the rows where both are valid (like DataFrame.cov()/corr()), computed
+    with a few matrix products instead of a Python loop over pairs.
+    Returns (cov, corr, counts) as k x k arrays.
+    """
+    valid = ~np.isnan(returns)
+    x = np.where(valid, returns, 0.0)
+    m = valid.astype(float)
+
+    count = m.T @ m            # rows where both i and j are valid
+    sum_x = x.T @ m            # sum of i over those rows
+    sum_xy = x.T @ x
+    sum_xx = (x * x).T @ m     # sum of i^2 over those rows
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_i = sum_x / count
+        mean_j = sum_x.T / count
+        cov = (sum_xy - count * mean_i * mean_j) / (count - 1)
+        var_i = (sum_xx - count * mean_i ** 2) / (count - 1)
+        var_j = var_i.T
+        corr = cov / np.sqrt(var_i * var_j)
+    enough = count >= max(min_periods, 2)
+    cov = np.where(enough, cov, np.nan)
+    corr = np.where(enough, np.clip(corr, -1, 1), np.nan)
+    np.fill_diagonal(corr, np.where(np.diag(enough), 1.0, np.nan))
+    return cov, corr, count
+
+def ewma_covariance(returns, halflife=63, min_periods=20):
+    """
+    Exponentially weighted covariance/correlation as of the last row: row t gets weight
+    0.5 ** ((T - t) / halflife), normalized over the rows where both columns are valid.
+    """
+    n = len(returns)
+    weights = 0.5 ** ((n - 1 - np.arange(n)) / halflife)
+    valid = ~np.isnan(returns)
+    x = np.where(valid, returns, 0.0)
+    m = valid.astype(float)
+    wm = m * weights[:, None]
+
+    weight = m.T @ wm
+    sum_x = x.T @ wm
+    sum_xy = x.T @ (x * weights[:, None])
+    sum_xx = (x * x).T @ wm
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_i = sum_x / weight
+        mean_j = sum_x.T / weight
+        cov = sum_xy / weight - mean_i * mean_j
+        var_i = sum_xx / weight - mean_i ** 2
+        corr = cov / np.sqrt(var_i * var_i.T)
+    enough = (m.T @ m) >= max(min_periods, 2)
+    cov = np.where(enough, cov, np.nan)
+    corr = np.where(enough, np.clip(corr, -1, 1), np.nan)
+    np.fill_diagonal(corr, np.where(np.diag(enough), 1.0, np.nan))
+    return cov, corr
+
+class CorrelationService:
+    def __init__(self, data_manager, max_cached=32):
+        """
+        Cross-sectional correlation/covariance of daily returns for the whole universe,
+        from the DataManager's memory-mapped close panel. Matrices are cached per
+        (panel version, date range, method), so revisiting a range is free.
+        """
+        self.dm = data_manager
+        self.cache = LRUCache(max_items=max_cached)
+        self._returns = None  # (panel source key, dates, tickers, returns array)
+
+    def returns_matrix(self):
+        """
+        (dates, tickers, returns) for the full panel; NaN where a ticker has no bar.
+        """
+        panel = self.dm.get_panel()
+        if self._returns is None or self._returns[0] != panel.source_key:
+            closes = panel.field('close').T  # dates x tickers
+            returns = np.full(closes.shape, np.nan)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                returns[1:] = closes[1:] / closes[:-1] - 1
+            self._returns = (panel.source_key, np.asarray(panel.dates), list(panel.tickers), returns)
+        return self._returns[1:]
+
+    def _range(self, dates, start, end):
+        lo = 0 if start is None else int(np.searchsorted(dates, np.datetime64(pd.Timestamp(start), 'ns').astype(dates.dtype)))
+        hi = len(dates) if end is None else int(np.searchsorted(dates, np.datetime64(pd.Timestamp(end), 'ns').astype(dates.dtype), side='right'))
+        return lo, hi
+
+    def _select(self, tickers, wanted):
+        if wanted is None:
+            return list(range(len(tickers))), tickers
+        cols = [tickers.index(t) for t in wanted if t in tickers]
+        return cols, [tickers[c] for c in cols]
+
+    def matrices(self, start=None, end=None, tickers=None, method='pearson', halflife=63, min_periods=20):
+        """
+        {'cov', 'corr'} DataFrames for the returns between start and end (dates, inclusive).
+        method: 'pearson' (equal weights) or 'ewma' (weights halve every `halflife` bars
+        going back from `end`).
+        """
+        dates, all_tickers, returns = self.returns_matrix()
+        lo, hi = self._range(dates, start, end)
+        cols, names = self._select(all_tickers, tickers)
+        key = (self._returns[0], lo, hi, tuple(cols), method, halflife if method == 'ewma' else None, min_periods)
+        result = self.cache.get(key)
+        if result is None:
+            window = returns[lo:hi][:, cols]
+            if method == 'ewma':
+                cov, corr = ewma_covariance(window, halflife, min_periods)
+            else:
+                cov, corr, _ = pairwise_covariance(window, min_periods)
+            result = {
+                'cov': pd.DataFrame(cov, index=names, columns=names),
+                'corr': pd.DataFrame(corr, index=names, columns=names)
+            }
+            self.cache.put(key, result)
+        return result
+
+    def correlation(self, start=None, end=None, tickers=None, method='pearson', **kwargs):
+        return self.matrices(start, end, tickers, method, **kwargs)['corr']
+
+    def covariance(self, start=None, end=None, tickers=None, method='pearson', **kwargs):
+        return self.matrices(start, end, tickers, method, **kwargs)['cov']
+
+    def rolling_correlation(self, window=63, end_dates=None, tickers=None, min_periods=None):
+        """
+        Correlation matrices over the trailing `window` bars ending at each of end_dates
+        (default: every month end). Returns (end dates, names, array of shape dates x k x k).
+        """
+        dates, all_tickers, returns = self.returns_matrix()
+        cols, names = self._select(all_tickers, tickers)
+        if end_dates is None:
+            index = pd.DatetimeIndex(dates)
+            periods = index.to_period('M')
+            ends = np.flatnonzero(np.r_[periods[1:] != periods[:-1], True])
+        else:
+            ends = np.searchsorted(dates, pd.DatetimeIndex(end_dates).values.astype(dates.dtype), side='right') - 1
+        ends = ends[ends >= window - 1]
+        stack = np.empty((len(ends), len(cols), len(cols)))
+        for k, e in enumerate(ends):
+            _, stack[k], _ = pairwise_covariance(returns[e - window + 1:e + 1][:, cols], min_periods or window // 2)
+        return pd.DatetimeIndex(dates[ends]), names, stack
+
+    def rolling_pair(self, a, b, window=63):
+        """
+        Rolling correlation of two tickers, O(n) from windowed sums (see RollingMetrics).
+        """
+        from src.utils.rolling_metrics import RollingMetrics
+        dates, tickers, returns = self.returns_matrix()
+        x, y = returns[:, tickers.index(a)][:, None], returns[:, tickers.index(b)][:, None]
+        _, _, _, cov = RollingMetrics._window_moments(x, window, y=y)
+        _, _, _, var_x = RollingMetrics._window_moments(np.where(np.isnan(y), np.nan, x), window)
+        _, _, _, var_y = RollingMetrics._window_moments(np.where(np.isnan(x), np.nan, y), window)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            corr = cov / np.sqrt(var_x * var_y)
+        return pd.Series(corr[:, 0], index=pd.DatetimeIndex(dates), name=f"{a}/{b}")
+
+    def invalidate(self):
+        self.cache.clear()
+        self._returns = None
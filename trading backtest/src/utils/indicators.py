@@ -0,0 +1,217 @@
+import math
+import pandas as pd
+from src.utils.lru_cache import LRUCache, frame_nbytes
+from src.utils.rolling_metrics import RollingMetrics
+
+def sma(close, period):
+    return close.rolling(window=period).mean()
+
+def ema(close, period):
+    return close.ewm(span=period, adjust=False).mean()
+
+def rsi(close, period=14):
+    """
+    Wilder's RSI (0-100).
+    """
+    delta = close.diff()
+    avg_gain = delta.clip(lower=0).ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+    avg_loss = (-delta.clip(upper=0)).ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+    return 100 - 100 / (1 + avg_gain / avg_loss)
+
+def atr(data, period=14):
+    """
+    Wilder's Average True Range; needs high/low/close.
+    """
+    prev_close = data['close'].shift(1)
+    true_range = pd.concat([
+        data['high'] - data['low'],
+        (data['high'] - prev_close).abs(),
+        (data['low'] - prev_close).abs()
+    ], axis=1).max(axis=1)
+    return true_range.ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+
+def bollinger(close, period=20, num_std=2.0):
+    mid = sma(close, period)
+    std = close.rolling(window=period).std(ddof=0)
+    return pd.DataFrame({'mid': mid, 'upper': mid + num_std * std, 'lower': mid - num_std * std})
+
+class RollingMean:
+    """
+    Streaming SMA: O(1) update per bar from a running sum over a fixed-size window.
+    Follows pandas' rolling().mean() arithmetic (Kahan-compensated add/remove, NaN skipping,
+    sign clamping, exact value for constant runs) so streamed values equal the batch sma().
+    """
+    def __init__(self, period):
+        self.period = period
+        self.window = [math.nan] * period  # circular buffer of the last `period` values
+        self.count = 0                     # values pushed so far
+        self.nobs = 0                      # non-NaN values in the window
+        self.sum = 0.0
+        self.comp_add = 0.0
+        self.comp_remove = 0.0
+        self.neg_ct = 0
+        self.same_run = 0
+        self.prev = math.nan
+        self.value = math.nan
+
+    def update(self, x):
+        """
+        Pushes the next value and returns the SMA ending at it (NaN during warm-up).
+        """
+        x = float(x)
+        slot = self.count % self.period
+        if self.count >= self.period:
+            self._remove(self.window[slot])
+        self.window[slot] = x
+        if self.count == 0:
+            self.prev = x
+        self._add(x)
+        self.count += 1
+        self.value = self._mean() if self.count >= self.period else math.nan
+        return self.value
+
+    def _add(self, x):
+        if math.isnan(x):
+            return
+        self.nobs += 1
+        y = x - self.comp_add
+        t = self.sum + y
+        self.comp_add = t - self.sum - y
+        self.sum = t
+        if math.copysign(1.0, x) < 0:
+            self.neg_ct += 1
+        self.same_run = self.same_run + 1 if x == self.prev else 1
+        self.prev = x
+
+    def _remove(self, x):
+        if math.isnan(x):
+            return
+        self.nobs -= 1
+        y = -x - self.comp_remove
+        t = self.sum + y
+        self.comp_remove = t - self.sum - y
+        self.sum = t
+        if math.copysign(1.0, x) < 0:
+            self.neg_ct -= 1
+
+    def _mean(self):
+        if self.nobs < self.period or self.nobs == 0:
+            return math.nan
+        result = self.sum / self.nobs
+        if self.same_run >= self.nobs:
+            return self.prev
+        if self.neg_ct == 0 and result < 0:
+            return 0.0
+        if self.neg_ct == self.nobs and result > 0:
+            return 0.0
+        return result
+
+def rolling_sharpe(close, window=63, min_periods=None, risk_free_rate=0.06):
+    return RollingMetrics.rolling_sharpe(RollingMetrics.returns(close), window, risk_free_rate, min_periods=min_periods)
+
+def rolling_volatility(close, window=63, min_periods=None):
+    return RollingMetrics.rolling_volatility(RollingMetrics.returns(close), window, min_periods=min_periods)
+
+def rolling_drawdown(close, window=252):
+    return RollingMetrics.rolling_drawdown(close, window)
+
+def rolling_beta(close, benchmark_close, window=63, min_periods=None):
+    """
+    Rolling beta of close against a benchmark close series (aligned on close's dates).
+    """
+    bench_returns = RollingMetrics.returns(benchmark_close.reindex(close.index))
+    return RollingMetrics.rolling_beta(RollingMetrics.returns(close), bench_returns, window, min_periods)
+
+# name -> (function, needs the full OHLC frame rather than just close)
+INDICATORS = {
+    'sma': (sma, False),
+    'ema': (ema, False),
+    'rsi': (rsi, False),
+    'atr': (atr, True),
+    'bollinger': (bollinger, False),
+    'rolling_sharpe': (rolling_sharpe, False),
+    'rolling_volatility': (rolling_volatility, False),
+    'rolling_drawdown': (rolling_drawdown, False)
+}
+
+# name -> function(close, benchmark close, *params), see IndicatorLibrary.get_relative
+RELATIVE_INDICATORS = {
+    'rolling_beta': rolling_beta
+}
+
+def compute(data, name, *params):
+    """
+    Computes indicator `name` with positional params on an OHLC DataFrame.
+    """
+    fn, needs_frame = INDICATORS[name]
+    return fn(data if needs_frame else data['close'], *params)
+
+class IndicatorLibrary:
+    def __init__(self, data_manager, max_memory_mb=128):
+        """
+        Memoized indicators keyed by (ticker, timeframe, data version, name, *params),
+        shared by the chart, strategies and analytics. Entries are dropped when the
+        DataManager reloads data (its data_version changes) or by LRU eviction.
+        """
+        self.dm = data_manager
+        self.cache = LRUCache(max_bytes=int(max_memory_mb * 1024 * 1024), sizeof=frame_nbytes)
+
+    def _key(self, ticker, timeframe, key):
+        return (ticker, timeframe, self.dm.get_data_version(ticker)) + tuple(key)
+
+    def get(self, ticker, timeframe, name, *params):
+        """
+        Returns the indicator Series/DataFrame for a loaded ticker, or None if there is no data.
+        """
+        key = self._key(ticker, timeframe, (name,) + params)
+        value = self.cache.get(key)
+        if value is None:
+            data = self.dm.get_data(ticker, timeframe)
+            if data is None or data.empty:
+                return None
+            value = compute(data, name, *params)
+            self.cache.put(key, value)
+        return value
+
+    def get_relative(self, ticker, benchmark, timeframe, name, *params):
+        """
+        Indicator of ticker measured against another series (e.g. beta to ^NSEI), cached
+        until the data of either changes. None if either has no data.
+        """
+        key = self._key(ticker, timeframe, (name, benchmark, self.dm.get_data_version(benchmark)) + params)
+        value = self.cache.get(key)
+        if value is None:
+            data = self.dm.get_data(ticker, timeframe)
+            bench = self.dm.get_data(benchmark, timeframe)
+            if data is None or data.empty or bench is None or bench.empty:
+                return None
+            value = RELATIVE_INDICATORS[name](data['close'], bench['close'], *params)
+            self.cache.put(key, value)
+        return value
+
+    def for_series(self, ticker, timeframe):
+        """
+        Cache view for one series, to pass as the `cache` argument of Strategy.generate_signals.
+        """
+        return BoundIndicators(self, ticker, timeframe)
+
+    def invalidate(self, ticker=None):
+        """
+        Drops cached indicators for one ticker (or all tickers).
+        """
+        self.cache.discard_where(lambda key: ticker is None or key[0] == ticker)
+
+class BoundIndicators:
+    """
+    Dict-like view of the library for one (ticker, timeframe), keyed like (name, *params).
+    """
+    def __init__(self, library, ticker, timeframe):
+        self.library = library
+        self.ticker = ticker
+        self.timeframe = timeframe
+
+    def get(self, key, default=None):
+        return self.library.cache.get(self.library._key(self.ticker, self.timeframe, key), default)
+
+    def __setitem__(self, key, value):
+        self.library.cache.put(self.library._key(self.ticker, self.timeframe, key), value)
@@ -0,0 +1,94 @@
+import threading
+from collections import OrderedDict
+
+def frame_nbytes(obj):
+    """
+    Memory used by a pandas Series/DataFrame, including its index.
+    """
+    usage = obj.memory_usage(index=True)
+    return int(usage.sum()) if hasattr(usage, 'sum') else int(usage)
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used mapping bounded by item count and/or total byte size.
+    sizeof: callable returning the size in bytes of a value (only needed with max_bytes).
+    """
+    def __init__(self, max_items=None, max_bytes=None, sizeof=None):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof or (lambda value: 0)
+
+        self._entries = OrderedDict()  # key -> (value, nbytes)
+        self._lock = threading.RLock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def keys(self):
+        with self._lock:
+            return list(self._entries.keys())
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        nbytes = self.sizeof(value) if self.max_bytes is not None else 0
+        with self._lock:
+            if key in self._entries:
+                self.total_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, nbytes)
+            self.total_bytes += nbytes
+            self._evict()
+
+    def get_or_compute(self, key, compute):
+        """
+        Returns the cached value for key, computing and storing it on a miss.
+        """
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            if value is not None:
+                self.put(key, value)
+        return value
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return default
+            self.total_bytes -= entry[1]
+            return entry[0]
+
+    def discard_where(self, predicate):
+        """
+        Removes every entry whose key satisfies predicate(key).
+        """
+        with self._lock:
+            for key in [k for k in self._entries if predicate(k)]:
+                self.total_bytes -= self._entries.pop(key)[1]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def _evict(self):
+        # Always keep the most recent entry, even if it alone exceeds max_bytes
+        while len(self._entries) > 1 and (
+                (self.max_items is not None and len(self._entries) > self.max_items) or
+                (self.max_bytes is not None and self.total_bytes > self.max_bytes)):
+            _, (_, nbytes) = self._entries.popitem(last=False)
+            self.total_bytes -= nbytes
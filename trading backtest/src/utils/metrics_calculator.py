@@ -1,6 +1,9 @@
 import pandas as pd
 import numpy as np
 
+MONTH_NAMES = {1:'Jan', 2:'Feb', 3:'Mar', 4:'Apr', 5:'May', 6:'Jun', 
+               7:'Jul', 8:'Aug', 9:'Sep', 10:'Oct', 11:'Nov', 12:'Dec'}
+
 class MetricsCalculator:
     @staticmethod
     def calculate_returns(series):
@@ -80,7 +83,283 @@ class MetricsCalculator:
         matrix['month'] = matrix.index.month
         
         pivot_table = matrix.pivot(index='year', columns='month', values='return')
-        month_names = {1:'Jan', 2:'Feb', 3:'Mar', 4:'Apr', 5:'May', 6:'Jun', 
-                       7:'Jul', 8:'Aug', 9:'Sep', 10:'Oct', 11:'Nov', 12:'Dec'}
-        pivot_table.rename(columns=month_names, inplace=True)
+        pivot_table.rename(columns=MONTH_NAMES, inplace=True)
+        return pivot_table
+
+    @staticmethod
+    def build_index(data):
+        """
+        PerformanceIndex over the close of an OHLC DataFrame, for O(1) metrics of any period.
+        """
+        return PerformanceIndex(data['close'])
+
+    @staticmethod
+    def trade_returns(trades):
+        """
+        Net return of each round trip (BUY followed by SELL) from BacktestEngine.trades,
+        costs included. Accepts the list-of-dicts or structured-array trade log.
+        """
+        returns = []
+        entry_cost = None
+        for trade in trades:
+            if trade['type'] == 'BUY':
+                entry_cost = trade['value'] + trade['costs']
+            elif trade['type'] == 'SELL' and entry_cost:
+                returns.append((trade['value'] - trade['costs']) / entry_cost - 1)
+                entry_cost = None
+        return np.array(returns)
+
+    @staticmethod
+    def monte_carlo(returns, n_sims=10000, horizon=None, periods_per_year=252, risk_free_rate=0.06,
+                    band_points=250, max_chunk_mb=256, seed=None):
+        """
+        Bootstrap robustness analysis: resamples `returns` (daily returns, or per-trade returns
+        from trade_returns() with periods_per_year = trades per year) with replacement into
+        n_sims paths of `horizon` periods (default: as many as observed).
+        Paths are simulated as (simulations x periods) matrices, a chunk of simulations at a
+        time: the int64 resample index and two float64 buffers of (chunk x horizon) are the
+        only large arrays alive, and together they stay under max_chunk_mb.
+        Returns per-path 'cagr', 'max_drawdown', 'sharpe_ratio' arrays, plus 'band_x'
+        (period positions) and 'bands' {percentile: equity at band_x} for percentile bands.
+        """
+        returns = np.asarray(returns, dtype=float)
+        returns = returns[~np.isnan(returns)]
+        if len(returns) < 2:
+            return {}
+        horizon = horizon or len(returns)
+        rng = np.random.default_rng(seed)
+        log_returns = np.log1p(returns)
+        
+        # Equity is only kept at band_x for the bands; the full paths live one chunk at a time
+        band_x = np.unique(np.linspace(0, horizon - 1, min(band_points, horizon)).astype(int))
+        band_equity = np.empty((n_sims, len(band_x)))
+        cagr = np.empty(n_sims)
+        max_dd = np.empty(n_sims)
+        vol = np.empty(n_sims)
+        
+        # Peak memory per (simulation x period) cell: the int64 bootstrap index plus two
+        # float64 work buffers that are reused for every chunk (all steps below write in place;
+        # np.take only skips its hidden copy of `out` when mode is not 'raise')
+        chunk = max(1, int(max_chunk_mb * 1024 * 1024 // (3 * 8 * horizon)))
+        chunk = min(chunk, n_sims)
+        paths_buf = np.empty((chunk, horizon))
+        work_buf = np.empty((chunk, horizon))
+        years = horizon / periods_per_year
+        for start in range(0, n_sims, chunk):
+            stop = min(start + chunk, n_sims)
+            idx = rng.integers(0, len(returns), size=(stop - start, horizon))
+            equity = paths_buf[:stop - start]
+            work = work_buf[:stop - start]
+            
+            # 1. Equity paths from cumulative log returns
+            np.take(log_returns, idx, out=equity, mode='clip')
+            np.cumsum(equity, axis=1, out=equity)
+            np.exp(equity, out=equity)
+            band_equity[start:stop] = equity[:, band_x]
+            cagr[start:stop] = equity[:, -1] ** (1 / years) - 1
+            
+            # 2. Drawdown against the running peak (the starting value of 1 counts as a peak)
+            np.maximum(equity, 1.0, out=work)
+            np.maximum.accumulate(work, axis=1, out=work)
+            np.divide(equity, work, out=work)
+            max_dd[start:stop] = work.min(axis=1) - 1
+            
+            # 3. Volatility of the resampled returns (sample std, computed in place)
+            np.take(returns, idx, out=work, mode='clip')
+            del idx
+            work -= work.mean(axis=1, keepdims=True)
+            np.square(work, out=work)
+            vol[start:stop] = np.sqrt(work.sum(axis=1) / (horizon - 1) * periods_per_year)
+        del paths_buf, work_buf
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sharpe = np.where(vol > 0, (cagr - risk_free_rate) / vol, 0.0)
+        percentiles = (5, 25, 50, 75, 95)
+        return {
+            'n_sims': n_sims,
+            'horizon': horizon,
+            'cagr': cagr,
+            'max_drawdown': max_dd,
+            'sharpe_ratio': sharpe,
+            'band_x': band_x,
+            'bands': dict(zip(percentiles, np.percentile(band_equity, percentiles, axis=0)))
+        }
+
+    @staticmethod
+    def summarize_distribution(values, percentiles=(5, 25, 50, 75, 95)):
+        """
+        {percentile: value} of a simulated metric.
+        """
+        return dict(zip(percentiles, np.percentile(values, percentiles)))
+
+class PerformanceIndex:
+    def __init__(self, close):
+        """
+        Precomputed structures over one close series, built once per ticker, so that the
+        metrics of any [start, end] bar range cost O(1) (drawdown O(log n)) instead of
+        slicing and recomputing:
+        - prefix sums of daily returns and squared returns -> volatility
+        - the closes themselves -> total return / CAGR (equal to the cumulative log return difference)
+        - a segment tree of (max, min, max drawdown) -> max drawdown of a range
+        - first bar of each calendar month -> monthly return matrix
+        Results match MetricsCalculator.calculate_metrics on the same slice.
+        """
+        close = close.dropna()
+        self.dates = close.index.values
+        self.close = close.to_numpy(dtype=float)
+        n = len(self.close)
+        
+        # 1. Prefix sums: csum[t] = sum of returns of bars 1..t
+        returns = np.zeros(n)
+        returns[1:] = self.close[1:] / self.close[:-1] - 1
+        self.returns = returns
+        self.csum = np.cumsum(returns)
+        self.csum_sq = np.cumsum(returns * returns)
+        
+        # 2. Segment tree over closes (leaves padded on the right). The merge rule assumes
+        #    positive prices; series with bad (<= 0) prints fall back to a direct scan.
+        self.positive = bool((self.close > 0).all())
+        size = 1
+        while size < max(n, 1):
+            size *= 2
+        self.size = size
+        self.seg_max = np.full(2 * size, -np.inf)
+        self.seg_min = np.full(2 * size, np.inf)
+        self.seg_dd = np.zeros(2 * size)
+        self.seg_max[size:size + n] = self.close
+        self.seg_min[size:size + n] = self.close
+        level = size // 2
+        with np.errstate(invalid='ignore', divide='ignore'):
+            while level >= 1:
+                nodes = np.arange(level, 2 * level)
+                left, right = 2 * nodes, 2 * nodes + 1
+                self.seg_max[nodes] = np.maximum(self.seg_max[left], self.seg_max[right])
+                self.seg_min[nodes] = np.minimum(self.seg_min[left], self.seg_min[right])
+                # Worst drawdown is inside a child, or a peak on the left and a trough on the right
+                cross = self.seg_min[right] / self.seg_max[left] - 1
+                self.seg_dd[nodes] = np.fmin(np.fmin(self.seg_dd[left], self.seg_dd[right]), cross)
+                level //= 2
+        
+        # 3. Month starts for the monthly matrix
+        periods = close.index.to_period('M')
+        self.month_starts = np.flatnonzero(np.r_[True, periods[1:] != periods[:-1]]) if n else np.array([], dtype=int)
+        self.month_periods = periods[self.month_starts]
+
+    def __len__(self):
+        return len(self.close)
+
+    def position(self, date):
+        """
+        First bar on or after date.
+        """
+        return int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(date), 'ns').astype(self.dates.dtype)))
+
+    def window(self, years):
+        """
+        (start, end) bar positions (inclusive) of the last `years` years, like filter_data_by_years.
+        """
+        end = len(self.close) - 1
+        if years == 'max' or years is None:
+            return 0, end
+        start_date = pd.Timestamp(self.dates[end]) - pd.DateOffset(years=years)
+        return self.position(start_date), end
+
+    def max_drawdown(self, start, end):
+        """
+        Worst peak-to-trough decline within bars [start, end], O(log n).
+        """
+        if not self.positive:
+            closes = self.close[start:end + 1]
+            return (closes / np.maximum.accumulate(closes) - 1).min()
+        # Fold (max, min, dd) segments left to right; right-side nodes are collected in reverse
+        left_nodes, right_nodes = [], []
+        lo, hi = start + self.size, end + self.size + 1
+        while lo < hi:
+            if lo & 1:
+                left_nodes.append(lo)
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                right_nodes.append(hi)
+            lo //= 2
+            hi //= 2
+        peak, worst = None, 0.0
+        for node in left_nodes + right_nodes[::-1]:
+            if peak is not None:
+                worst = min(worst, self.seg_min[node] / peak - 1)
+            worst = min(worst, self.seg_dd[node])
+            peak = self.seg_max[node] if peak is None else max(peak, self.seg_max[node])
+        return worst
+
+    def metrics(self, start, end, risk_free_rate=0.06):
+        """
+        Same keys as MetricsCalculator.calculate_metrics for bars [start, end]. Scalars are
+        O(1)/O(log n); returns_series/drawdown_series are views built only for plotting.
+        """
+        n_returns = end - start
+        if n_returns < 1:
+            return {}
+        
+        # 1. CAGR
+        first, last = self.close[start], self.close[end]
+        total_return = last / first - 1
+        days = (self.dates[end] - self.dates[start]) / np.timedelta64(1, 'D')
+        years_elapsed = days / 365.25
+        cagr = (last / first) ** (1 / years_elapsed) - 1 if years_elapsed > 0 else 0
+        
+        # 2. Volatility from the prefix sums (sample std of returns start+1..end)
+        total = self.csum[end] - self.csum[start]
+        total_sq = self.csum_sq[end] - self.csum_sq[start]
+        if n_returns > 1:
+            variance = max(total_sq - total * total / n_returns, 0.0) / (n_returns - 1)
+            volatility = np.sqrt(variance) * np.sqrt(252)
+        else:
+            volatility = np.nan
+        
+        # 3. Sharpe
+        excess_return = cagr - risk_free_rate
+        sharpe_ratio = excess_return / volatility if volatility > 0 else 0
+        
+        index = pd.DatetimeIndex(self.dates[start:end + 1])
+        closes = self.close[start:end + 1]
+        return {
+            'total_return': total_return,
+            'cagr': cagr,
+            'volatility': volatility,
+            'sharpe_ratio': sharpe_ratio,
+            'max_drawdown': self.max_drawdown(start, end),
+            'returns_series': pd.Series(self.returns[start + 1:end + 1], index=index[1:]),
+            'drawdown_series': pd.Series(closes / np.maximum.accumulate(closes) - 1, index=index),
+            'years_actual': years_elapsed
+        }
+
+    def cumulative_returns(self, start, end):
+        """
+        Growth since bar `start` for bars start+1..end (what (1 + returns).cumprod() - 1 gives).
+        """
+        return self.close[start + 1:end + 1] / self.close[start] - 1
+
+    def monthly_returns_matrix(self, start, end):
+        """
+        Year x Month matrix of the returns of bars start+1..end, from month boundaries only.
+        """
+        if end <= start:
+            return pd.DataFrame()
+        first = max(int(np.searchsorted(self.month_starts, start + 1, side='right')) - 1, 0)
+        last = int(np.searchsorted(self.month_starts, end, side='right'))
+        # Each month runs from the bar before its first bar (or the period start) to its last bar
+        begins = np.maximum(self.month_starts[first:last] - 1, start)
+        ends = np.minimum(np.r_[self.month_starts[first + 1:last] - 1, end], end)
+        values = self.close[ends] / self.close[begins] - 1
+        periods = self.month_periods[first:last]
+        
+        years, months = np.asarray(periods.year), np.asarray(periods.month)
+        
+        # Same shape as get_monthly_returns_matrix's pivot: only the years/months that occur
+        row_years = np.unique(years)
+        col_months = np.unique(months)
+        table = np.full((len(row_years), len(col_months)), np.nan)
+        table[np.searchsorted(row_years, years), np.searchsorted(col_months, months)] = values
+        pivot_table = pd.DataFrame(table, index=pd.Index(row_years, name='year'),
+                                   columns=pd.Index([MONTH_NAMES[m] for m in col_months], name='month'))
         return pivot_table
@@ -0,0 +1,46 @@
+import numpy as np
+
+class SparseTable:
+    """
+    Static range-minimum/maximum index over an array: O(n log n) to build, O(1) per query.
+    Level k holds the reduction of every run of 2**k elements; any range is covered by two
+    (possibly overlapping) runs from one level. NaNs are ignored, like np.nanmin/np.nanmax.
+    """
+    def __init__(self, values, op=np.fmax):
+        values = np.asarray(values, dtype=float)
+        self.op = op
+        self.n = len(values)
+        self.levels = [values]
+        k = 1
+        while 2 ** k <= self.n:
+            prev, half = self.levels[-1], 2 ** (k - 1)
+            self.levels.append(op(prev[:-half], prev[half:]))
+            k += 1
+
+    def query(self, lo, hi):
+        """
+        Reduction of values[lo:hi] (NaN if the range is empty or all-NaN).
+        """
+        lo, hi = max(int(lo), 0), min(int(hi), self.n)
+        if lo >= hi:
+            return np.nan
+        k = (hi - lo).bit_length() - 1
+        level = self.levels[k]
+        return float(self.op(level[lo], level[hi - 2 ** k]))
+
+class RangeExtremes:
+    """
+    Lowest low and highest high of any bar range in O(1), e.g. for auto-scaling a chart.
+    """
+    def __init__(self, lows, highs):
+        self.lows = SparseTable(lows, np.fmin)
+        self.highs = SparseTable(highs, np.fmax)
+
+    def __len__(self):
+        return self.lows.n
+
+    def query(self, lo, hi):
+        """
+        (min low, max high) over bars lo..hi-1.
+        """
+        return self.lows.query(lo, hi), self.highs.query(lo, hi)
@@ -0,0 +1,159 @@
+import numpy as np
+import pandas as pd
+
+class RollingMetrics:
+    """
+    Rolling-window risk/return metrics in O(n) per column from cumulative sums, for a single
+    Series or a whole (dates x tickers) DataFrame at once. NaNs (e.g. dates before a listing)
+    are skipped; a window needs min_periods valid observations (default: the full window),
+    like pandas' rolling().
+    """
+
+    @staticmethod
+    def _as_2d(obj):
+        values = np.asarray(obj, dtype=float)
+        return values.reshape(-1, 1) if values.ndim == 1 else values
+
+    @staticmethod
+    def _wrap(values, like):
+        if isinstance(like, pd.Series):
+            return pd.Series(values[:, 0], index=like.index, name=like.name)
+        return pd.DataFrame(values, index=like.index, columns=like.columns)
+
+    @staticmethod
+    def _window_sum(values, window):
+        """
+        Sum over the trailing window for every row in O(n). Rows are cut into blocks of
+        `window`; each window is a suffix sum of one block plus a prefix sum of the next,
+        so rounding error never accumulates over the whole history the way a single
+        cumsum[t] - cumsum[t - window] would.
+        """
+        n = len(values)
+        n_blocks = -(-n // window)
+        padded = np.zeros((n_blocks * window,) + values.shape[1:])
+        padded[:n] = values
+        blocks = padded.reshape((n_blocks, window) + values.shape[1:])
+        prefix = np.cumsum(blocks, axis=1).reshape(padded.shape)
+        suffix = np.cumsum(blocks[:, ::-1], axis=1)[:, ::-1].reshape(padded.shape)
+
+        out = prefix[:n].copy()
+        start = np.arange(n) - window + 1
+        straddles = (start > 0) & (start % window != 0)  # window spans two blocks
+        out[straddles] += suffix[start[straddles]]
+        return out
+
+    @staticmethod
+    def _window_moments(x, window, min_periods=None, y=None):
+        """
+        Trailing-window count, means and (co)variance of the columns of x (and y).
+        Columns are shifted by their overall mean first so the sums of squares stay small
+        (variance is shift-invariant), which keeps this close to Welford-style updates in
+        accuracy without a Python loop.
+        """
+        min_periods = min_periods or window
+        same = y is None
+        y = x if same else y
+        valid = ~np.isnan(x) & ~np.isnan(y)
+        with np.errstate(invalid='ignore'):
+            x_shift, y_shift = np.nanmean(np.where(valid, x, np.nan), axis=0), np.nanmean(np.where(valid, y, np.nan), axis=0)
+        xs = np.where(valid, x - np.nan_to_num(x_shift), 0.0)
+        ys = xs if same else np.where(valid, y - np.nan_to_num(y_shift), 0.0)
+
+        count = RollingMetrics._window_sum(valid.astype(float), window)
+        sum_x = RollingMetrics._window_sum(xs, window)
+        sum_y = RollingMetrics._window_sum(ys, window)
+        sum_xy = RollingMetrics._window_sum(xs * ys, window)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean_x = sum_x / count
+            mean_y = sum_y / count
+            cov = (sum_xy - sum_x * mean_y) / (count - 1)
+        if same:
+            # Cancellation in the differenced sums leaves ~1e-16 noise where a window is
+            # constant; snap it to the exact zero variance pandas reports
+            with np.errstate(invalid='ignore', divide='ignore'):
+                scale = RollingMetrics._window_sum(xs * xs, window) / count
+            cov = np.where(cov <= scale * 1e-12, 0.0, cov)
+        enough = count >= max(min_periods, 2)
+        mean_x = np.where(enough, mean_x + np.nan_to_num(x_shift), np.nan)
+        mean_y = np.where(enough, mean_y + np.nan_to_num(y_shift), np.nan)
+        cov = np.where(enough, cov, np.nan)
+        return count, mean_x, mean_y, cov
+
+    @staticmethod
+    def returns(closes):
+        return closes.pct_change(fill_method=None)
+
+    @staticmethod
+    def rolling_volatility(returns, window=63, periods_per_year=252, min_periods=None):
+        """
+        Annualized standard deviation of returns over the trailing window.
+        """
+        _, _, _, var = RollingMetrics._window_moments(RollingMetrics._as_2d(returns), window, min_periods)
+        return RollingMetrics._wrap(np.sqrt(np.maximum(var, 0)) * np.sqrt(periods_per_year), returns)
+
+    @staticmethod
+    def rolling_sharpe(returns, window=63, risk_free_rate=0.06, periods_per_year=252, min_periods=None):
+        """
+        (annualized mean return - risk-free rate) / annualized volatility over the trailing window.
+        """
+        _, mean, _, var = RollingMetrics._window_moments(RollingMetrics._as_2d(returns), window, min_periods)
+        vol = np.sqrt(np.maximum(var, 0)) * np.sqrt(periods_per_year)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            sharpe = np.where(vol > 0, (mean * periods_per_year - risk_free_rate) / vol, np.nan)
+        return RollingMetrics._wrap(sharpe, returns)
+
+    @staticmethod
+    def rolling_beta(returns, benchmark_returns, window=63, min_periods=None):
+        """
+        cov(asset, benchmark) / var(benchmark) over the trailing window, using the bars
+        where both have a return.
+        """
+        x = RollingMetrics._as_2d(returns)
+        bench = np.asarray(benchmark_returns, dtype=float).reshape(-1, 1)
+        bench = np.broadcast_to(bench, x.shape)
+        _, _, _, cov = RollingMetrics._window_moments(x, window, min_periods, y=bench)
+        # Benchmark variance restricted to the same bars as each column
+        _, _, _, var = RollingMetrics._window_moments(np.where(np.isnan(x), np.nan, bench), window, min_periods)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            beta = np.where(var > 0, cov / var, np.nan)
+        return RollingMetrics._wrap(beta, returns)
+
+    @staticmethod
+    def rolling_drawdown(closes, window=252):
+        """
+        Distance of each close below the highest close of the trailing window.
+        """
+        return closes / closes.rolling(window, min_periods=1).max() - 1
+
+    @staticmethod
+    def compute_all(closes, window=63, benchmark=None, risk_free_rate=0.06, min_periods=None):
+        """
+        {'sharpe', 'volatility', 'drawdown', 'beta'} rolling series/frames for closes
+        (Series or dates x tickers DataFrame); beta only if a benchmark close series is given.
+        """
+        returns = RollingMetrics.returns(closes)
+        result = {
+            'sharpe': RollingMetrics.rolling_sharpe(returns, window, risk_free_rate, min_periods=min_periods),
+            'volatility': RollingMetrics.rolling_volatility(returns, window, min_periods=min_periods),
+            'drawdown': RollingMetrics.rolling_drawdown(closes, window)
+        }
+        if benchmark is not None:
+            bench_returns = RollingMetrics.returns(benchmark.reindex(closes.index))
+            result['beta'] = RollingMetrics.rolling_beta(returns, bench_returns, window, min_periods)
+        return result
+
+    @staticmethod
+    def rank_universe(closes, window=63, benchmark=None, risk_free_rate=0.06, min_periods=None):
+        """
+        Rolling metrics as of the last date of a dates x tickers close matrix, best
+        current rolling Sharpe first. Tickers without a close on that date (delisted, or
+        not updated yet) are left out rather than ranked on stale values.
+        """
+        metrics = RollingMetrics.compute_all(closes, window, benchmark, risk_free_rate, min_periods)
+        current = closes.columns[closes.iloc[-1].notna()] if len(closes) else closes.columns[:0]
+        latest = {}
+        for name, frame in metrics.items():
+            latest[name] = frame.iloc[-1][current] if len(frame) else pd.Series(index=current, dtype=float)
+        table = pd.DataFrame(latest, index=current)
+        table.index.name = 'ticker'
+        return table.sort_values('sharpe', ascending=False)
@@ -0,0 +1,64 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Tests import the app as `src.…`, like the entry points do when run from the project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+def make_ohlcv(n=600, seed=0, start='2015-01-01', freq='B'):
+    """
+    Random-walk daily OHLCV frame shaped like DataManager.get_data() output.
+    """
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, n)))
+    open_ = close * (1 + rng.normal(0, 0.004, n))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.006, n)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.006, n)))
+    volume = rng.integers(100_000, 5_000_000, n).astype(float)
+    index = pd.date_range(start, periods=n, freq=freq, name='Price')
+    return pd.DataFrame({'close': close, 'high': high, 'low': low, 'open': open_, 'volume': volume}, index=index)
+
+def write_yf_csv(path, df, symbol):
+    """
+    Writes df in the layout of the CSVs in data/daily (yfinance three-row header).
+    """
+    with open(path, 'w') as f:
+        f.write("Price,Close,High,Low,Open,Volume\n")
+        f.write("Ticker," + ",".join([symbol] * 5) + "\n")
+        f.write("Date,,,,,\n")
+        df[['close', 'high', 'low', 'open', 'volume']].to_csv(f, header=False, date_format='%Y-%m-%d')
+
+# ticker -> (seed, first date, bars); listed on different dates, all current on the last one
+UNIVERSE = {t: (seed, start, len(pd.bdate_range(start, '2018-06-29')))
+            for t, seed, start in [('AAA', 0, '2015-01-01'), ('BBB', 1, '2015-06-01'), ('CCC', 2, '2016-01-01'), ('^NSEI', 3, '2015-01-01')]}
+
+@pytest.fixture
+def ohlcv():
+    return make_ohlcv()
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """
+    A data/ directory with a small universe of generated CSVs (three stocks and ^NSEI).
+    """
+    daily = tmp_path / 'daily'
+    daily.mkdir()
+    for ticker, (seed, start, n) in UNIVERSE.items():
+        symbol = ticker if ticker.startswith('^') else ticker + '.NS'
+        write_yf_csv(daily / f"{ticker}.csv", make_ohlcv(n=n, seed=seed, start=start), symbol)
+    return str(tmp_path)
+
+@pytest.fixture
+def data_manager(data_dir):
+    from src.data.data_manager import DataManager
+    return DataManager(data_dir=data_dir, lazy=True)
+
+@pytest.fixture(scope='session')
+def qapp():
+    pytest.importorskip('PySide6')
+    from PySide6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
@@ -0,0 +1,39 @@
+import threading
+import time
+
+def drain(qapp, view, timeout=30):
+    deadline = time.monotonic() + timeout
+    while any(runner.is_running() for runner in (view.jobs, view.roll_jobs, view.rank_jobs)):
+        view.jobs.pool.waitForDone(50)
+        qapp.processEvents()
+        assert time.monotonic() < deadline, "jobs did not finish"
+
+def test_rolling_and_ranking_run_off_the_gui_thread(qapp, data_manager, monkeypatch):
+    from src.gui.analysis_view import AnalysisView
+    view = AnalysisView(data_manager)
+    drain(qapp, view)
+    view.update_analysis('AAA')
+    drain(qapp, view)
+    assert view.shown_key[0] == 'AAA'
+    assert view.rank_table.rowCount() == 3
+
+    gui_calls = []
+    def on_gui_thread(name, fn):
+        def wrapper(*args, **kwargs):
+            if threading.current_thread() is threading.main_thread():
+                gui_calls.append(name)
+            return fn(*args, **kwargs)
+        return wrapper
+    monkeypatch.setattr(data_manager, 'get_panel', on_gui_thread('get_panel', data_manager.get_panel))
+    monkeypatch.setattr(view, 'compute_rolling', on_gui_thread('compute_rolling', view.compute_rolling))
+    monkeypatch.setattr(view, 'compute_ranking', on_gui_thread('compute_ranking', view.compute_ranking))
+
+    for window in ('1 Month', '6 Months', '1 Year', '3 Months'):
+        view.roll_window.setCurrentText(window)
+        drain(qapp, view)
+        assert view.ranking_key[0] == {'1 Month': 21, '3 Months': 63, '6 Months': 126, '1 Year': 252}[window]
+    view.roll_metric.setCurrentText('Volatility')
+    drain(qapp, view)
+    assert gui_calls == []
+    assert view.rank_table.rowCount() == 3
+    assert len(view.rankings) <= 8
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.engine.backtest_engine import BacktestEngine
+from src.strategies.sma_strategy import SMAStackStrategy
+from tests.conftest import make_ohlcv
+
+@pytest.mark.parametrize('seed', range(4))
+@pytest.mark.parametrize('capital', [100000, 150])  # 150: some buys cannot afford a share
+def test_run_arrays_matches_reference_loop(seed, capital):
+    data = make_ohlcv(n=1500, seed=seed)
+    signals = SMAStackStrategy(5, 13, 50).generate_signals(data)
+
+    loop = BacktestEngine(initial_capital=capital)
+    expected = loop.run(data, signals)
+    fast = BacktestEngine(initial_capital=capital, fast=True)
+    results = fast.run_arrays(data['close'].to_numpy(), signals.to_numpy(), data.index.values)
+
+    assert len(fast.trades) == len(loop.trades) == expected['total_trades']
+    for name in ('type', 'date', 'units'):
+        assert list(fast.trades[name]) == [t[name] for t in loop.trades]
+    for name in ('price', 'value', 'costs'):
+        np.testing.assert_allclose(fast.trades[name], [t[name] for t in loop.trades], rtol=1e-12)
+    np.testing.assert_allclose(results['equity_curve'], expected['equity_curve'], rtol=1e-12)
+    assert results['max_drawdown_pct'] == pytest.approx(expected['max_drawdown_pct'], rel=1e-9)
+
+def test_run_arrays_ignores_redundant_signals(ohlcv):
+    # Repeated buys while long and sells while flat are no-ops in both paths
+    rng = np.random.default_rng(7)
+    signals = pd.Series(rng.choice([-1, 0, 0, 0, 1], len(ohlcv)), index=ohlcv.index)
+    loop = BacktestEngine()
+    expected = loop.run(ohlcv, signals)
+    fast = BacktestEngine(fast=True)
+    results = fast.run(ohlcv, signals)
+    assert list(fast.trades['type']) == [t['type'] for t in loop.trades]
+    np.testing.assert_allclose(results['equity_curve'], expected['equity_curve'], rtol=1e-12)
@@ -0,0 +1,22 @@
+import time
+
+def test_matrix_is_built_on_first_show_off_the_gui_thread(qapp, data_manager, monkeypatch):
+    from src.gui.correlation_view import CorrelationView
+    calls = []
+    get_panel = data_manager.get_panel
+    monkeypatch.setattr(data_manager, 'get_panel', lambda *a, **k: calls.append(1) or get_panel(*a, **k))
+
+    view = CorrelationView(data_manager)
+    view.period_selector.setCurrentText('1 Year')  # selection changes while hidden stay lazy
+    qapp.processEvents()
+    assert calls == [] and view.corr is None and view.stale
+
+    view.show()
+    deadline = time.monotonic() + 30
+    while view.corr is None:
+        view.jobs.pool.waitForDone(50)
+        qapp.processEvents()
+        assert time.monotonic() < deadline
+    assert list(view.corr.index) == ['AAA', 'BBB', 'CCC']
+    assert not view.stale
+    view.close()
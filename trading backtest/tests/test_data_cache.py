@@ -0,0 +1,63 @@
+import os
+
+import pandas as pd
+import pytest
+
+from src.data.data_cache import DataCache
+from src.data.data_manager import DataManager
+from tests.conftest import UNIVERSE, make_ohlcv, write_yf_csv
+
+TIMEFRAMES = DataCache.TIMEFRAMES
+
+def assert_frames_equal(got, expected):
+    for tf in TIMEFRAMES:
+        pd.testing.assert_frame_equal(got[tf], expected[tf], check_freq=False, check_names=False)
+
+def test_cache_round_trip(data_dir, tmp_path):
+    path = os.path.join(data_dir, 'daily', 'AAA.csv')
+    frames = DataManager._parse_and_resample(path)
+    cache = DataCache(str(tmp_path / 'cache'))
+    cache.store('AAA', path, frames)
+    cache.save_manifest()
+    assert cache.is_fresh('AAA', path)
+
+    # A new instance reads the manifest back from disk
+    reopened = DataCache(str(tmp_path / 'cache'))
+    assert reopened.is_fresh('AAA', path)
+    assert_frames_equal(reopened.load('AAA'), frames)
+    assert list(reopened.load('AAA', ('weekly',))) == ['weekly']
+
+    # Touching the CSV invalidates the entry; pruning drops entries of removed CSVs
+    with open(path, 'a') as f:
+        f.write("\n")
+    assert not reopened.is_fresh('AAA', path)
+    reopened.prune([])
+    assert 'AAA' not in reopened.manifest and not os.path.exists(reopened._npz_path('AAA'))
+
+def test_manager_reads_cache_on_second_start(data_dir, monkeypatch):
+    first = DataManager(data_dir=data_dir)
+    parsed = {t: {tf: first.get_data(t, tf) for tf in TIMEFRAMES} for t in first.get_all_tickers()}
+
+    monkeypatch.setattr(DataManager, '_parse_and_resample', staticmethod(lambda path: pytest.fail(f"re-parsed {path}")))
+    second = DataManager(data_dir=data_dir)
+    lazy = DataManager(data_dir=data_dir, lazy=True)
+    for ticker, frames in parsed.items():
+        assert_frames_equal({tf: second.get_data(ticker, tf) for tf in TIMEFRAMES}, frames)
+        assert_frames_equal({tf: lazy.get_data(ticker, tf) for tf in TIMEFRAMES}, frames)
+
+def test_eager_panel_follows_csv_changes_made_after_startup(data_dir):
+    manager = DataManager(data_dir, workers=1)
+    first = manager.get_panel()
+    assert first.tickers == ['AAA', 'BBB', 'CCC', '^NSEI']
+
+    # Rewrite a CSV without apply_update: the in-memory frames are now stale
+    path = os.path.join(data_dir, 'daily', 'AAA.csv')
+    changed = make_ohlcv(n=UNIVERSE['AAA'][2], seed=42, start=UNIVERSE['AAA'][1])
+    write_yf_csv(path, changed, 'AAA.NS')
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 10**9))
+
+    panel = manager.get_panel()
+    assert panel.source_key != first.source_key
+    expected = DataManager._read_csv(path)['close']
+    got = panel.to_frame()['AAA'].dropna()
+    pd.testing.assert_series_equal(got, expected, check_names=False, check_freq=False, check_index_type=False)
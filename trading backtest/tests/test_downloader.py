@@ -0,0 +1,127 @@
+import http.server
+import threading
+import time
+import urllib.error
+
+import pandas as pd
+import pytest
+
+from src.data.downloader import RateLimiter, UniverseDownloader, fetch_index_tickers, is_retryable
+from tests.conftest import make_ohlcv
+
+def http_error(code):
+    return urllib.error.HTTPError('http://example.invalid', code, 'error', None, None)
+
+class ScriptedSource:
+    """
+    Fake source: each ticker fails with the scripted errors in turn, then returns its bars.
+    """
+    def __init__(self, failures=None, n=300):
+        self.failures = {t: list(errors) for t, errors in (failures or {}).items()}
+        self.n = n
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def fetch(self, ticker, start=None, timeout=None):
+        with self._lock:
+            self.calls.append((ticker, time.monotonic()))
+            errors = self.failures.get(ticker)
+            error = errors.pop(0) if errors else None
+        if error is not None:
+            raise error
+        return make_ohlcv(n=self.n, seed=len(ticker), start='2020-01-01')
+
+@pytest.mark.parametrize('error, retry', [
+    (http_error(429), True), (http_error(500), True), (http_error(503), True),
+    (http_error(400), False), (http_error(404), False),
+    (urllib.error.URLError('connection reset'), True), (TimeoutError(), True)
+])
+def test_is_retryable(error, retry):
+    assert is_retryable(error) is retry
+
+def test_transient_failures_succeed_on_retry(data_manager):
+    source = ScriptedSource({'NEW1': [urllib.error.URLError('reset'), http_error(503)]})
+    downloader = UniverseDownloader(data_manager, source, workers=2, rate_limit=None, retries=3, backoff=0.01)
+    report = downloader.run(['NEW1', 'NEW2']).set_index('ticker')
+    assert list(report['status']) == ['ok', 'ok']
+    assert report.loc['NEW1', 'attempts'] == 3 and report.loc['NEW2', 'attempts'] == 1
+    assert report.loc['NEW1', 'new_bars'] == 300
+    # The bars were appended to the CSV and folded into the DataManager
+    assert len(data_manager.get_data('NEW1', 'daily')) == 300
+
+def test_permanent_failures_are_reported(data_manager):
+    source = ScriptedSource({'BAD': [http_error(404)], 'DOWN': [http_error(503)] * 10})
+    downloader = UniverseDownloader(data_manager, source, workers=3, rate_limit=None, retries=2, backoff=0.01)
+    report = downloader.run(['BAD', 'DOWN', 'GOOD']).set_index('ticker')
+    assert report.loc['GOOD', 'status'] == 'ok'
+    assert report.loc['BAD', 'status'] == 'failed' and report.loc['BAD', 'attempts'] == 1  # not retried
+    assert 'HTTP Error 404' in report.loc['BAD', 'error']
+    assert report.loc['DOWN', 'status'] == 'failed' and report.loc['DOWN', 'attempts'] == 3  # 1 + retries
+    assert data_manager.get_data('BAD', 'daily') is None
+
+def test_rate_limiter_spaces_acquisitions_across_threads():
+    limiter = RateLimiter(rate=50, burst=1)
+    stamps = []
+    def worker():
+        for _ in range(5):
+            limiter.acquire()
+            stamps.append(time.monotonic())
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    start = time.monotonic()
+    for t in threads: t.start()
+    for t in threads: t.join()
+    # 20 tokens at 50/s with a single-token bucket: the last one no earlier than 19/50 s in
+    assert max(stamps) - start >= 19 / 50 - 0.02
+
+def test_rate_limiter_allows_a_burst():
+    limiter = RateLimiter(rate=5, burst=4)
+    start = time.monotonic()
+    for _ in range(4):
+        limiter.acquire()
+    assert time.monotonic() - start < 0.1
+    limiter.acquire()
+    assert time.monotonic() - start >= 0.15  # the fifth waits for a refill (1/5 s)
+
+def test_downloader_respects_rate_limit(data_manager):
+    source = ScriptedSource(n=50)
+    downloader = UniverseDownloader(data_manager, source, workers=4, rate_limit=40, retries=0)
+    report = downloader.run([f"T{i}" for i in range(12)])
+    assert (report['status'] == 'ok').all()
+    stamps = sorted(stamp for _, stamp in source.calls)
+    # Burst of `workers` requests, then one every 1/40 s
+    assert stamps[-1] - stamps[0] >= (12 - 4) / 40 - 0.02
+
+@pytest.fixture
+def index_server():
+    seen = {}
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            seen['user_agent'] = self.headers.get('User-Agent')
+            if self.path != '/nifty.csv':
+                self.send_error(404)
+                return
+            body = b"Company Name,Industry,Symbol,Series,ISIN Code\nA Ltd,X,RELIANCE,EQ,IN1\nB Ltd,Y, TCS ,EQ,IN2\nC Ltd,Z,,EQ,IN3\n"
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/csv')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        def log_message(self, *args):
+            pass
+    server = http.server.HTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}", seen
+    server.shutdown()
+    server.server_close()
+
+def test_fetch_index_tickers(index_server):
+    base_url, seen = index_server
+    assert fetch_index_tickers(url=f"{base_url}/nifty.csv") == ['RELIANCE', 'TCS']
+    assert seen['user_agent'].startswith('Mozilla')
+    with pytest.raises(urllib.error.HTTPError):
+        fetch_index_tickers(url=f"{base_url}/missing.csv")
+
+def test_fetch_index_tickers_rejects_unknown_index():
+    with pytest.raises(ValueError):
+        fetch_index_tickers('nifty7')
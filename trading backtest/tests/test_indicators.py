@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.rolling_metrics import RollingMetrics
+
+def test_rolling_metrics_come_from_the_shared_library(data_manager):
+    library = data_manager.indicators
+    closes = data_manager.get_data('AAA', 'daily')['close']
+    benchmark = data_manager.get_data('^NSEI', 'daily')['close']
+    expected = RollingMetrics.compute_all(closes, 63, benchmark, min_periods=50)
+
+    sharpe = library.get('AAA', 'daily', 'rolling_sharpe', 63, 50)
+    pd.testing.assert_series_equal(sharpe, expected['sharpe'])
+    pd.testing.assert_series_equal(library.get('AAA', 'daily', 'rolling_volatility', 63, 50), expected['volatility'])
+    pd.testing.assert_series_equal(library.get('AAA', 'daily', 'rolling_drawdown', 63), expected['drawdown'])
+    beta = library.get_relative('AAA', '^NSEI', 'daily', 'rolling_beta', 63, 50)
+    pd.testing.assert_series_equal(beta, expected['beta'])
+
+    # Memoized: the same objects come back until the data changes
+    assert library.get('AAA', 'daily', 'rolling_sharpe', 63, 50) is sharpe
+    assert library.get_relative('AAA', '^NSEI', 'daily', 'rolling_beta', 63, 50) is beta
+    assert library.get_relative('AAA', 'MISSING', 'daily', 'rolling_beta', 63, 50) is None
+
+def test_relative_indicator_follows_benchmark_updates(data_manager):
+    library = data_manager.indicators
+    beta = library.get_relative('AAA', '^NSEI', 'daily', 'rolling_beta', 21, 15)
+    bench = data_manager.get_data('^NSEI', 'daily')
+    new_bar = bench.iloc[-1:].copy()
+    new_bar.index = new_bar.index + pd.Timedelta(days=3)
+    data_manager.apply_update('^NSEI', new_bar)
+    assert library.get_relative('AAA', '^NSEI', 'daily', 'rolling_beta', 21, 15) is not beta
+
+def test_analysis_view_uses_the_library(qapp, data_manager):
+    from src.gui.analysis_view import AnalysisView
+    view = AnalysisView(data_manager)
+    metrics = view.compute_rolling('AAA', 63, 50)
+    assert metrics['sharpe'] is data_manager.indicators.get('AAA', 'daily', 'rolling_sharpe', 63, 50)
+    assert set(metrics) == {'sharpe', 'volatility', 'drawdown', 'beta'}
+
+def test_chart_study_values(qapp, data_manager, monkeypatch):
+    from src.gui.chart_view import ChartView
+    view = ChartView(data_manager)
+    view.current_timeframe = 'daily'
+    view.update_chart('AAA')
+    x, y = view.study_values(20)
+    sma = data_manager.get_data('AAA', 'daily')['close'].rolling(20).mean().to_numpy()
+    np.testing.assert_array_equal(x, np.arange(19, len(sma)))
+    np.testing.assert_allclose(y, sma[19:])
+
+    # Missing data shows no study; real errors are not swallowed
+    monkeypatch.setattr(data_manager.indicators, 'get', lambda *args: None)
+    assert view.study_values(20) == ([], [])
+    def broken(*args):
+        raise TypeError("bug in an indicator")
+    monkeypatch.setattr(data_manager.indicators, 'get', broken)
+    with pytest.raises(TypeError):
+        view.study_values(20)
@@ -0,0 +1,163 @@
+import socket
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.live_feed import BarRingBuffer, FileTailSource, LiveFeed, SocketSource, parse_bar_line
+from tests.conftest import make_ohlcv
+
+def bar(day, close=100.0):
+    return {'date': pd.Timestamp('2024-01-01') + pd.Timedelta(days=day), 'open': close - 1, 'high': close + 1,
+            'low': close - 2, 'close': close, 'volume': 1000.0 + day}
+
+def line(ticker, day, close=100.0):
+    b = bar(day, close)
+    return f"{ticker},{b['date']:%Y-%m-%d},{b['open']},{b['high']},{b['low']},{b['close']},{b['volume']}\n"
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+def test_parse_bar_line():
+    ticker, parsed = parse_bar_line(" TCS ,2024-03-01,1,2,0.5,1.5,100\n")
+    assert ticker == 'TCS'
+    assert parsed == {'date': pd.Timestamp('2024-03-01'), 'open': 1.0, 'high': 2.0, 'low': 0.5, 'close': 1.5, 'volume': 100.0}
+    for bad in ("", "\n", "ticker,date,open,high,low,close,volume", "TCS,2024-03-01,1,2,0.5,1.5",
+                "TCS,2024-03-01,1,2,0.5,x,100", "TCS,not a date,1,2,0.5,1.5,100"):
+        assert parse_bar_line(bad) is None
+
+def test_ring_buffer_wraps_around():
+    buffer = BarRingBuffer(capacity=5)
+    for day in range(12):
+        assert buffer.append(bar(day, 100 + day))
+    assert len(buffer) == 5 and buffer.count == 12
+    dates, fields = buffer.view()
+    assert list(fields['close']) == [107, 108, 109, 110, 111]
+    assert list(dates) == [np.datetime64(bar(d)['date'], 'ns') for d in range(7, 12)]
+    assert list(buffer.view(2)[1]['volume']) == [1010, 1011]
+    assert buffer.last_date() == np.datetime64(bar(11)['date'], 'ns')
+    # Views are slices of the preallocated buffer, not copies
+    assert np.shares_memory(fields['close'], buffer.values)
+
+    # Same date = intrabar revision of the last bar, also after wrapping
+    assert not buffer.append(bar(11, 200))
+    assert list(buffer.view()[1]['close']) == [107, 108, 109, 110, 200]
+
+@pytest.mark.parametrize('capacity', [1, 3, 7])
+def test_ring_buffer_matches_tail_of_appended_bars(capacity):
+    df = make_ohlcv(n=40, seed=capacity)
+    buffer = BarRingBuffer(capacity)
+    for k in range(len(df)):
+        buffer.extend(df.iloc[k:k + 1])
+        dates, fields = buffer.view()
+        tail = df.iloc[max(0, k + 1 - capacity):k + 1]
+        np.testing.assert_array_equal(dates, tail.index.values)
+        for name in ('open', 'high', 'low', 'close', 'volume'):
+            np.testing.assert_array_equal(fields[name], tail[name].to_numpy())
+
+def test_extend_keeps_only_the_last_bars():
+    df = make_ohlcv(n=50)
+    buffer = BarRingBuffer(capacity=8)
+    buffer.extend(df)
+    dates, fields = buffer.view()
+    np.testing.assert_array_equal(dates, df.index.values[-8:])
+    np.testing.assert_array_equal(fields['close'], df['close'].to_numpy()[-8:])
+
+def test_file_tail_handles_partial_lines_and_truncation(tmp_path):
+    path = tmp_path / 'bars.csv'
+    path.write_text("ticker,date,open,high,low,close,volume\n" + line('AAA', 0))
+    feed = LiveFeed(FileTailSource(str(path), poll_interval=0.01, from_start=True), capacity=10)
+    received = []
+    feed.subscribe(lambda ticker, b: received.append((ticker, b['close'])))
+    feed.start()
+    try:
+        wait_for(lambda: len(received) == 1)
+
+        # A line written in two pieces is only parsed once complete
+        text = line('AAA', 1, 101)
+        with open(path, 'a') as f:
+            f.write(text[:12])
+            f.flush()
+            time.sleep(0.05)
+            assert len(received) == 1
+            f.write(text[12:])
+        wait_for(lambda: len(received) == 2)
+
+        # Producer rewrites the file shorter: the tail starts over from the top
+        path.write_text(line('BBB', 5, 50))
+        wait_for(lambda: len(received) == 3)
+        assert received == [('AAA', 100.0), ('AAA', 101.0), ('BBB', 50.0)]
+    finally:
+        feed.stop()
+    assert not feed._thread.is_alive()
+
+def test_file_tail_skips_existing_lines_by_default(tmp_path):
+    path = tmp_path / 'bars.csv'
+    path.write_text(line('AAA', 0))
+    source = FileTailSource(str(path), poll_interval=0.01)
+    feed = LiveFeed(source).start()
+    try:
+        time.sleep(0.05)
+        with open(path, 'a') as f:
+            f.write(line('AAA', 1, 101))
+        wait_for(lambda: feed.version('AAA') == 1)
+        assert list(feed.snapshot('AAA')[1]['close']) == [101.0]
+    finally:
+        feed.stop()
+
+class ListSource:
+    def __init__(self, items):
+        self.items = items
+    def bars(self):
+        yield from self.items
+    def stop(self):
+        pass
+
+def test_live_feed_polling_and_subscribers():
+    history = make_ohlcv(n=20, start='2023-12-01')
+    items = [('AAA', bar(0, 100)), ('AAA', bar(0, 101)), ('AAA', bar(1, 102)), ('BBB', bar(0, 10))]
+    feed = LiveFeed(ListSource(items), capacity=5)
+    feed.seed('AAA', history)
+    assert feed.version('AAA') == 1 and feed.version('BBB') == 0
+    assert feed.snapshot('BBB') is None
+
+    all_bars, aaa_bars = [], []
+    feed.subscribe(lambda ticker, b: all_bars.append((ticker, b['close'])))
+    feed.subscribe(lambda ticker, b: aaa_bars.append(b['close']), ticker='AAA')
+    feed.start()
+    feed._thread.join(timeout=2)
+
+    assert feed.version('AAA') == 4 and feed.version('BBB') == 1  # every bar or revision bumps it
+    assert all_bars == [('AAA', 100), ('AAA', 102), ('BBB', 10)]  # the revision is not re-sent
+    assert aaa_bars == [100, 102]
+    assert sorted(feed.tickers()) == ['AAA', 'BBB']
+
+    dates, fields = feed.snapshot('AAA')
+    assert list(fields['close']) == list(history['close'].iloc[-3:]) + [101, 102]
+    fields['close'][:] = 0  # snapshots are copies
+    assert feed.snapshot('AAA')[1]['close'][-1] == 102
+
+def test_socket_source_reassembles_lines():
+    server = socket.socket()
+    server.bind(('127.0.0.1', 0))
+    server.listen(1)
+    def serve():
+        conn, _ = server.accept()
+        with conn:
+            payload = (line('AAA', 0) + "garbage\n" + line('AAA', 1, 101)).encode()
+            for k in range(0, len(payload), 7):  # split across lines on purpose
+                conn.sendall(payload[k:k + 7])
+                time.sleep(0.001)
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    try:
+        bars = list(SocketSource('127.0.0.1', server.getsockname()[1], timeout=1.0).bars())
+    finally:
+        thread.join(timeout=2)
+        server.close()
+    assert [(t, b['close']) for t, b in bars] == [('AAA', 100.0), ('AAA', 101.0)]
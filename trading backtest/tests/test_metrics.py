@@ -0,0 +1,79 @@
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.metrics_calculator import MetricsCalculator, PerformanceIndex
+from tests.conftest import make_ohlcv
+
+SCALARS = ['total_return', 'cagr', 'volatility', 'sharpe_ratio', 'max_drawdown', 'years_actual']
+
+@pytest.fixture(scope='module')
+def daily():
+    return make_ohlcv(n=2600, seed=4)
+
+@pytest.mark.parametrize('years', ['max', 1, 3, 5, 10])
+def test_index_matches_calculate_metrics(daily, years):
+    index = MetricsCalculator.build_index(daily)
+    start, end = index.window(years)
+    sliced = MetricsCalculator.filter_data_by_years(daily, years)
+    assert (start, end) == (len(daily) - len(sliced), len(daily) - 1)
+
+    expected = MetricsCalculator.calculate_metrics(sliced)
+    got = index.metrics(start, end)
+    for key in SCALARS:
+        assert got[key] == pytest.approx(expected[key], rel=1e-9, abs=1e-12), key
+    pd.testing.assert_series_equal(got['returns_series'], expected['returns_series'], check_names=False, check_freq=False, check_index_type=False)
+    np.testing.assert_allclose(got['drawdown_series'].to_numpy(), expected['drawdown_series'].to_numpy(), atol=1e-12)
+    np.testing.assert_allclose(index.cumulative_returns(start, end),
+                               ((1 + expected['returns_series']).cumprod() - 1).to_numpy(), rtol=1e-9)
+
+def test_index_matches_on_random_ranges(daily):
+    index = PerformanceIndex(daily['close'])
+    rng = np.random.default_rng(1)
+    for _ in range(50):
+        start, end = sorted(rng.integers(0, len(daily), 2))
+        if end - start < 2:
+            continue
+        expected = MetricsCalculator.calculate_metrics(daily.iloc[start:end + 1])
+        got = index.metrics(start, end)
+        for key in SCALARS:
+            assert got[key] == pytest.approx(expected[key], rel=1e-9, abs=1e-12), key
+
+@pytest.mark.parametrize('years', ['max', 1, 3])
+def test_monthly_matrix_matches_resampled_returns(daily, years):
+    index = PerformanceIndex(daily['close'])
+    start, end = index.window(years)
+    sliced = MetricsCalculator.filter_data_by_years(daily, years)
+    expected = MetricsCalculator.get_monthly_returns_matrix(MetricsCalculator.calculate_returns(sliced['close']))
+    got = index.monthly_returns_matrix(start, end)
+    assert list(got.index) == list(expected.index)
+    assert list(got.columns) == list(expected.columns)
+    np.testing.assert_allclose(got.to_numpy(), expected.to_numpy(), rtol=1e-9, atol=1e-12)
+
+def test_drawdown_with_non_positive_prices():
+    # Series with bad prints skip the segment tree and scan directly
+    close = make_ohlcv(n=300, seed=5)['close'].copy()
+    close.iloc[:20] = -close.iloc[:20]
+    index = PerformanceIndex(close)
+    assert not index.positive
+    start, end = 10, 250
+    closes = close.to_numpy()[start:end + 1]
+    assert index.max_drawdown(start, end) == (closes / np.maximum.accumulate(closes) - 1).min()
+
+
+def test_monte_carlo_chunks_stay_under_memory_budget():
+    returns = np.random.default_rng(3).normal(0.0005, 0.02, 500)
+    whole = MetricsCalculator.monte_carlo(returns, n_sims=200, horizon=20000, seed=7)
+    tracemalloc.start()
+    try:
+        chunked = MetricsCalculator.monte_carlo(returns, n_sims=200, horizon=20000, seed=7, max_chunk_mb=4)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # Per-path outputs (~250 band points each, plus their percentile copies) sit on top of the budget
+    outputs = 200 * (250 + 4) * 8 * 3
+    assert peak < 4 * 1024 * 1024 + outputs
+    for key in ('cagr', 'max_drawdown', 'sharpe_ratio'):
+        np.testing.assert_allclose(chunked[key], whole[key])
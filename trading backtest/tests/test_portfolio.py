@@ -0,0 +1,77 @@
+import time
+
+import numpy as np
+import pytest
+
+from src.engine.backtest_engine import BacktestEngine
+from src.engine.portfolio_engine import PortfolioEngine
+from src.strategies.sma_strategy import SMAStackStrategy
+from tests.conftest import make_ohlcv
+
+@pytest.mark.parametrize('seed', [0, 1, 2, 3])
+@pytest.mark.parametrize('fast', [False, True])
+def test_single_ticker_portfolio_matches_backtest_engine(seed, fast):
+    data = make_ohlcv(n=1500, seed=seed)
+    strategy = SMAStackStrategy(8, 20, 50)
+
+    single = BacktestEngine(initial_capital=100000, fast=fast)
+    expected = single.run(data, strategy.generate_signals(data))
+    portfolio = PortfolioEngine(initial_capital=100000, max_positions=1)
+    results = portfolio.run_strategy(strategy, {'AAA': data})
+
+    trades = portfolio.trades
+    assert len(trades) == expected['total_trades'] > 0
+    for name in ('type', 'date', 'units'):
+        assert [t[name] for t in single.trades] == list(trades[name])
+    for name in ('price', 'value', 'costs'):
+        np.testing.assert_allclose([t[name] for t in single.trades], trades[name], rtol=1e-12)
+    np.testing.assert_allclose(results['equity_curve'], expected['equity_curve'], rtol=1e-12)
+    assert results['final_value'] == pytest.approx(expected['final_value'], rel=1e-12)
+    assert results['max_drawdown_pct'] == pytest.approx(expected['max_drawdown_pct'], rel=1e-9)
+
+def run_one_bar(prices, max_positions, capital=10000, **kwargs):
+    """
+    Every ticker signals a buy on the only bar.
+    """
+    close = np.asarray(prices, dtype=float).reshape(-1, 1)
+    signals = np.ones_like(close, dtype=np.int8)
+    dates = np.array(['2020-01-01'], dtype='datetime64[ns]')
+    engine = PortfolioEngine(initial_capital=capital, max_positions=max_positions, **kwargs)
+    engine.run(close, signals, dates, [f"T{i}" for i in range(len(prices))])
+    return engine
+
+def test_unaffordable_candidate_does_not_take_a_slot():
+    # T0 ranks first but one share costs more than the whole account
+    engine = run_one_bar([50000.0, 100.0, 100.0], max_positions=1)
+    assert engine.get_positions() == {'T1': 99}  # 10000 * 0.995 // 100
+
+def test_skipped_candidate_does_not_consume_budget():
+    # T0's target (1/3 of equity) cannot buy a share; T1 and T2 each get their full target
+    engine = run_one_bar([5000.0, 100.0, 100.0], max_positions=3)
+    target = 10000 / 3
+    assert engine.get_positions() == {'T1': int(target // 100), 'T2': int(target // 100)}
+    assert engine.cash >= 0
+
+def test_marginal_candidate_is_filled_from_the_remaining_budget():
+    engine = run_one_bar([100.0, 100.0, 100.0], max_positions=None, sizing='fixed_amount', position_size=4500)
+    positions = engine.get_positions()
+    assert positions['T0'] == positions['T1'] == 45
+    # Whatever is left after the first two fills and their brokerage
+    left = 10000 * 0.995 - 2 * 4500 * (1 + engine.brokerage)
+    assert positions['T2'] == int(left // 100)
+    assert engine.cash >= 0
+
+def test_view_runs_portfolio_in_background(qapp, data_manager):
+    from src.gui.portfolio_view import PortfolioView
+    view = PortfolioView(data_manager)
+    view.run_portfolio()
+    assert view.engine is None  # nothing ran on the GUI thread
+    deadline = time.monotonic() + 30
+    while view.jobs.is_running():
+        view.jobs.pool.waitForDone(50)
+        qapp.processEvents()
+        assert time.monotonic() < deadline
+    assert view.engine is not None
+    assert view.engine.tickers == ['AAA', 'BBB', 'CCC']
+    assert view.trade_table.rowCount() == len(view.engine.trades)
+    assert not view.cancel_btn.isEnabled()
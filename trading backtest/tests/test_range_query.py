@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from src.utils.range_query import RangeExtremes, SparseTable
+
+@pytest.mark.parametrize('n', [1, 2, 3, 17, 1000, 4097])
+def test_sparse_table_matches_direct_scan(n):
+    rng = np.random.default_rng(n)
+    values = rng.normal(size=n).cumsum()
+    values[rng.random(n) < 0.02] = np.nan
+    highs, lows = SparseTable(values, np.fmax), SparseTable(values, np.fmin)
+    for _ in range(500):
+        lo, hi = sorted(rng.integers(0, n + 1, 2))
+        if lo == hi:
+            assert np.isnan(highs.query(lo, hi))
+            continue
+        window = values[lo:hi]
+        if np.isnan(window).all():
+            assert np.isnan(highs.query(lo, hi)) and np.isnan(lows.query(lo, hi))
+        else:
+            assert highs.query(lo, hi) == np.nanmax(window)
+            assert lows.query(lo, hi) == np.nanmin(window)
+
+def test_sparse_table_clamps_out_of_range_bounds():
+    values = np.array([3.0, 1.0, 4.0, 1.0, 5.0])
+    table = SparseTable(values, np.fmax)
+    assert table.query(-10, 100) == 5.0
+    assert table.query(np.int64(1), np.int64(3)) == 4.0
+    assert np.isnan(table.query(4, 2))
+
+def test_range_extremes(ohlcv):
+    extremes = RangeExtremes(ohlcv['low'].to_numpy(), ohlcv['high'].to_numpy())
+    assert len(extremes) == len(ohlcv)
+    for lo, hi in [(0, len(ohlcv)), (10, 11), (100, 350), (len(ohlcv) - 5, len(ohlcv) + 20)]:
+        window = ohlcv.iloc[lo:hi]
+        assert extremes.query(lo, hi) == (window['low'].min(), window['high'].max())
@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+
+from src.utils.rolling_metrics import RollingMetrics
+from tests.conftest import make_ohlcv
+
+def closes_matrix():
+    closes = pd.DataFrame({t: make_ohlcv(n=400, seed=seed)['close'] for seed, t in enumerate(['AAA', 'BBB', 'CCC', 'DDD'])})
+    closes.iloc[-30:, closes.columns.get_loc('CCC')] = np.nan  # delisted a month before the end
+    closes.iloc[-1:, closes.columns.get_loc('DDD')] = np.nan   # last bar missing
+    return closes
+
+def test_rank_universe_leaves_out_stale_tickers():
+    closes = closes_matrix()
+    table = RollingMetrics.rank_universe(closes, window=63)
+    assert sorted(table.index) == ['AAA', 'BBB']
+    assert table['sharpe'].is_monotonic_decreasing
+    assert table.index.name == 'ticker'
+
+def test_rank_universe_values_are_as_of_the_last_date():
+    closes = closes_matrix()
+    benchmark = make_ohlcv(n=400, seed=9)['close']
+    table = RollingMetrics.rank_universe(closes, window=63, benchmark=benchmark)
+    metrics = RollingMetrics.compute_all(closes[['AAA', 'BBB']], 63, benchmark)
+    for name, frame in metrics.items():
+        np.testing.assert_allclose(table.loc[['AAA', 'BBB'], name], frame.iloc[-1][['AAA', 'BBB']])
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.strategies.base_strategy import Strategy
+from src.strategies.sma_strategy import SMAStackStrategy
+
+def reference_signals(entry, exit, start=0):
+    """
+    The bar loop build_signals replaces: if flat and entry -> Buy; elif long and exit -> Sell.
+    """
+    signals, position = np.zeros(len(entry), dtype=np.int64), 0
+    for i in range(start, len(entry)):
+        if position == 0 and entry[i]:
+            signals[i], position = 1, 1
+        elif position == 1 and exit[i]:
+            signals[i], position = -1, 0
+    return signals
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('overlap', [False, True])
+def test_build_signals_matches_reference_loop(seed, overlap):
+    rng = np.random.default_rng(seed)
+    n = 2000
+    entry = rng.random(n) < 0.05
+    exit = rng.random(n) < 0.05
+    if not overlap:
+        exit &= ~entry  # exercises the vectorized branch; overlap forces the event walk
+    index = pd.date_range('2015-01-01', periods=n, freq='B')
+    for start in (0, 50):
+        signals = Strategy.build_signals(entry, exit, index, start=start)
+        assert signals.index.equals(index)
+        np.testing.assert_array_equal(signals.to_numpy(), reference_signals(entry, exit, start))
+
+def test_build_signals_matches_sma_conditions(ohlcv):
+    strategy = SMAStackStrategy(8, 20, 50)
+    entry, exit = strategy.entry_exit_conditions(ohlcv)
+    np.testing.assert_array_equal(strategy.generate_signals(ohlcv).to_numpy(),
+                                  reference_signals(entry, exit, strategy.warmup_bars))
@@ -0,0 +1,30 @@
+import pytest
+
+from src.data.data_manager import DataManager
+from src.engine.streaming import StreamingBacktest, compare_with_batch
+from src.strategies.sma_strategy import SMAStackStrategy
+from tests.conftest import make_ohlcv
+
+PARAMS = [{'p_fast': 8, 'p_med': 20, 'p_slow': 50}, {'p_fast': 5, 'p_med': 26, 'p_slow': 200}]
+
+@pytest.mark.parametrize('params', PARAMS)
+@pytest.mark.parametrize('timeframe', ['daily', 'weekly'])
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_streaming_matches_batch(params, timeframe, seed):
+    data = make_ohlcv(n=1500, seed=seed)
+    if timeframe == 'weekly':
+        data = DataManager._resample_data(data, 'W-FRI')
+    identical, batch_trades, stream_trades = compare_with_batch(SMAStackStrategy, params, data)
+    assert identical
+    if timeframe == 'daily':
+        assert len(batch_trades) > 0  # the fixture actually trades
+
+def test_replay_resets_state(ohlcv):
+    stream = StreamingBacktest(SMAStackStrategy(**PARAMS[0]))
+    first = stream.replay(ohlcv)['final_value']
+    assert stream.replay(ohlcv)['final_value'] == first
+
+def test_on_bar_matches_generate_signals_on_a_fresh_strategy(ohlcv):
+    strategy = SMAStackStrategy(**PARAMS[0])  # stream state is ready without reset_stream()
+    streamed = [strategy.on_bar({'date': date, 'close': close}) for date, close in ohlcv['close'].items()]
+    assert streamed == list(SMAStackStrategy(**PARAMS[0]).generate_signals(ohlcv))
@@ -0,0 +1,56 @@
+import os
+
+import pandas as pd
+import pytest
+
+from src.data.data_cache import DataCache
+from src.data.data_manager import DataManager
+from src.data.updater import CSVDirectorySource, DataUpdater
+from tests.conftest import UNIVERSE, make_ohlcv, write_yf_csv
+
+TIMEFRAMES = DataCache.TIMEFRAMES
+
+def assert_frames_equal(got, expected):
+    for tf in TIMEFRAMES:
+        pd.testing.assert_frame_equal(got[tf], expected[tf], check_freq=False, check_names=False)
+
+@pytest.mark.parametrize('lazy', [False, True])
+@pytest.mark.parametrize('cut', [850, 853, 871])  # stored history ends mid-week / mid-month
+def test_apply_update_matches_full_reparse(data_dir, tmp_path, lazy, cut):
+    seed, start, n = UNIVERSE['AAA']
+    full = make_ohlcv(n=n, seed=seed, start=start)
+    write_yf_csv(os.path.join(data_dir, 'daily', 'AAA.csv'), full.iloc[:cut], 'AAA.NS')
+    source_dir = tmp_path / 'source'
+    source_dir.mkdir()
+    write_yf_csv(source_dir / 'AAA.csv', full, 'AAA.NS')
+
+    dm = DataManager(data_dir=data_dir, lazy=lazy)
+    before = {tf: dm.get_data('AAA', tf) for tf in TIMEFRAMES}
+    version = dm.get_data_version('AAA')
+    assert len(before['daily']) == cut
+
+    added = DataUpdater(dm, CSVDirectorySource(str(source_dir))).update_ticker('AAA')
+    assert added == n - cut
+    assert dm.get_data_version('AAA') != version
+
+    expected = DataManager._parse_and_resample(os.path.join(data_dir, 'daily', 'AAA.csv'))
+    assert len(expected['daily']) == n
+    assert_frames_equal({tf: dm.get_data('AAA', tf) for tf in TIMEFRAMES}, expected)
+    # The cache was rewritten too, so the next start does not re-parse
+    restarted = DataManager(data_dir=data_dir, lazy=True)
+    assert restarted.cache.is_fresh('AAA', os.path.join(data_dir, 'daily', 'AAA.csv'))
+    assert_frames_equal({tf: restarted.get_data('AAA', tf) for tf in TIMEFRAMES}, expected)
+
+def test_update_keeps_csv_permissions(data_dir, tmp_path):
+    seed, start, n = UNIVERSE['AAA']
+    full = make_ohlcv(n=n, seed=seed, start=start)
+    path = os.path.join(data_dir, 'daily', 'AAA.csv')
+    write_yf_csv(path, full.iloc[:-10], 'AAA.NS')
+    os.chmod(path, 0o644)
+    source_dir = tmp_path / 'source'
+    source_dir.mkdir()
+    write_yf_csv(source_dir / 'AAA.csv', full, 'AAA.NS')
+
+    dm = DataManager(data_dir=data_dir, lazy=True)
+    assert DataUpdater(dm, CSVDirectorySource(str(source_dir))).update_ticker('AAA') == 10
+    assert os.stat(path).st_mode & 0o777 == 0o644